@@ -1,12 +1,13 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
 import os
+import time
 import textwrap
 import base64
 
+from talent import bitmap, calibration, classify, compact, cube, export, figcache, grid, incremental, parallel, profiling, quadrant, ranking, refresh, rollup, scoring, search, shared, snapshot, sources, transitions
+
 # =============================================================================
 # 0) PAGE CONFIG
 # =============================================================================
@@ -17,6 +18,21 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Timing spans around each stage of the rerun. Admins see them in the sidebar
+# (open the app with ?admin=<TALENT_ADMIN_TOKEN>). TALENT_TRACE_LOG appends every
+# rerun as a JSON line; TALENT_TRACE_PROM keeps a Prometheus textfile of the
+# process-wide stage histograms. With none of these set, spans are no-ops.
+ADMIN_TOKEN = os.environ.get("TALENT_ADMIN_TOKEN")
+TRACE_LOG = os.environ.get("TALENT_TRACE_LOG")
+TRACE_PROM = os.environ.get("TALENT_TRACE_PROM")
+
+is_admin = bool(ADMIN_TOKEN) and st.query_params.get("admin") == ADMIN_TOKEN
+prof = profiling.Trace(enabled=is_admin or bool(TRACE_LOG or TRACE_PROM), tab=st.session_state.get("active_tab"))
+
+@st.cache_resource
+def profiling_metrics():
+    return profiling.Metrics()
+
 # =============================================================================
 # 1) FINBOX THEME & COLORS (FORCED DARK)
 # =============================================================================
@@ -201,109 +217,173 @@ st.markdown(
 # =============================================================================
 # 2) DATA ENGINE
 # =============================================================================
-@st.cache_data(ttl=600, show_spinner=False)
-def load_data():
-    file_name = "Data.xlsx"
-    if not os.path.exists(file_name):
-        st.error(f"⚠️ File not found: **{file_name}**")
+# A workbook/CSV/Parquet path, every sheet of a workbook (Data.xlsx#*), a glob of
+# CSV/Parquet shards, or gsheet://<spreadsheet key>/<tab>,<tab> with the
+# service account under [gcp_service_account] in .streamlit/secrets.toml
+DATA_SOURCE = os.environ.get("TALENT_SOURCE", "Data.xlsx")
+
+def data_source(uri=DATA_SOURCE):
+    credentials = None
+    if uri.startswith(sources.GSHEET_SCHEME):
+        credentials = dict(st.secrets["gcp_service_account"])
+    return sources.from_uri(uri, credentials=credentials)
+
+# How often the background refresher checks the source for changes
+REFRESH_SECONDS = int(os.environ.get("TALENT_REFRESH_SECONDS", "60"))
+
+# Worker processes for a cold load of a sharded source (None: one per core)
+INGEST_WORKERS = int(os.environ["TALENT_INGEST_WORKERS"]) if os.environ.get("TALENT_INGEST_WORKERS") else None
+
+def build_scored(src, previous, mode):
+    # Sharded sources (workbook#*, file globs) are parsed and scored in parallel on a cold load
+    if previous is None and hasattr(src, "shards"):
+        return parallel.score(src.shards(), mode, workers=INGEST_WORKERS)
+    return incremental.rescore(src.read(), previous, mode)
+
+def score_source(source, mode, probe=None):
+    # The snapshot keeps full precision; the in-memory copy is compacted and
+    # memory-mapped, so every worker process on the host shares one set of pages
+    scored = snapshot.load_or_build(source, variant=mode, build=lambda src, previous: build_scored(src, previous, mode), probe=probe)
+    return shared.share(compact.compact(scored), f"{source.name}.{mode}")
+
+def with_definitions(frame):
+    # Box definitions are looked up per box for the rows being exported, not stored per row
+    return frame.assign(Box_Def=compact.describe(frame["Final Rating"], BOX_DEFINITIONS))
+
+def export_frame(sel, base, config, mode):
+    # The shared frame holds float32 scores; files get the float64 values.
+    # Default config: straight from the snapshot, if it is still this version.
+    # What-if configs (or a snapshot refreshed meanwhile): re-derived from the metrics.
+    exact = None
+    if config == scoring.DEFAULT_CONFIG:
+        exact, _ = snapshot.read_snapshot(data_refresher().source, variant=mode, columns=compact.SCORE_COLS)
+        if exact is not None and exact.attrs.get("version") != base.attrs.get("version"):
+            exact = None
+    if exact is None:
+        exact = load_rescorer(base, base.attrs.get("version"), mode).exact(config)
+    frame = sel.frame()
+    frame = frame.assign(**{c: compact.view(exact[c], sel.rows).to_numpy() for c in compact.SCORE_COLS if c in frame.columns})
+    return with_definitions(frame)
+
+# One refresher per process: it rebuilds off the request path and swaps the
+# new frame in, so no user waits on a reload after the first one.
+@st.cache_resource(show_spinner=False)
+def data_refresher():
+    return refresh.Refresher(
+        data_source(), score_source, interval=REFRESH_SECONDS,
+        status_path=os.path.join(snapshot.CACHE_DIR, "refresh.json"),
+    )
+
+def load_data(mode=ranking.GLOBAL):
+    try:
+        refresher = data_refresher()
+    except Exception as e:
+        st.error(f"⚠️ Cannot open data source **{DATA_SOURCE}**: {e}")
+        return None
+    if not refresher.has(mode) and not refresher.source.exists():
+        st.error(f"⚠️ File not found: **{DATA_SOURCE}**")
         st.info("Please ensure the Excel file is in the root directory.")
         return None
 
     try:
-        df = pd.read_excel(file_name)
-        
-        perf_cols = ["OKR Last Quarter", "Quality of Output", "Ownership and Reliability", "Delivery"]
-        pot_cols = ["Learning Ability", "Collaboration", "Feedback Reception", "Ownership Beyond Scope"]
-        
-        missing_cols = [c for c in perf_cols + pot_cols if c not in df.columns]
-        if missing_cols:
-            st.error("⚠️ **Missing Columns in Excel**")
-            st.stop()
-
-        for col in perf_cols + pot_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-        # 1. Calc Weighted Scores
-        df["X_Score"] = (
-            (df["OKR Last Quarter"] * 0.30) +
-            (df["Quality of Output"] * 0.30) +
-            (df["Ownership and Reliability"] * 0.20) +
-            (df["Delivery"] * 0.20)
-        )
-        df["Y_Score"] = (
-            (df["Learning Ability"] * 0.20) +
-            (df["Collaboration"] * 0.30) +
-            (df["Feedback Reception"] * 0.30) +
-            (df["Ownership Beyond Scope"] * 0.20)
-        )
-
-        # 2. Calc GLOBAL Ranks
-        df["X_Pct"] = df["X_Score"].rank(pct=True)
-        df["Y_Pct"] = df["Y_Score"].rank(pct=True)
-
-        # 3. Helper to determine box based on Pct
-        def get_box(x, y):
-            # Boundaries
-            is_x_low = x < 0.30
-            is_x_high = x > 0.80 
-            is_x_med = not (is_x_low or is_x_high)
-            
-            is_y_low = y < 0.30
-            is_y_high = y > 0.80 
-            is_y_med = not (is_y_low or is_y_high)
-
-            if is_y_high:
-                if is_x_high: return "Top Talent"
-                if is_x_med:  return "Future Leader"
-                if is_x_low:  return "Rough Diamond"
-            if is_y_med:
-                if is_x_high: return "Impact Driver"
-                if is_x_med:  return "The Keystone"
-                if is_x_low:  return "Inconsistent Player"
-            if is_y_low:
-                if is_x_high: return "Trusted Advisor"
-                if is_x_med:  return "Practitioner"
-                if is_x_low:  return "Talent Mismatch"
-            return "The Keystone"
-
-        # 4. Assign Global Rating
-        df["Final Rating"] = df.apply(lambda r: "New to Rate" if str(r.get("Category","")).strip()=="New to Rate" else get_box(r["X_Pct"], r["Y_Pct"]), axis=1)
-        df["Box_Def"] = df["Final Rating"].map(BOX_DEFINITIONS)
-
-        # 5. Calc LOCAL (Team) Ranks & Ratings
-        mask = df["Category"] != "New to Rate"
-        
-        df.loc[mask, "X_Pct_Team"] = df[mask].groupby("Manager")["X_Score"].rank(pct=True)
-        df.loc[mask, "Y_Pct_Team"] = df[mask].groupby("Manager")["Y_Score"].rank(pct=True)
-        
-        df["Team_Rating"] = df.apply(
-            lambda r: "New to Rate" if not mask[r.name] else get_box(r["X_Pct_Team"], r["Y_Pct_Team"]), 
-            axis=1
-        )
-        
-        # Determine Comparison Status
-        def get_status(row):
-            if row["Final Rating"] == "New to Rate": return "-"
-            if row["Final Rating"] == row["Team_Rating"]: return "🟰"
-            
-            # Comparison: Org - Team
-            avg_global = (row["X_Pct"] + row["Y_Pct"]) / 2
-            avg_local = (row["X_Pct_Team"] + row["Y_Pct_Team"]) / 2
-            
-            if avg_global > avg_local + 0.03: return "⬆️ Higher in Org"
-            if avg_global < avg_local - 0.03: return "⬇️ Lower in Org"
-            return "🟰"
+        return refresher.get(mode)
+    except scoring.MissingColumnsError:
+        st.error("⚠️ **Missing Columns in Excel**")
+        st.stop()
+    except Exception as e:
+        st.error(f"Error reading data source: {e}")
+        return None
 
-        df["Comparison"] = df.apply(get_status, axis=1)
+# Last percentile index per ranking mode: a new version re-sketches only the quarters whose scores changed
+@st.cache_resource
+def percentile_store():
+    return {}
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_percentile_index(_df, version, mode):
+    store = percentile_store()
+    store[mode] = ranking.PercentileIndex.build(_df, mode, previous=store.get(mode))
+    return store[mode]
+
+def scoring_config():
+    # The what-if widgets live under Settings; their state is read here, before scoring
+    ss = st.session_state
+    low, high = ss.get("box_cuts", (scoring.DEFAULT_CONFIG.low_cut, scoring.DEFAULT_CONFIG.high_cut))
+    return scoring.ScoringConfig(
+        perf_weights=tuple((c, ss.get(f"w_{c}", w)) for c, w in scoring.PERF_WEIGHTS.items()),
+        pot_weights=tuple((c, ss.get(f"w_{c}", w)) for c, w in scoring.POT_WEIGHTS.items()),
+        low_cut=low, high_cut=high,
+    )
 
-        return df
+def reset_scoring_config():
+    for key in [f"w_{c}" for c in scoring.METRIC_COLS] + ["box_cuts"]:
+        st.session_state.pop(key, None)
 
-    except Exception as e:
-        st.error(f"Error reading Excel file: {e}")
-        return None
+# Memoizes the last few configurations per dataset version and ranking mode
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_rescorer(_df, version, mode):
+    return scoring.Rescorer(_df, mode, finish=compact.compact)
 
-df = load_data()
+# Widget lives under Settings; read its state before loading so the data matches
+rank_mode = st.session_state.get("rank_mode", ranking.GLOBAL)
+with prof.span("load"):
+    df = load_data(rank_mode)
 if df is None: st.stop()
+# Row order is the same under any configuration, so score-independent indexes key on this
+base_df, base_version = df, df.attrs.get("version")
+config = scoring_config()
+if config != scoring.DEFAULT_CONFIG:
+    with prof.span("rescore"):
+        df = load_rescorer(df, base_version, rank_mode).score(config)
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_cube(_df, version, mode):
+    return cube.RatingCube.build(_df)
+
+# Last rollup per ranking mode: a new dataset version only re-aggregates the quarters that changed
+@st.cache_resource
+def rollup_store():
+    return {}
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_quarter_rollup(_df, version, mode):
+    store = rollup_store()
+    store[mode] = rollup.QuarterRollup.build(_df, store.get(mode))
+    return store[mode]
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_calibration(_df, version, mode):
+    return calibration.ManagerCalibration.build(_df)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_transitions(_df, version, mode):
+    return transitions.TransitionCube.build(_df)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_filter_index(_df, version, mode):
+    return bitmap.FilterIndex.build(_df)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_sort_index(_df, version, mode):
+    return grid.SortIndex(_df)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_search_index(_df, version, mode):
+    return search.SearchIndex.build(_df)
+
+# Every cache keyed on the scored version is bounded (max_entries): each what-if
+# configuration and each background refresh is a new version. Score-only
+# indexes key on the weights, so moving the box boundaries does not rebuild them.
+scores_version = (base_version, config.perf_weights, config.pot_weights)
+
+with prof.span("indexes"):
+    pct_index = load_percentile_index(df, scores_version, rank_mode)
+    rating_cube = load_cube(df, df.attrs.get("version"), rank_mode)
+    flow_cube = load_transitions(df, df.attrs.get("version"), rank_mode)
+    calibration_table = load_calibration(df, df.attrs.get("version"), rank_mode)
+    quarter_rollup = load_quarter_rollup(df, df.attrs.get("version"), rank_mode)
+    filter_index = load_filter_index(df, base_version, rank_mode)
+    sort_index = load_sort_index(df, df.attrs.get("version"), rank_mode)
+    search_index = load_search_index(df, base_version, rank_mode)
 
 # =============================================================================
 # 3) SIDEBAR (SPLIT LOGIC FOR TRENDS VS SNAPSHOTS)
@@ -311,37 +391,76 @@ if df is None: st.stop()
 with st.sidebar:
     st.markdown("### 🛠 Filters")
     
-    # We maintain two DataFrames:
-    # 1. trend_df: Contains ALL quarters (for the Trends tab)
-    # 2. final_df: Contains only SELECTED quarters (for the other tabs)
+    with prof.span("filters"):
+        # We maintain two row selections over the bitmap index:
+        # 1. trend_rows: ALL quarters (for the Trends tab)
+        # 2. final_rows: only SELECTED quarters (for the other tabs)
+        # Selections over the shared df are built from them; nothing is copied until a tab reads columns.
     
-    # --- Structural Filters (Applied to BOTH) ---
-    trend_df = df.copy()
-    struct_cols = ["Business Unit", "Department", "Sub Department", "Manager"]
+        # --- Structural Filters (Applied to BOTH) ---
+        trend_rows = None
+        struct_cols = ["Business Unit", "Department", "Sub Department", "Manager"]
+        struct_filters = {}
     
-    for col in struct_cols:
-        if col in df.columns:
-            options = sorted(trend_df[col].dropna().unique().tolist())
-            selected = st.multiselect(col, options, placeholder=f"Select {col}")
-            if selected:
-                trend_df = trend_df[trend_df[col].isin(selected)]
+        for col in struct_cols:
+            if col in df.columns:
+                options = filter_index.options(col, trend_rows)
+                selected = st.multiselect(col, options, placeholder=f"Select {col}")
+                if selected:
+                    struct_filters[col] = selected
+                    trend_rows = filter_index.select({col: selected}, within=trend_rows)
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # --- Time Filter (Applied ONLY to final_df) ---
-    final_df = trend_df.copy()
-    if "Quarter" in df.columns:
-        q_options = sorted(df["Quarter"].dropna().unique().tolist(), reverse=True)
-        # Default to latest quarter if nothing selected, or handle multiselect
-        sel_quarter = st.multiselect("Quarter (Affects non-trend tabs)", q_options, default=q_options[:1] if q_options else None)
-        if sel_quarter:
-            final_df = final_df[final_df["Quarter"].isin(sel_quarter)]
+        # --- Time Filter (Applied ONLY to final_rows) ---
+        final_rows = trend_rows
+        sel_quarter = []
+        if "Quarter" in df.columns:
+            q_options = filter_index.options("Quarter")[::-1]
+            # Default to latest quarter if nothing selected, or handle multiselect
+            sel_quarter = st.multiselect("Quarter (Affects non-trend tabs)", q_options, default=q_options[:1] if q_options else None)
+            final_rows = filter_index.select({"Quarter": sel_quarter}, within=trend_rows)
+
+        # Sessions keep row ids into the shared frame; columns are cut out where they are shown
+        trend_sel = shared.Selection(df, trend_rows)
+        final_sel = shared.Selection(df, final_rows)
+
+        # Cache keys for everything derived from the current selection
+        data_version = (df.attrs.get("version"), rank_mode)
+        trend_key = figcache.fingerprint(data_version, struct_filters)
+        snapshot_key = figcache.fingerprint(data_version, struct_filters, sel_quarter)
 
     st.markdown("---")
     st.markdown("### ⚙️ Settings")
+    st.radio("Percentile basis", list(ranking.RANK_MODES), format_func=ranking.RANK_MODES.get, key="rank_mode")
+
+    with st.expander("🎚️ Scoring what-if", expanded=config != scoring.DEFAULT_CONFIG):
+        st.caption("Performance weights")
+        for c, w in scoring.PERF_WEIGHTS.items():
+            st.number_input(c, min_value=0.0, max_value=1.0, value=w, step=0.05, key=f"w_{c}")
+        st.caption("Potential weights")
+        for c, w in scoring.POT_WEIGHTS.items():
+            st.number_input(c, min_value=0.0, max_value=1.0, value=w, step=0.05, key=f"w_{c}")
+        st.slider("Box boundaries (percentile)", 0.0, 1.0, (scoring.DEFAULT_CONFIG.low_cut, scoring.DEFAULT_CONFIG.high_cut), 0.01, key="box_cuts")
+        for axis, weights in (("Performance", config.perf_weights), ("Potential", config.pot_weights)):
+            total = sum(w for _, w in weights)
+            if abs(total - 1) > 1e-9: st.caption(f"⚠️ {axis} weights add up to {total:.2f}; scores leave the 0-10 scale.")
+        st.button("Reset to defaults", on_click=reset_scoring_config, use_container_width=True)
+
+    refresh_status = data_refresher().status()
+    if refresh_status["last_refresh"]:
+        age = int(time.time() - refresh_status["last_refresh"])
+        st.caption(f"Data loaded {age // 60} min ago in {refresh_status['last_duration_s']:.1f}s · checked every {REFRESH_SECONDS}s")
+    if data_refresher().behind():
+        st.warning(f"Background refresh is behind. {refresh_status['last_error'] or ''}")
     
-    csv_buffer = final_df.to_csv(index=False).encode("utf-8")
-    st.download_button("Download CSV", data=csv_buffer, file_name="talent_data.csv", mime="text/csv", use_container_width=True)
+    # The file is only written when the button is clicked (and then reused for the same selection)
+    export_fmt = st.selectbox("Export format", list(export.FORMATS), format_func=lambda f: export.FORMATS[f][0])
+    st.download_button(
+        "Download", data=lambda: export.read_export(lambda: export_frame(final_sel, base_df, config, rank_mode), export_fmt, snapshot_key),
+        file_name=export.file_name("talent_data", export_fmt), mime=export.mime(export_fmt),
+        on_click="ignore", use_container_width=True,
+    )
 
 vars_ = theme_vars()
 WORDMARK_SRC = get_wordmark_src()
@@ -371,20 +490,25 @@ def kpi(label, value, color, icon):
     </div>
     """).strip()
 
-total_hc = len(final_df)
-evaluated = len(final_df[final_df["Final Rating"] != "New to Rate"])
-
-star_c = len(final_df[final_df["Final Rating"] == "Top Talent"])
-rising_c = len(final_df[final_df["Final Rating"] == "Future Leader"])
-enigma_c = len(final_df[final_df["Final Rating"] == "Rough Diamond"])
-hi_perf_c = len(final_df[final_df["Final Rating"] == "Impact Driver"])
-core_c = len(final_df[final_df["Final Rating"] == "The Keystone"])
-dilemma_c = len(final_df[final_df["Final Rating"] == "Inconsistent Player"])
-spec_c = len(final_df[final_df["Final Rating"] == "Trusted Advisor"])
-effect_c = len(final_df[final_df["Final Rating"] == "Practitioner"])
-under_c = len(final_df[final_df["Final Rating"] == "Talent Mismatch"])
-
-kpi_html = textwrap.dedent(f"""
+with prof.span("kpis"):
+    # Headline counts are a rollup of the pre-aggregated cube, not a scan of the selection
+    snapshot_filters = {**struct_filters, "Quarter": sel_quarter}
+    rating_counts = rating_cube.rating_counts(snapshot_filters)
+
+    total_hc = int(rating_counts.sum())
+    evaluated = total_hc - int(rating_counts["New to Rate"])
+
+    star_c = rating_counts["Top Talent"]
+    rising_c = rating_counts["Future Leader"]
+    enigma_c = rating_counts["Rough Diamond"]
+    hi_perf_c = rating_counts["Impact Driver"]
+    core_c = rating_counts["The Keystone"]
+    dilemma_c = rating_counts["Inconsistent Player"]
+    spec_c = rating_counts["Trusted Advisor"]
+    effect_c = rating_counts["Practitioner"]
+    under_c = rating_counts["Talent Mismatch"]
+
+    kpi_html = textwrap.dedent(f"""
 <div class="fb-kpis">
   {kpi("Total HC", total_hc, FINBOX["blue"], "👥")}
   {kpi("Evaluated", evaluated, FINBOX["green"], "📋")}
@@ -399,184 +523,302 @@ kpi_html = textwrap.dedent(f"""
   {kpi("Mismatch", under_c, NINE_BOX["Talent Mismatch"], "⛔")}
 </div>
 """).strip()
-st.markdown(kpi_html, unsafe_allow_html=True)
+    st.markdown(kpi_html, unsafe_allow_html=True)
 
 # =============================================================================
 # 6) CHART LOGIC
 # =============================================================================
-def build_quadrant_chart(filtered_data, global_data):
-    try:
-        x_30 = np.percentile(global_data["X_Score"], 30)
-        x_80 = np.percentile(global_data["X_Score"], 80)
-        y_30 = np.percentile(global_data["Y_Score"], 30)
-        y_80 = np.percentile(global_data["Y_Score"], 80)
-    except:
+def build_quadrant_chart(filtered_data, pct_index, quarters=None, low=30, high=80):
+    # Cut lines come from the sorted score index (whole history, or the selected quarters)
+    x_30, x_80 = pct_index.cut("X_Score", low, quarters), pct_index.cut("X_Score", high, quarters)
+    y_30, y_80 = pct_index.cut("Y_Score", low, quarters), pct_index.cut("Y_Score", high, quarters)
+    if np.isnan([x_30, x_80, y_30, y_80]).any():
         x_30, x_80, y_30, y_80 = 3, 8, 3, 8
 
-    fig = go.Figure()
+    # Exact markers for small selections, per-box density cells above QUADRANT_MAX_POINTS
+    fig, _ = quadrant.build_figure(filtered_data, (x_30, x_80, y_30, y_80), NINE_BOX, vars_, max_points=QUADRANT_MAX_POINTS)
+    return fig
+
+def build_pie_chart(dist):
+    fig_pie = px.pie(dist, values="Count", names="Rating", hole=0.62, color="Rating", color_discrete_map=NINE_BOX)
+    fig_pie.update_traces(textinfo='percent+label', textposition='outside')
+    fig_pie.update_layout(
+        template=vars_["--plotly-temp"], showlegend=False, height=260,
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(t=10, b=10, l=10, r=10), font=dict(family="Inter", color=vars_["--fb-text"])
+    )
+    return fig_pie
+
+def build_headcount_chart(hc_trend):
+    fig_hc = px.area(hc_trend, x="Quarter", y="Headcount", markers=True)
+    fig_hc.update_traces(line_color=FINBOX["blue"], fillcolor="rgba(25, 76, 255, 0.1)")
+    fig_hc.update_layout(
+        template=vars_["--plotly-temp"], height=300,
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(t=10, b=10, l=0, r=0), font=dict(family="Inter", color=vars_["--fb-text"]),
+        xaxis=dict(showgrid=False), yaxis=dict(showgrid=False)
+    )
+    return fig_hc
 
-    for rate, color in NINE_BOX.items():
-        if rate == "New to Rate": continue
-        d = filtered_data[filtered_data["Final Rating"] == rate]
-        if d.empty: continue
-        
-        d_grouped = d.groupby(['X_Score', 'Y_Score']).agg(
-            Emp_List=('EMP Name', lambda x: '• ' + '<br>• '.join(x)),
-            Count=('EMP Name', 'count'),
-            Managers=('Manager', lambda x: ', '.join(x.unique()) if x.nunique() <= 2 else "Multiple"),
-            Depts=('Department', lambda x: ', '.join(x.unique()) if x.nunique() <= 2 else "Multiple")
-        ).reset_index()
-
-        sizes = 14 + (d_grouped['Count'] - 1) * 6 
-
-        fig.add_trace(go.Scatter(
-            x=d_grouped["X_Score"], y=d_grouped["Y_Score"], mode="markers",
-            marker=dict(size=sizes, color=color, opacity=0.85, line=dict(width=1, color="white")),
-            name=rate,
-            customdata=d_grouped[['Emp_List', 'Managers', 'Depts', 'Count']],
-            hovertemplate=(
-                "<b>%{customdata[3]} Employee(s)</b><br><br>" +
-                "%{customdata[0]}<br><br>" + 
-                "<b>Perf:</b> %{x:.1f} | <b>Pot:</b> %{y:.1f}<br>" +
-                "<span style='color:#bbb'>----------------</span><br>" +
-                "<b>Dept:</b> %{customdata[2]}<br><b>Mgr:</b> %{customdata[1]}<extra></extra>"
-            )
-        ))
-
-    line_style = dict(color=vars_["--fb-axis"], width=1, dash="dot")
-    max_range = 10.5 
-    fig.add_shape(type="line", x0=x_30, y0=0, x1=x_30, y1=max_range, line=line_style)
-    fig.add_shape(type="line", x0=x_80, y0=0, x1=x_80, y1=max_range, line=line_style)
-    fig.add_shape(type="line", x0=0, y0=y_30, x1=max_range, y1=y_30, line=line_style)
-    fig.add_shape(type="line", x0=0, y0=y_80, x1=max_range, y1=y_80, line=line_style)
-
-    x_low_mid, x_med_mid, x_hi_mid = x_30/2, (x_30+x_80)/2, (x_80+max_range)/2
-    y_low_mid, y_med_mid, y_hi_mid = y_30/2, (y_30+y_80)/2, (y_80+max_range)/2
-    label_font = dict(size=11, weight="bold")
-
-    fig.add_annotation(x=x_low_mid, y=y_hi_mid, text="ROUGH DIAMOND", showarrow=False, font=dict(color=NINE_BOX["Rough Diamond"], **label_font))
-    fig.add_annotation(x=x_med_mid, y=y_hi_mid, text="FUTURE LEADER", showarrow=False, font=dict(color=NINE_BOX["Future Leader"], **label_font))
-    fig.add_annotation(x=x_hi_mid,  y=y_hi_mid, text="TOP TALENT", showarrow=False, font=dict(color=NINE_BOX["Top Talent"], **label_font))
-    fig.add_annotation(x=x_low_mid, y=y_med_mid, text="INCONSISTENT", showarrow=False, font=dict(color=NINE_BOX["Inconsistent Player"], **label_font))
-    fig.add_annotation(x=x_med_mid, y=y_med_mid, text="THE KEYSTONE", showarrow=False, font=dict(color=NINE_BOX["The Keystone"], **label_font))
-    fig.add_annotation(x=x_hi_mid,  y=y_med_mid, text="IMPACT DRIVER", showarrow=False, font=dict(color=NINE_BOX["Impact Driver"], **label_font))
-    fig.add_annotation(x=x_low_mid, y=y_low_mid, text="TALENT MISMATCH", showarrow=False, font=dict(color=NINE_BOX["Talent Mismatch"], **label_font))
-    fig.add_annotation(x=x_med_mid, y=y_low_mid, text="PRACTITIONER", showarrow=False, font=dict(color=NINE_BOX["Practitioner"], **label_font))
-    fig.add_annotation(x=x_hi_mid,  y=y_low_mid, text="TRUSTED ADVISOR", showarrow=False, font=dict(color=NINE_BOX["Trusted Advisor"], **label_font))
-
-    fig.update_layout(
-        template=vars_["--plotly-temp"], height=650, margin=dict(l=20, r=20, t=10, b=20),
-        plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
-        xaxis=dict(title="Performance (Weighted)", range=[0, 10.5], showgrid=False, zeroline=False),
-        yaxis=dict(title="Potential (Weighted)", range=[0, 10.5], showgrid=False, zeroline=False),
-        legend=dict(orientation="h", y=1.02, x=1, xanchor="right"),
+def build_category_chart(cat_trend):
+    # Create Line chart for categories
+    fig_cat = px.line(
+        cat_trend, x="Quarter", y="Count", color="Final Rating",
+        color_discrete_map=NINE_BOX, markers=True
+    )
+    
+    fig_cat.update_layout(
+        template=vars_["--plotly-temp"], height=300, 
+        showlegend=False, # REMOVED LEGEND
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(t=10, b=10, l=0, r=0), font=dict(family="Inter", color=vars_["--fb-text"]),
+        xaxis=dict(showgrid=False), yaxis=dict(showgrid=False)
+    )
+    return fig_cat
+
+# Prepare Data for Trajectory (Y axis must be categorical sorted)
+RATING_ORDER = [
+    "Talent Mismatch", "New to Rate", "Practitioner", "Inconsistent Player", 
+    "Rough Diamond", "The Keystone", "Trusted Advisor", 
+    "Future Leader", "Impact Driver", "Top Talent"
+]
+
+def build_trajectory_chart(traj_data):
+    fig_traj = px.line(
+        traj_data, 
+        x="Quarter", 
+        y="Final Rating", 
+        color="EMP Name",
+        markers=True
+    )
+    
+    fig_traj.update_yaxes(categoryorder='array', categoryarray=RATING_ORDER)
+    
+    fig_traj.update_layout(
+        template=vars_["--plotly-temp"], height=450,
+        xaxis=dict(title="Quarter", showgrid=False),
+        yaxis=dict(title="Category", showgrid=False),
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
         font=dict(family="Inter", color=vars_["--fb-text"]),
+        showlegend=False # REMOVED LEGEND
     )
-    return fig
+    return fig_traj
+
+# Figures are cached process-wide as JSON, keyed on the dataset version and the
+# filter selections, so reruns from unrelated widgets skip building them.
+@st.cache_resource
+def figure_cache():
+    return figcache.FigureCache()
+
+figures = figure_cache()
+
+def figure(key, build):
+    # key[0] names the chart; the span shows whether the spec came from the cache and its size
+    misses = figures.misses
+    with prof.span(f"figure {key[0]}") as span:
+        spec = figures.get_or_build(key, build)
+        if span is not None: span.update(cached=figures.misses == misses, bytes=len(spec))
+    return figcache.to_figure(spec)
+
+def plotly_chart(name, fig, **kwargs):
+    with prof.span(f"chart {name}"):
+        return st.plotly_chart(fig, **kwargs)
+
+def dataframe(name, data, style=None, **kwargs):
+    # ``style`` maps the frame's Styler, e.g. to color one column's cells
+    with prof.span(f"table {name}", rows=len(data)) as span:
+        if span is not None: span["bytes"] = profiling.frame_bytes(data)
+        return st.dataframe(data if style is None else style(data.style), **kwargs)
 
 # =============================================================================
 # 7) MAIN CONTENT (TABS)
 # =============================================================================
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📌 Overview", "🧭 Quadrant", "⚖️ Org vs Team", "👥 People", "📈 Trends", "ℹ️ Logic Guide"])
+# Each tab is a render function; only the active one runs (see the bottom of the file).
+# Shared state above (df, indexes, cube, row selections) is computed once per rerun.
 
 TABLE_ROWS = 7
 TABLE_HEIGHT = 36 * (TABLE_ROWS + 1) + 12
+QUADRANT_MAX_POINTS = quadrant.LOD_THRESHOLD
+MAX_TRAJECTORIES = 20
+LEADERBOARD_ROWS = 100
+
+STATUS_COLORS = {"-": "#94A3B8", "🟰": "#94A3B8", "⬆️ Higher in Org": "#10B981", "⬇️ Lower in Org": "#EF4444"}
+
+def color_status(val):
+    if "⬆️" in str(val) or "⬇️" in str(val): return f"color: {STATUS_COLORS[val]}; font-weight: bold;"
+    return f"color: {STATUS_COLORS['-']};"
+
+def render_grid(key, rows, cols, column_config):
+    """Sorted, paged table over ``rows`` of df; only the visible page is sent to the browser."""
+    c_sort, c_dir, c_size, c_page = st.columns([3, 2, 2, 2])
+    sort_col = c_sort.selectbox("Sort by", [None] + cols, key=f"{key}_sort",
+                                format_func=lambda c: "Sheet order" if c is None else column_config.get(c, {}).get("label") or c)
+    descending = c_dir.selectbox("Order", [False, True], key=f"{key}_desc",
+                                 format_func=lambda d: "Descending" if d else "Ascending")
+    page_size = c_size.selectbox("Rows per page", grid.PAGE_SIZES, key=f"{key}_size")
+
+    total = len(df) if rows is None else len(rows)
+    pages = grid.page_count(total, page_size)
+    # Keep the page in range when the selection shrinks
+    if st.session_state.get(f"{key}_page", 1) > pages: st.session_state[f"{key}_page"] = pages
+    page = c_page.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    window, total = sort_index.window(rows, sort_col, not descending, start, start + page_size)
+    page_df = df.iloc[window][cols]
+    # Only the visible page is styled
+    style = (lambda s: s.map(color_status, subset=["Comparison"])) if "Comparison" in cols else None
+
+    st.markdown('<div class="fb-table-wrap">', unsafe_allow_html=True)
+    dataframe(key, page_df, style=style, use_container_width=True, hide_index=True, height=min(36 * (len(page_df) + 1) + 12, 600),
+                 column_config=column_config)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.caption(f"Rows {min(start + 1, total):,}–{min(start + page_size, total):,} of {total:,}")
 
 # --- TAB 1: OVERVIEW ---
-with tab1:
+def render_overview():
     c1, c2 = st.columns([1, 1.3])
     with c1:
         st.markdown("#### Rating Distribution")
-        dist = final_df["Final Rating"].value_counts().reset_index()
-        dist.columns = ["Rating", "Count"]
-        fig_pie = px.pie(dist, values="Count", names="Rating", hole=0.62, color="Rating", color_discrete_map=NINE_BOX)
-        fig_pie.update_traces(textinfo='percent+label', textposition='outside')
-        fig_pie.update_layout(
-            template=vars_["--plotly-temp"], showlegend=False, height=260,
-            paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-            margin=dict(t=10, b=10, l=10, r=10), font=dict(family="Inter", color=vars_["--fb-text"])
-        )
-        st.plotly_chart(fig_pie, use_container_width=True, config={'displayModeBar': False})
+        fig_pie = figure(("pie", snapshot_key), lambda: build_pie_chart(cube.as_frame(rating_counts)))
+        plotly_chart("pie", fig_pie, use_container_width=True, config={'displayModeBar': False})
     with c2:
         cols_to_show = ["EMP Name", "Department", "Manager"]
-        valid_cols = [c for c in cols_to_show if c in final_df.columns]
+        valid_cols = [c for c in cols_to_show if c in df.columns]
         if valid_cols:
             t1, t2, t3 = st.tabs(["🌟 Top Talent", "⛔ Mismatch", "🧱 Keystone"])
             with t1:
-                df_star = final_df[final_df["Final Rating"] == "Top Talent"][valid_cols]
+                df_star = final_sel.where("Final Rating", ["Top Talent"]).head(TABLE_ROWS, valid_cols)
                 st.markdown('<div class="fb-table-wrap">', unsafe_allow_html=True)
-                st.dataframe(df_star.head(TABLE_ROWS), use_container_width=True, hide_index=True, height=TABLE_HEIGHT)
+                dataframe("top talent", df_star, use_container_width=True, hide_index=True, height=TABLE_HEIGHT)
                 st.markdown('</div>', unsafe_allow_html=True)
             with t2:
-                df_under = final_df[final_df["Final Rating"] == "Talent Mismatch"][valid_cols]
+                df_under = final_sel.where("Final Rating", ["Talent Mismatch"]).head(TABLE_ROWS, valid_cols)
                 st.markdown('<div class="fb-table-wrap">', unsafe_allow_html=True)
-                st.dataframe(df_under.head(TABLE_ROWS), use_container_width=True, hide_index=True, height=TABLE_HEIGHT)
+                dataframe("mismatch", df_under, use_container_width=True, hide_index=True, height=TABLE_HEIGHT)
                 st.markdown('</div>', unsafe_allow_html=True)
             with t3:
-                df_core = final_df[final_df["Final Rating"] == "The Keystone"][valid_cols]
+                df_core = final_sel.where("Final Rating", ["The Keystone"]).head(TABLE_ROWS, valid_cols)
                 st.markdown('<div class="fb-table-wrap">', unsafe_allow_html=True)
-                st.dataframe(df_core.head(TABLE_ROWS), use_container_width=True, hide_index=True, height=TABLE_HEIGHT)
+                dataframe("keystone", df_core, use_container_width=True, hide_index=True, height=TABLE_HEIGHT)
                 st.markdown('</div>', unsafe_allow_html=True)
 
 # --- TAB 2: QUADRANT ---
-with tab2:
-    fig_quad = build_quadrant_chart(final_df, df)
-    st.plotly_chart(fig_quad, use_container_width=True, config={'displayModeBar': False})
+def render_quadrant():
+    fig_quad = figure(
+        ("quadrant", snapshot_key, QUADRANT_MAX_POINTS),
+        lambda: build_quadrant_chart(final_sel.frame(quadrant.COLUMNS), pct_index, sel_quarter or None, config.low_cut * 100, config.high_cut * 100)
+    )
+    if len(final_sel) <= QUADRANT_MAX_POINTS:
+        plotly_chart("quadrant", fig_quad, use_container_width=True, config={'displayModeBar': False})
+    else:
+        st.caption(f"{len(final_sel):,} employees selected: showing headcount density per box. Click a cell to list its employees.")
+        quad_event = plotly_chart(
+            "quadrant", fig_quad, use_container_width=True, config={'displayModeBar': False},
+            on_select="rerun", selection_mode="points", key="quadrant_cells"
+        )
+        quad_points = quad_event.selection.points if quad_event else []
+        if quad_points:
+            quad_df = final_sel.frame(quadrant.COLUMNS)
+            quad_cells = quadrant.cell_traces(quad_df, NINE_BOX)
+            cell = quad_cells[quad_points[0]["curve_number"]].iloc[quad_points[0]["point_index"]]
+            members = quadrant.bucket_members(quad_df, cell)
+            member_cols = [c for c in ["EMP Name", "Department", "Manager", "X_Score", "Y_Score"] if c in members.columns]
+            st.markdown(f"**{cell['Final Rating']}**: {len(members)} employee(s)")
+            st.markdown('<div class="fb-table-wrap">', unsafe_allow_html=True)
+            dataframe("quadrant cell", members[member_cols], use_container_width=True, hide_index=True, height=TABLE_HEIGHT)
+            st.markdown('</div>', unsafe_allow_html=True)
 
 # --- TAB 3: ORG VS TEAM (UPDATED: Remove Filters, Add Quarter Col) ---
-with tab3:
+def render_calibration():
     st.markdown("#### ⚖️ Calibration Matrix")
-    
-    comp_df = final_df[final_df["Final Rating"] != "New to Rate"].copy()
-    
-    if not comp_df.empty:
-        # Columns config: Added Quarter at the start
-        display_comp_cols = ["Quarter", "EMP Name", "Business Unit", "Department", "Manager", "Team_Rating", "Final Rating", "Comparison"]
-        display_comp_cols = [c for c in display_comp_cols if c in comp_df.columns]
 
-        def color_arrow(val):
-            if "⬆️" in str(val): return "color: #10B981; font-weight: bold;"
-            if "⬇️" in str(val): return "color: #EF4444; font-weight: bold;"
-            return "color: #94A3B8;"
+    # Rated rows by box code: no per-row label array is materialized
+    ratings = df["Final Rating"]
+    rated = ratings.cat.codes.to_numpy() != ratings.cat.categories.get_loc(classify.NEW_TO_RATE)
+    t_all, t_managers = st.tabs(["📋 All employees", "🏆 By manager"])
 
-        styled_df = comp_df[display_comp_cols].style.map(color_arrow, subset=["Comparison"])
+    with t_all:
+        comp_rows = grid.rows_where(rated, final_rows)
+        if len(comp_rows):
+            render_grid("calibration", comp_rows, calibration_cols(), calibration_column_config())
+        else:
+            st.info("No data available for comparison.")
+
+    with t_managers:
+        # Manager leaderboard: sums of the precomputed per-team table, no employee rows
+        c_caption, c_min = st.columns([4, 1])
+        c_caption.caption("Managers whose team ratings disagree most with the org ratings come first. "
+                          "Drift is the share of the team in a different box; Net Shift is Higher minus Lower in Org, per head.")
+        min_size = c_min.number_input("Min team size", min_value=1, value=1, step=1, key="calibration_min_size")
+        teams = calibration_table.leaderboard(snapshot_filters)
+        board = teams[teams["Team Size"] >= min_size]
+        if len(board) < len(teams):
+            c_caption.caption(f"{len(teams) - len(board):,} of {len(teams):,} managers hidden: fewer than {min_size} rated employees.")
+        if board.empty:
+            st.info("No data available for comparison.")
+            return
 
         st.markdown('<div class="fb-table-wrap">', unsafe_allow_html=True)
-        st.dataframe(
-            styled_df,
-            use_container_width=True, hide_index=True, height=600,
+        dataframe(
+            "calibration leaderboard", board.head(LEADERBOARD_ROWS)[["Manager", "Team Size", "Higher", "Lower", "Drift", "Net Shift"]],
+            use_container_width=True, hide_index=True, height=TABLE_HEIGHT,
             column_config={
-                "Quarter": st.column_config.TextColumn("Quarter", width="small"),
-                "EMP Name": st.column_config.TextColumn("Employee", width="medium"),
-                "Business Unit": st.column_config.TextColumn("Business Unit", width="medium"),
-                "Department": st.column_config.TextColumn("Department", width="medium"),
-                "Team_Rating": st.column_config.TextColumn("Team Rating", width="medium"),
-                "Final Rating": st.column_config.TextColumn("Org Rating", width="medium"),
-                "Comparison": st.column_config.TextColumn("Team to Org Change", width="small"),
+                "Higher": st.column_config.NumberColumn("⬆️ Higher in Org"),
+                "Lower": st.column_config.NumberColumn("⬇️ Lower in Org"),
+                "Drift": st.column_config.ProgressColumn("Drift", min_value=0, max_value=1, format="percent"),
+                "Net Shift": st.column_config.NumberColumn("Net Shift", format="%+.2f"),
             }
         )
         st.markdown('</div>', unsafe_allow_html=True)
-    else:
-        st.info("No data available for comparison.")
+
+        # Review one manager: box split from the table, employee rows via the filter index
+        manager = st.selectbox("Review manager", board["Manager"].head(LEADERBOARD_ROWS).tolist(), key="calibration_manager")
+        split = calibration_table.distribution(manager, snapshot_filters)
+        dataframe("calibration split", split[(split["Team"] > 0) | (split["Org"] > 0)],
+                  use_container_width=True, hide_index=True,
+                  column_config={"Team": st.column_config.NumberColumn("Team Rating"), "Org": st.column_config.NumberColumn("Org Rating")})
+
+        team_rows = grid.rows_where(rated, filter_index.select({"Manager": [manager]}, within=final_rows))
+        if len(team_rows):
+            render_grid("calibration_team", team_rows, calibration_cols(), calibration_column_config())
+        else:
+            st.info("No data available for comparison.")
+
+def calibration_cols():
+    # Quarter first
+    cols = ["Quarter", "EMP Name", "Business Unit", "Department", "Manager", "Team_Rating", "Final Rating", "Comparison"]
+    return [c for c in cols if c in df.columns]
+
+def calibration_column_config():
+    return {
+        "Quarter": st.column_config.TextColumn("Quarter", width="small"),
+        "EMP Name": st.column_config.TextColumn("Employee", width="medium"),
+        "Business Unit": st.column_config.TextColumn("Business Unit", width="medium"),
+        "Department": st.column_config.TextColumn("Department", width="medium"),
+        "Team_Rating": st.column_config.TextColumn("Team Rating", width="medium"),
+        "Final Rating": st.column_config.TextColumn("Org Rating", width="medium"),
+        "Comparison": st.column_config.TextColumn("Team to Org Change", width="small"),
+    }
 
 # --- TAB 4: PEOPLE (UPDATED: Remove Filters, Add Quarter Col) ---
-with tab4:
+def render_people():
     st.markdown("#### 🔍 Employee Search")
     
-    view_df = final_df.copy()
+    view_rows = final_rows
     
     # 1. Search Bar (Full Width)
-    search_term = st.text_input("Search Employee Name", placeholder="Type name to filter list...", label_visibility="collapsed")
-    if search_term: 
-        view_df = view_df[view_df["EMP Name"].str.contains(search_term, case=False, na=False)]
+    search_term = st.text_input("Search Employee Name", placeholder="Type name or ID to filter list...", label_visibility="collapsed")
+    if search_term.strip(): 
+        view_rows, fuzzy = search_index.search(search_term, within=final_rows)
+        if fuzzy: st.caption(f"No exact match for “{search_term.strip()}”; showing close matches.")
 
     # 2. Table with Quarter as first column
     base_cols = ["Quarter", "EMP ID", "EMP Name", "Business Unit", "Department", "Manager", "X_Score", "Y_Score", "Final Rating"]
-    final_view_cols = [c for c in base_cols if c in view_df.columns]
+    final_view_cols = [c for c in base_cols if c in df.columns]
     
-    st.markdown('<div class="fb-table-wrap">', unsafe_allow_html=True)
-    st.dataframe(
-        view_df[final_view_cols], use_container_width=True, hide_index=True, height=600,
+    render_grid(
+        "people", view_rows, final_view_cols,
         column_config={
             "Quarter": st.column_config.TextColumn("Quarter", width="small"),
             "X_Score": st.column_config.ProgressColumn("Performance", min_value=0, max_value=10, format="%.1f"),
@@ -584,11 +826,10 @@ with tab4:
             "Final Rating": st.column_config.TextColumn("Box Name", width="small")
         }
     )
-    st.markdown('</div>', unsafe_allow_html=True)
 
 # --- TAB 5: TRENDS (NEW TAB) ---
-with tab5:
-    if "Quarter" not in trend_df.columns:
+def render_trends():
+    if "Quarter" not in df.columns:
         st.error("⚠️ 'Quarter' column missing in data. Trends cannot be generated.")
     else:
         # Removed "Talent Trends" header
@@ -599,92 +840,69 @@ with tab5:
         # --- A) HC TREND ---
         with row_trends[0]:
             st.markdown("**Headcount Evolution**")
-            hc_trend = trend_df.groupby("Quarter")["EMP ID"].nunique().reset_index()
-            hc_trend.columns = ["Quarter", "Headcount"]
-            
-            fig_hc = px.area(hc_trend, x="Quarter", y="Headcount", markers=True)
-            fig_hc.update_traces(line_color=FINBOX["blue"], fillcolor="rgba(25, 76, 255, 0.1)")
-            fig_hc.update_layout(
-                template=vars_["--plotly-temp"], height=300,
-                paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-                margin=dict(t=10, b=10, l=0, r=0), font=dict(family="Inter", color=vars_["--fb-text"]),
-                xaxis=dict(showgrid=False), yaxis=dict(showgrid=False)
-            )
-            st.plotly_chart(fig_hc, use_container_width=True, config={'displayModeBar': False})
+            fig_hc = figure(("headcount", trend_key), lambda: build_headcount_chart(quarter_rollup.headcount(struct_filters)))
+            plotly_chart("headcount", fig_hc, use_container_width=True, config={'displayModeBar': False})
 
         # --- B) CATEGORY TREND (Line Chart) ---
         with row_trends[1]:
             st.markdown("**Category Distribution Trend**")
-            cat_trend = trend_df[trend_df["Final Rating"] != "New to Rate"].groupby(["Quarter", "Final Rating"]).size().reset_index(name="Count")
-            
-            # Create Line chart for categories
-            fig_cat = px.line(
-                cat_trend, x="Quarter", y="Count", color="Final Rating",
-                color_discrete_map=NINE_BOX, markers=True
-            )
-            
-            fig_cat.update_layout(
-                template=vars_["--plotly-temp"], height=300, 
-                showlegend=False, # REMOVED LEGEND
-                paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-                margin=dict(t=10, b=10, l=0, r=0), font=dict(family="Inter", color=vars_["--fb-text"]),
-                xaxis=dict(showgrid=False), yaxis=dict(showgrid=False)
-            )
-            st.plotly_chart(fig_cat, use_container_width=True, config={'displayModeBar': False})
+            rated_boxes = [b for b in NINE_BOX if b != "New to Rate"]
+            fig_cat = figure(("category", trend_key), lambda: build_category_chart(quarter_rollup.box_trend(struct_filters, rated_boxes)))
+            plotly_chart("category", fig_cat, use_container_width=True, config={'displayModeBar': False})
+
+        st.markdown("---")
+
+        # --- C) BOX MOVEMENT (Aggregated flows, precomputed per dataset version) ---
+        st.markdown("**🔀 Box Movement Between Quarters**")
+        st.caption("Employees moving between boxes from one quarter to the next, for the sidebar selection.")
+        flow_links = flow_cube.links(struct_filters)
+        if not flow_links.empty:
+            fig_flow = figure(("flows", trend_key), lambda: transitions.build_figure(flow_links, flow_cube.quarters, NINE_BOX, vars_))
+            plotly_chart("flows", fig_flow, use_container_width=True, config={'displayModeBar': False})
+        else:
+            st.info("Movements need at least two consecutive quarters of data.")
 
         st.markdown("---")
 
-        # --- C) SINGLE EMPLOYEE TRAJECTORY VISUALIZER (Filtered) ---
+        # --- D) SINGLE EMPLOYEE TRAJECTORY VISUALIZER (Filtered) ---
         st.markdown("**🔍 Individual Performance Trajectory**")
-        st.caption("Showing trajectory for all employees currently selected in the sidebar filters.")
-        
-        # Prepare Data for Trajectory (Y axis must be categorical sorted)
-        rating_order = [
-            "Talent Mismatch", "New to Rate", "Practitioner", "Inconsistent Player", 
-            "Rough Diamond", "The Keystone", "Trusted Advisor", 
-            "Future Leader", "Impact Driver", "Top Talent"
-        ]
+        st.caption(f"Pick up to {MAX_TRAJECTORIES} employees from the sidebar selection to plot their path.")
         
-        # We use trend_df which is already filtered by sidebar (BU, Dept, Mgr)
-        traj_df = trend_df[trend_df["EMP Name"].notna()].sort_values("Quarter")
+        # We use the trend selection, which is already filtered by sidebar (BU, Dept, Mgr)
+        names = trend_sel.column("EMP Name").dropna()
         
-        if not traj_df.empty:
-            unique_emps = sorted(traj_df["EMP Name"].unique())
+        if not names.empty:
+            unique_emps = sorted(names.unique())
+            sel_emps = st.multiselect("Filter Employees (Start typing...)", unique_emps, default=[], max_selections=MAX_TRAJECTORIES)
             
-            # START EMPTY, but logic will fallback to ALL if empty
-            sel_emps = st.multiselect("Filter Employees (Start typing...)", unique_emps, default=[])
-            
-            # Logic: If nothing selected in dropdown, show ALL filtered data. If selected, show subset.
+            # Lines are only built for an explicit selection; rows are pulled for it alone
             if sel_emps:
-                final_traj_data = traj_df[traj_df["EMP Name"].isin(sel_emps)]
-            else:
-                final_traj_data = traj_df
-
-            fig_traj = px.line(
-                final_traj_data, 
-                x="Quarter", 
-                y="Final Rating", 
-                color="EMP Name",
-                markers=True
-            )
-            
-            fig_traj.update_yaxes(categoryorder='array', categoryarray=rating_order)
-            
-            fig_traj.update_layout(
-                template=vars_["--plotly-temp"], height=450,
-                xaxis=dict(title="Quarter", showgrid=False),
-                yaxis=dict(title="Category", showgrid=False),
-                paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-                font=dict(family="Inter", color=vars_["--fb-text"]),
-                showlegend=False # REMOVED LEGEND
-            )
-            st.plotly_chart(fig_traj, use_container_width=True, config={'displayModeBar': False})
+                # Rows are pulled and sorted inside the builder, so a cached figure skips them
+                fig_traj = figure(("trajectory", trend_key, tuple(sel_emps)),
+                                  lambda: build_trajectory_chart(trend_sel.where("EMP Name", sel_emps).frame().sort_values("Quarter")))
+                plotly_chart("trajectory", fig_traj, use_container_width=True, config={'displayModeBar': False})
         else:
             st.info("No data available for trajectory analysis.")
 
 
 # --- TAB 6: LOGIC GUIDE ---
-with tab6:
+# Short names for the weight cards
+METRIC_LABELS = {
+    "OKR Last Quarter": "OKR Achievement", "Ownership and Reliability": "Ownership", "Delivery": "Delivery Speed",
+    "Feedback Reception": "Feedback Rcpt", "Ownership Beyond Scope": "Beyond Scope",
+}
+
+def percent(share, suffix="%"):
+    return f"{round(share * 100, 1):g}{suffix}"
+
+def weight_rows(weights):
+    # The active (possibly what-if) weights, heaviest first
+    return "".join(
+        f'<div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">{METRIC_LABELS.get(c, c)}</span> <b>{percent(w)}</b></div>'
+        for c, w in sorted(weights, key=lambda cw: -cw[1])
+    )
+
+def render_logic_guide():
     def logic_card(title, desc, color):
         return f"""
         <div class="logic-card" style="border-left: 4px solid {color};">
@@ -727,32 +945,69 @@ with tab6:
     <div class="logic-grid">
         <div class="logic-card">
             <div class="logic-head">📊 Performance Weights (X)</div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">OKR Achievement</span> <b>30%</b></div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">Quality of Output</span> <b>30%</b></div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">Ownership</span> <b>20%</b></div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">Delivery Speed</span> <b>20%</b></div>
+            {weight_rows(config.perf_weights)}
         </div>
         <div class="logic-card">
             <div class="logic-head">🌱 Potential Weights (Y)</div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">Collaboration</span> <b>30%</b></div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">Feedback Rcpt</span> <b>30%</b></div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">Learning Ability</span> <b>20%</b></div>
-            <div style="display:flex; justify-content:space-between; margin-bottom:6px;"><span style="color:var(--fb-muted)">Beyond Scope</span> <b>20%</b></div>
+            {weight_rows(config.pot_weights)}
         </div>
         <div class="logic-card">
             <div class="logic-head">📐 Percentile Distribution</div>
             <div style="display:flex; align-items:center; gap:10px; margin-bottom:12px;">
                 <div style="background:{NINE_BOX['Top Talent']}; width:12px; height:12px; border-radius:3px;"></div>
-                <div><b>High (Top 20%)</b> <span style="color:var(--fb-muted); font-size:12px; display:block;">Score > 80th Percentile</span></div>
+                <div><b>High (Top {percent(1 - config.high_cut)})</b> <span style="color:var(--fb-muted); font-size:12px; display:block;">Score > {percent(config.high_cut, "th")} Percentile</span></div>
             </div>
             <div style="display:flex; align-items:center; gap:10px; margin-bottom:12px;">
                 <div style="background:{NINE_BOX['The Keystone']}; width:12px; height:12px; border-radius:3px;"></div>
-                <div><b>Medium (Middle 50%)</b> <span style="color:var(--fb-muted); font-size:12px; display:block;">Score 30th - 80th Percentile</span></div>
+                <div><b>Medium (Middle {percent(config.high_cut - config.low_cut)})</b> <span style="color:var(--fb-muted); font-size:12px; display:block;">Score {percent(config.low_cut, "th")} - {percent(config.high_cut, "th")} Percentile</span></div>
             </div>
             <div style="display:flex; align-items:center; gap:10px;">
                 <div style="background:{NINE_BOX['Talent Mismatch']}; width:12px; height:12px; border-radius:3px;"></div>
-                <div><b>Low (Bottom 30%)</b> <span style="color:var(--fb-muted); font-size:12px; display:block;">Score < 30th Percentile</span></div>
+                <div><b>Low (Bottom {percent(config.low_cut)})</b> <span style="color:var(--fb-muted); font-size:12px; display:block;">Score < {percent(config.low_cut, "th")} Percentile</span></div>
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+TABS = {
+    "📌 Overview": render_overview,
+    "🧭 Quadrant": render_quadrant,
+    "⚖️ Org vs Team": render_calibration,
+    "👥 People": render_people,
+    "📈 Trends": render_trends,
+    "ℹ️ Logic Guide": render_logic_guide,
+}
+# on_change="rerun" makes the tabs track which one is open, so hidden tabs skip
+# their data prep and figure building entirely.
+for tab, (label, render) in zip(st.tabs(list(TABS), on_change="rerun", key="active_tab"), TABS.items()):
+    if tab.open is not False:
+        with tab, prof.span(f"tab {label}"):
+            render()
+
+# =============================================================================
+# 8) PROFILING
+# =============================================================================
+if prof.enabled:
+    prof.finish()
+    metrics = profiling_metrics()
+    metrics.observe(prof)
+    if TRACE_LOG: profiling.append_jsonl(TRACE_LOG, prof)
+    if TRACE_PROM: profiling.write_prometheus(TRACE_PROM, metrics)
+
+if is_admin:
+    with st.sidebar, st.expander("⏱️ Profiling"):
+        st.caption(f"This rerun took {prof.elapsed() * 1000:,.0f} ms · {metrics.reruns:,} reruns profiled in this process")
+        st.dataframe(
+            [{"Stage": "· " * s["depth"] + s["name"], "ms": round(s["seconds"] * 1000, 1),
+              "KB": round(s["bytes"] / 1024, 1) if "bytes" in s else None, "Cached": s.get("cached")}
+             for s in prof.ordered()],
+            use_container_width=True, hide_index=True,
+        )
+        st.caption("Process totals")
+        st.dataframe(
+            [{"Stage": name, "Calls": n, "Mean ms": round(mean * 1000, 1), "Total s": round(total, 2)}
+             for name, n, mean, total in metrics.summary()],
+            use_container_width=True, hide_index=True,
+        )
+        st.download_button("Prometheus metrics", metrics.prometheus(), file_name="talent_metrics.prom",
+                           mime="text/plain", on_click="ignore", use_container_width=True)
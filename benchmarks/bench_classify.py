@@ -0,0 +1,89 @@
+"""Row-wise ``df.apply`` classification vs ``scoring.assign_ratings``, which the app runs.
+
+    python benchmarks/bench_classify.py            # 10k, 100k, 1M rows
+    python benchmarks/bench_classify.py 50000      # custom sizes
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from talent import scoring  # noqa: E402
+
+
+# --- Legacy path, as it was inside load_data() ---
+def get_box(x, y):
+    is_x_low = x < 0.30
+    is_x_high = x > 0.80
+    is_x_med = not (is_x_low or is_x_high)
+
+    is_y_low = y < 0.30
+    is_y_high = y > 0.80
+    is_y_med = not (is_y_low or is_y_high)
+
+    if is_y_high:
+        if is_x_high: return "Top Talent"
+        if is_x_med:  return "Future Leader"
+        if is_x_low:  return "Rough Diamond"
+    if is_y_med:
+        if is_x_high: return "Impact Driver"
+        if is_x_med:  return "The Keystone"
+        if is_x_low:  return "Inconsistent Player"
+    if is_y_low:
+        if is_x_high: return "Trusted Advisor"
+        if is_x_med:  return "Practitioner"
+        if is_x_low:  return "Talent Mismatch"
+    return "The Keystone"
+
+
+def get_status(row):
+    if row["Final Rating"] == "New to Rate": return "-"
+    if row["Final Rating"] == row["Team_Rating"]: return "🟰"
+    avg_global = (row["X_Pct"] + row["Y_Pct"]) / 2
+    avg_local = (row["X_Pct_Team"] + row["Y_Pct_Team"]) / 2
+    if avg_global > avg_local + 0.03: return "⬆️ Higher in Org"
+    if avg_global < avg_local - 0.03: return "⬇️ Lower in Org"
+    return "🟰"
+
+
+def legacy(df):
+    mask = df["Category"] != "New to Rate"
+    df["Final Rating"] = df.apply(lambda r: "New to Rate" if str(r.get("Category", "")).strip() == "New to Rate" else get_box(r["X_Pct"], r["Y_Pct"]), axis=1)
+    df["Team_Rating"] = df.apply(lambda r: "New to Rate" if not mask[r.name] else get_box(r["X_Pct_Team"], r["Y_Pct_Team"]), axis=1)
+    df["Comparison"] = df.apply(get_status, axis=1)
+    return df
+
+
+def make_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Category": rng.choice(["Evaluated", "New to Rate"], n, p=[0.92, 0.08]),
+        "X_Pct": rng.random(n),
+        "Y_Pct": rng.random(n),
+        "X_Pct_Team": rng.random(n),
+        "Y_Pct_Team": rng.random(n),
+    })
+    new = df["Category"] == "New to Rate"
+    df.loc[new, ["X_Pct_Team", "Y_Pct_Team"]] = np.nan
+    return df
+
+
+def timed(fn, df):
+    t0 = time.perf_counter()
+    out = fn(df.copy())
+    return out, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'rows':>10} {'apply (s)':>12} {'assign_ratings (s)':>20} {'speedup':>9}")
+    for n in sizes:
+        df = make_frame(n)
+        old, t_old = timed(legacy, df)
+        new, t_new = timed(scoring.assign_ratings, df)
+        for col in ["Final Rating", "Team_Rating", "Comparison"]:
+            assert (old[col] == new[col].astype(str)).all(), f"label mismatch in {col}"
+        print(f"{n:>10,} {t_old:>12.3f} {t_new:>20.4f} {t_old / t_new:>8.0f}x")
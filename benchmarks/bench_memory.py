@@ -0,0 +1,139 @@
+"""Memory of the shared dataset and of each session's filtered views.
+
+    python benchmarks/bench_memory.py                # 10k and 100k employees
+    python benchmarks/bench_memory.py 250000         # employees
+
+"before" is the layout the app used to hold: text columns, float64 scores
+and a Box_Def string per row. "after" is ``compact.compact``, with Box_Def
+looked up only for the rows being exported. The per-session columns are
+the bytes a rerun allocates to build trend_df and final_df for a selection.
+
+The second table is ``shared``: the compacted frame written once as an Arrow
+file that every worker process maps. "private" is what opening it costs a
+process on top of the shared pages (categories, pandas wrappers).
+
+The last table is what one rerun of a session allocates and holds: the
+indexes fetched through Streamlit's cache, the selection, the KPI counts
+and the calibration leaderboard. ``st.cache_data`` unpickles a fresh copy
+of every index on each call; ``st.cache_resource``, which the app uses,
+hands out the one shared object.
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pyarrow as pa
+import streamlit as st
+from streamlit import logger
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import make_scored  # noqa: E402
+from talent import bitmap, calibration, classify, compact, cube, ranking, shared, transitions  # noqa: E402
+
+QUARTERS = 4
+EMPLOYEES = (10_000, 100_000)
+DEFINITIONS = {label: f"Definition of {label}, a sentence of about this length." for label in classify.BOX_LABELS}
+
+
+def allocated(build):
+    """Bytes ``build()`` allocates and keeps (NumPy via tracemalloc, Arrow via its pool)."""
+    tracemalloc.start()
+    arrow = pa.total_allocated_bytes()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - arrow
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def mib(n):
+    return f"{n / 2**20:>9.1f}"
+
+
+def sessions(df):
+    index = bitmap.FilterIndex.build(df)
+    latest = index.options("Quarter")[-1]
+    unit = index.options("Business Unit")[0]
+    quarter = index.select({"Quarter": [latest]})
+    unit_rows = index.select({"Business Unit": [unit]})
+    unit_quarter = index.select({"Quarter": [latest]}, within=unit_rows)
+    return {
+        "latest quarter": (None, quarter),
+        "one BU, latest quarter": (unit_rows, unit_quarter),
+    }
+
+
+# The per-version indexes app.py loads on every rerun
+INDEXES = {
+    "percentile index": ranking.PercentileIndex.build,
+    "rating cube": cube.RatingCube.build,
+    "calibration": calibration.ManagerCalibration.build,
+    "transitions": transitions.TransitionCube.build,
+    "filter index": bitmap.FilterIndex.build,
+}
+
+
+def loaders(cache):
+    """One loader per index behind ``cache``, declared as app.py declares them."""
+    loads = {}
+    for name, build in INDEXES.items():
+        def load(_df, version, mode, build=build):
+            return build(_df)
+        load.__qualname__ = f"load_{name.replace(' ', '_')}"  # one cache per index
+        loads[name] = cache(show_spinner=False, max_entries=4)(load)
+    return loads
+
+
+def rerun(df, loads, filters):
+    """The data work of one rerun; returns what the script holds until it ends."""
+    indexes = {name: load(df, df.attrs["version"], ranking.GLOBAL) for name, load in loads.items()}
+    selection = shared.Selection(df, indexes["filter index"].select(filters))
+    counts = indexes["rating cube"].rating_counts(filters)
+    board = indexes["calibration"].leaderboard(filters, min_size=3)
+    return indexes, selection, counts, board
+
+
+if __name__ == "__main__":
+    logger.set_log_level("error")  # caches outside a running app warn about it
+    by_data, by_resource = loaders(st.cache_data), loaders(st.cache_resource)
+    counts = [int(a) for a in sys.argv[1:]] or EMPLOYEES
+    for employees in counts:
+        scored = make_scored(employees * QUARTERS, quarters=QUARTERS)
+        before = scored.assign(
+            **{c: scored[c].astype(str) for c in ("Final Rating", "Team_Rating", "Comparison")},
+            Box_Def=scored["Final Rating"].astype(str).map(DEFINITIONS),
+        )
+        after = compact.compact(scored)
+
+        print(f"\n{employees:,} employees x {QUARTERS} quarters ({len(scored):,} rows)")
+        print(f"{'':<34}{'before MiB':>10}{'after MiB':>10}")
+        print(f"{'shared dataset':<34}{mib(compact.memory_bytes(before))} {mib(compact.memory_bytes(after))}")
+        for name, (trend_rows, final_rows) in sessions(after).items():
+            old = allocated(lambda: (before.iloc[trend_rows] if trend_rows is not None else before.copy(),
+                                     before.iloc[final_rows]))
+            new = allocated(lambda: (compact.view(after, trend_rows), compact.view(after, final_rows)))
+            print(f"{'per session: ' + name:<34}{mib(old)} {mib(new)}")
+
+        after.attrs["version"] = f"bench-{employees}"
+        with tempfile.TemporaryDirectory() as directory:
+            frame = shared.share(after, "bench", directory)
+            path = shared.path_for("bench", after.attrs["version"], directory)
+            mapped = allocated(lambda: shared.open_frame(path))
+            print(f"\n{'shared (memory-mapped)':<34}{'file MiB':>10}{'private MiB':>12}")
+            print(f"{'per process: open':<34}{mib(os.path.getsize(path))} {mib(mapped):>11}")
+
+            index = bitmap.FilterIndex.build(frame)
+            latest = index.options("Quarter")[-1]
+            unit = index.options("Business Unit")[0]
+            print(f"\n{'per rerun':<34}{'cache_data':>10}{'cache_resource':>15}")
+            for name, filters in (("latest quarter", {"Quarter": [latest]}),
+                                  ("one BU, latest quarter", {"Business Unit": [unit], "Quarter": [latest]})):
+                for loads in (by_data, by_resource):
+                    rerun(frame, loads, filters)  # the first session builds the indexes
+                old = allocated(lambda: rerun(frame, by_data, filters))
+                new = allocated(lambda: rerun(frame, by_resource, filters))
+                print(f"{name:<34}{mib(old)} {mib(new):>14}")
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            del frame
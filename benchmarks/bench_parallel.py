@@ -0,0 +1,55 @@
+"""Cold ingest of a sharded source with 1, 2, 4 and 8 worker processes.
+
+    python benchmarks/bench_parallel.py                 # 8 CSV shards, 1M rows
+    python benchmarks/bench_parallel.py 2000000 16      # rows, shards
+    python benchmarks/bench_parallel.py 80000 8 xlsx    # one workbook, one sheet per shard
+
+Checks that the two-phase rank matches ``scoring.score`` on the stacked data.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import make_workbook  # noqa: E402
+from talent import parallel, scoring, sources  # noqa: E402
+
+WORKERS = (1, 2, 4, 8)
+
+
+def write_shards(df, n_shards, fmt, directory):
+    parts = np.array_split(np.arange(len(df)), n_shards)
+    if fmt == "xlsx":
+        path = os.path.join(directory, "book.xlsx")
+        with pd.ExcelWriter(path) as writer:
+            for i, rows in enumerate(parts):
+                df.iloc[rows].to_excel(writer, sheet_name=f"S{i:02d}", index=False)
+        return sources.from_uri(path + "#*")
+    for i, rows in enumerate(parts):
+        df.iloc[rows].to_csv(os.path.join(directory, f"shard-{i:02d}.csv"), index=False)
+    return sources.from_uri(os.path.join(directory, "shard-*.csv"))
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_shards = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    fmt = sys.argv[3] if len(sys.argv) > 3 else "csv"
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = write_shards(make_workbook(rows, quarters=n_shards), n_shards, fmt, directory)
+        expected = scoring.score(source.read())
+        print(f"{rows:,} rows in {n_shards} {fmt} shards, {os.cpu_count()} CPU(s)")
+        print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+        base = None
+        for workers in WORKERS:
+            t0 = time.perf_counter()
+            got = parallel.score(source.shards(), workers=workers)
+            seconds = time.perf_counter() - t0
+            base = base or seconds
+            for col in ("X_Pct", "Y_Pct", "X_Pct_Team", "Final Rating", "Team_Rating"):
+                assert got[col].equals(expected[col]), col
+            print(f"{workers:>8} {seconds:>9.2f} {base / seconds:>7.1f}x")
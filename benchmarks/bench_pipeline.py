@@ -0,0 +1,241 @@
+"""Stage timings of the dashboard's data path, with stored baselines.
+
+    python benchmarks/bench_pipeline.py                    # 1k, 10k, 100k rows; compare to baselines
+    python benchmarks/bench_pipeline.py 1000 1000000       # custom sizes
+    python benchmarks/bench_pipeline.py --save             # record the current numbers as baselines
+    python benchmarks/bench_pipeline.py --tolerance 0.25   # fail past +25% (default +50%)
+
+Each stage runs the code a rerun of the app runs, without Streamlit, on
+synthetic rows with the Data.xlsx schema (4 quarters). The time is the
+best of ``--repeat`` runs after a warm-up; memory is the tracemalloc peak
+of one extra run (Python and NumPy allocations; Arrow string buffers are
+not counted).
+
+Stages are compared to ``baselines.json`` next to this file. The script
+exits with status 1 when a stage is slower, or peaks higher, than its
+baseline by more than the tolerance, both in a first run and in a
+confirming re-run of that size. Tiny absolute differences are ignored as
+noise. A fixed calibration workload is timed on every run and baseline
+times are scaled by its ratio, which absorbs a machine that is simply
+slower or busier today. Baselines are still machine specific: re-record
+them with ``--save`` on the machine that runs the check.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import make_workbook  # noqa: E402
+from talent import (  # noqa: E402
+    bitmap, calibration, classify, compact, cube, grid, quadrant, ranking, rollup, scoring, search, transitions,
+)
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+SIZES = (1_000, 10_000, 100_000)
+QUARTERS = 4
+TOLERANCE = 0.5
+# Differences below these never count as regressions
+MIN_SECONDS = 0.02
+MIN_BYTES = 1 << 20
+
+COLORS = {label: "#888888" for label in classify.BOX_LABELS}
+THEME = {"--fb-axis": "#999", "--plotly-temp": "plotly_dark", "--fb-text": "#E5E7EB"}
+
+
+def stages(raw, parquet_path):
+    """``(name, run)`` pairs in app order; ``run(state)`` may store results for later stages."""
+
+    def load(s):
+        s["df"] = compact.compact(scoring.score(raw.copy()))
+
+    def snapshot_read(s):
+        compact.compact(pd.read_parquet(parquet_path))
+
+    def indexes(s):
+        df = s["df"]
+        s["filters"] = bitmap.FilterIndex.build(df)
+        s["cube"] = cube.RatingCube.build(df)
+        s["pct"] = ranking.PercentileIndex.build(df)
+        s["rollup"] = rollup.QuarterRollup.build(df)
+        s["flows"] = transitions.TransitionCube.build(df)
+
+    def sidebar(s):
+        index = s["filters"]
+        unit = index.options("Business Unit")[0]
+        trend_rows = index.select({"Business Unit": [unit]})
+        for col in ("Department", "Sub Department", "Manager"):
+            index.options(col, trend_rows)
+        latest = index.options("Quarter")[-1]
+        s["struct"] = {"Business Unit": [unit]}
+        s["quarter"] = [latest]
+        s["rows"] = index.select({"Quarter": [latest]}, within=trend_rows)
+        s["final_df"] = index.view(s["df"], s["rows"])
+        s["quarter_df"] = index.view(s["df"], index.select({"Quarter": [latest]}))
+
+    def kpis(s):
+        s["cube"].rating_counts({**s["struct"], "Quarter": s["quarter"]})
+
+    def quadrant_chart(s):
+        # The default view: every unit, latest quarter
+        cuts = tuple(s["pct"].cut(col, q) for col in ranking.SCORE_COLS for q in (30, 80))
+        fig, _ = quadrant.build_figure(s["quarter_df"], cuts, COLORS, THEME)
+        fig.to_json()
+
+    def trends(s):
+        s["rollup"].headcount(s["struct"])
+        s["rollup"].box_trend(s["struct"], classify.BOX_LABELS[:-1])
+        s["flows"].links(s["struct"])
+
+    def calibration_table(s):
+        s["calibration"] = calibration.ManagerCalibration.build(s["df"])
+
+    def calibration_board(s):
+        filters = {**s["struct"], "Quarter": s["quarter"]}
+        board = s["calibration"].leaderboard(filters, min_size=3)
+        if len(board):
+            s["calibration"].distribution(board["Manager"].iat[0], filters)
+
+    def people_grid(s):
+        window, _ = grid.SortIndex(s["df"]).window(None, "X_Score", False, 0, 50)
+        s["df"].iloc[window]
+
+    def people_search(s):
+        search.SearchIndex.build(s["df"]).search("employee 12", within=None)
+
+    return [
+        ("load (score + compact)", load),
+        ("snapshot read", snapshot_read),
+        ("index build", indexes),
+        ("sidebar filters", sidebar),
+        ("kpi counts", kpis),
+        ("quadrant chart", quadrant_chart),
+        ("trends", trends),
+        ("calibration table", calibration_table),
+        ("calibration leaderboard", calibration_board),
+        ("people grid page", people_grid),
+        ("people search", people_search),
+    ]
+
+
+def measure(run, state, repeat):
+    run(state)  # warm-up: imports, plotly templates, lazy sorts
+    best = float("inf")
+    for _ in range(repeat):
+        # As timeit does: a collection pass landing in one stage is not that stage's cost
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            run(state)
+            best = min(best, time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def calibrate(repeat=5):
+    """Seconds for a fixed sort + groupby workload, to scale baselines by this machine's current speed."""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({"key": rng.integers(0, 1000, 200_000), "value": rng.random(200_000)})
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        np.sort(rng.random(1_000_000))
+        frame.groupby("key")["value"].rank(pct=True)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_size(rows, repeat):
+    raw = make_workbook(rows, quarters=QUARTERS)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        parquet_path = os.path.join(directory, "snapshot.parquet")
+        scoring.score(raw.copy()).to_parquet(parquet_path, index=False)
+        state = {}
+        for name, run in stages(raw, parquet_path):
+            seconds, peak = measure(run, state, repeat)
+            results[name] = {"seconds": seconds, "peak_bytes": peak}
+    return results
+
+
+def scaled(base, speed):
+    """A baseline with its time scaled by ``speed`` (now / then calibration)."""
+    return {**base, "seconds": base["seconds"] * speed}
+
+
+def regressions(results, baselines, tolerance, speed=1.0):
+    found = []
+    for key, now in results.items():
+        if key not in baselines:
+            continue
+        base = scaled(baselines[key], speed)
+        for metric, floor in (("seconds", MIN_SECONDS), ("peak_bytes", MIN_BYTES)):
+            if now[metric] > base[metric] * (1 + tolerance) and now[metric] - base[metric] > floor:
+                found.append((key, metric, base[metric], now[metric]))
+    return found
+
+
+def load_baselines(path=BASELINES):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=list(SIZES), help="row counts (1k to 1M)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage; the best is kept")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown, as a fraction")
+    parser.add_argument("--save", action="store_true", help="store these results as the baselines")
+    parser.add_argument("--baselines", default=BASELINES, help="baseline file")
+    args = parser.parse_args()
+
+    baselines = load_baselines(args.baselines)
+    reference = calibrate()
+    # Shared or throttled machines drift; baseline times are scaled by the calibration ratio
+    speed = reference / baselines["calibration"]["seconds"] if "calibration" in baselines else 1.0
+    results = {}
+    print(f"calibration {reference:.3f}s, baseline times scaled by {speed:.2f}\n")
+    print(f"{'rows':>9}  {'stage':<24}{'seconds':>9}{'baseline':>10}{'peak MiB':>10}{'baseline':>10}")
+    for rows in args.sizes:
+        for name, now in run_size(rows, args.repeat).items():
+            key = f"{name} @ {rows}"
+            results[key] = now
+            base = scaled(baselines[key], speed) if key in baselines else {}
+            base_s = f"{base['seconds']:>10.3f}" if base else f"{'-':>10}"
+            base_m = f"{base['peak_bytes'] / 2**20:>10.1f}" if base else f"{'-':>10}"
+            print(f"{rows:>9,}  {name:<24}{now['seconds']:>9.3f}{base_s}{now['peak_bytes'] / 2**20:>10.1f}{base_m}")
+
+    if args.save:
+        with open(args.baselines, "w") as f:
+            json.dump({**baselines, **results, "calibration": {"seconds": reference}}, f, indent=1, sort_keys=True)
+        print(f"\nSaved {len(results)} baselines to {args.baselines}")
+        sys.exit(0)
+
+    found = regressions(results, baselines, args.tolerance, speed)
+    if found:
+        # Confirm before failing: re-run the sizes involved and keep each stage's better result
+        for rows in sorted({int(key.rsplit("@ ", 1)[1]) for key, *_ in found}):
+            for name, again in run_size(rows, args.repeat).items():
+                now = results[f"{name} @ {rows}"]
+                now["seconds"] = min(now["seconds"], again["seconds"])
+                now["peak_bytes"] = min(now["peak_bytes"], again["peak_bytes"])
+        found = regressions(results, baselines, args.tolerance, speed)
+    for key, metric, base, now in found:
+        print(f"REGRESSION {key}: {metric} {base:,.3f} -> {now:,.3f} ({now / base - 1:+.0%})")
+    sys.exit(1 if found else 0)
@@ -0,0 +1,39 @@
+"""Quadrant build time and JSON payload: exact markers vs density cells.
+
+    python benchmarks/bench_quadrant.py            # 1k, 10k, 100k employees
+    python benchmarks/bench_quadrant.py 50000
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import make_scored  # noqa: E402
+from talent import quadrant  # noqa: E402
+
+COLORS = {
+    "Rough Diamond": "#ff8700", "Future Leader": "#B6F500", "Top Talent": "#2d00f7",
+    "Inconsistent Player": "#ffd60a", "The Keystone": "#0aff99", "Impact Driver": "#FF2DD1",
+    "Talent Mismatch": "#ff0000", "Practitioner": "#be0aff", "Trusted Advisor": "#FFFCFB",
+    "New to Rate": "#c8c7d6",
+}
+THEME = {"--fb-axis": "#999", "--plotly-temp": "plotly_dark", "--fb-text": "#E5E7EB"}
+CUTS = (3, 8, 3, 8)
+
+
+def run(data, max_points):
+    t0 = time.perf_counter()
+    fig, _ = quadrant.build_figure(data, CUTS, COLORS, THEME, max_points=max_points)
+    payload = fig.to_json()
+    return time.perf_counter() - t0, len(payload.encode("utf-8"))
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    print(f"{'employees':>10} {'mode':>8} {'build+json (s)':>15} {'payload (KB)':>13}")
+    for n in sizes:
+        # One quarter, as the Quadrant tab shows by default
+        data = make_scored(n, quarters=1)
+        for mode, max_points in (("exact", float("inf")), ("density", 0)):
+            seconds, size = run(data, max_points)
+            print(f"{n:>10,} {mode:>8} {seconds:>15.3f} {size / 1024:>13,.0f}")
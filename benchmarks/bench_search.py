@@ -0,0 +1,49 @@
+"""Employee search: ``str.contains`` scan vs the n-gram index.
+
+    python benchmarks/bench_search.py            # 100k and 1M rows
+    python benchmarks/bench_search.py 250000
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import make_workbook  # noqa: E402
+from talent import search  # noqa: E402
+
+# What someone types, keystroke by keystroke, plus an ID and a typo
+QUERIES = ["e", "em", "emp", "employee 1", "employee 12345", "finbp00042", "emplyee 123"]
+REPEAT = 5
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def scan(df, q):
+    hits = df["EMP Name"].str.contains(q, case=False, na=False) | df["EMP ID"].str.contains(q, case=False, na=False)
+    return np.flatnonzero(hits.to_numpy())
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        df = make_workbook(n)
+        t0 = time.perf_counter()
+        index = search.SearchIndex.build(df)
+        print(f"\n{n:,} rows, index built in {time.perf_counter() - t0:.2f}s")
+        print(f"{'query':>16} {'contains (ms)':>14} {'index (ms)':>11} {'speedup':>8} {'rows':>9}")
+        for q in QUERIES:
+            t_scan, expected = timed(lambda: scan(df, q))
+            t_index, (rows, fuzzy) = timed(lambda: index.search(q))
+            if not fuzzy:
+                assert np.array_equal(rows, expected), q
+            label = f"{q}{' ~' if fuzzy else ''}"
+            print(f"{label:>16} {t_scan * 1e3:>14.2f} {t_index * 1e3:>11.3f} {t_scan / t_index:>7.0f}x {len(rows):>9,}")
@@ -0,0 +1,65 @@
+"""Synthetic workbook rows with the Data.xlsx schema, for benchmarks.
+
+    python benchmarks/synthetic.py 100000 big.parquet      # rows, output (.xlsx, .csv or .parquet)
+
+A written file can be served by the app with TALENT_SOURCE=big.parquet.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from talent import scoring  # noqa: E402
+
+TEAM_SIZE = 8
+
+
+def make_workbook(rows, quarters=4, seed=0):
+    """``rows`` sheet rows: employees x quarters in a BU > Dept > Sub Dept > Manager tree."""
+    rng = np.random.default_rng(seed)
+    employees = max(rows // quarters, 1)
+    managers = max(employees // TEAM_SIZE, 1)
+
+    # Org tree: each manager sits in one sub department, department and BU
+    mgr_sub = rng.integers(0, max(managers // 4, 1), managers)
+    sub_dept = mgr_sub // 3
+    sub_bu = sub_dept // 4
+    emp_mgr = rng.integers(0, managers, employees)
+
+    emp = np.arange(rows) % employees
+    quarter = np.arange(rows) // employees % quarters
+    mgr = emp_mgr[emp]
+    df = pd.DataFrame({
+        "EMP ID": pd.Series(emp).map("FINBP{:07d}".format),
+        "EMP Name": pd.Series(emp).map("Employee {}".format),
+        "DOJ": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D"),
+        "Business Unit": pd.Series(sub_bu[mgr_sub[mgr]]).map("BU {}".format),
+        "Department": pd.Series(sub_dept[mgr_sub[mgr]]).map("Dept {}".format),
+        "Sub Department": pd.Series(mgr_sub[mgr]).map("Sub {}".format),
+        "Manager": pd.Series(mgr).map("Manager {}".format),
+        "Category": np.where(rng.random(rows) < 0.05, "New to Rate", "Evaluated"),
+        "Quarter": pd.Series(quarter).map("Q{}".format),
+    })
+    for col in scoring.METRIC_COLS:
+        df[col] = np.round(np.clip(rng.normal(7, 1.5, rows), 0, 10) * 2) / 2
+    return df
+
+
+def make_scored(rows, quarters=4, seed=0):
+    return scoring.score(make_workbook(rows, quarters, seed))
+
+
+if __name__ == "__main__":
+    rows, path = int(sys.argv[1]), sys.argv[2]
+    quarters = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    df = make_workbook(rows, quarters)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        df.to_parquet(path, index=False)
+    elif ext == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False, sheet_name="Base")
+    print(f"Wrote {len(df):,} rows to {path}")
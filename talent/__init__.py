@@ -0,0 +1 @@
+"""Streamlit-free data engine behind the 9-box dashboard."""
@@ -0,0 +1,3 @@
+from talent.batch import main
+
+raise SystemExit(main())
@@ -0,0 +1,169 @@
+"""Headless batch scoring: workbook, CSV or Parquet in, scored file out.
+
+    python -m talent Data.xlsx scored.parquet
+    python -m talent history.csv scored.csv.gz --mode quarter --chunk-rows 200000
+
+Nothing here touches Streamlit, so a nightly job scores the full history
+without the dashboard. The input is streamed in row chunks:
+
+1. Each chunk is parsed, its metrics are coerced, its text columns are
+   made text and its X/Y scores are computed. The chunk is spooled to a
+   temporary Parquet file, and only the ranking columns (quarter, manager,
+   category, scores) are kept.
+2. Percentiles, team ranks and the 9-box run on those columns, which
+   gives exactly the ranks ``scoring.score`` would over the whole sheet.
+3. The spooled chunks are read back one at a time, cast to one output
+   schema, joined with their ratings and appended to the output.
+
+Peak memory is one chunk plus the ranking columns; the source is parsed
+once. Output columns and values match ``scoring.score`` on the full file.
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from talent import export, ranking, scoring, snapshot
+
+CHUNK_ROWS = 100_000
+RANK_INPUTS = ["Quarter", "Manager", "Category"]
+# Always text, whatever a chunk's cells look like (a block of blanks reads as float)
+TEXT_COLS = ["EMP ID", "EMP Name", "Business Unit", "Department", "Sub Department", "Manager", "Category", "Quarter"]
+SCORED_COLS = [
+    "X_Score", "Y_Score", "X_Pct", "Y_Pct", "X_Pct_Team", "Y_Pct_Team",
+    "Final Rating", "Team_Rating", "Comparison",
+]
+
+
+def _excel_chunks(path, chunk_rows, sheet=None):
+    import openpyxl
+
+    book = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = (book[sheet] if sheet else book.worksheets[0]).iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(header)]
+        rows = (r for r in rows if any(v is not None for v in r))
+        while block := list(itertools.islice(rows, chunk_rows)):
+            yield pd.DataFrame(block, columns=columns)
+    finally:
+        book.close()
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS, sheet=None):
+    """The rows of a workbook sheet, CSV or Parquet file as frames of at most ``chunk_rows``."""
+    name = path.lower()
+    if name.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif name.endswith((".csv", ".csv.gz")):
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    elif name.endswith((".xlsx", ".xlsm")):
+        yield from _excel_chunks(path, chunk_rows, sheet)
+    elif name.endswith(".xls"):
+        yield from export.chunks(pd.read_excel(path, sheet_name=sheet or 0), chunk_rows)
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+
+
+def _spool(chunks, spool_dir):
+    """Score and spool every chunk; returns the chunk files, the ranking columns and their schemas."""
+    files, keys, schemas = [], [], []
+    for i, chunk in enumerate(chunks):
+        chunk = scoring.prepare(chunk)
+        chunk = snapshot.arrow_safe(chunk.assign(**{c: snapshot.as_text(chunk[c]) for c in TEXT_COLS if c in chunk.columns}))
+        chunk["X_Score"] = scoring.weighted(chunk, scoring.PERF_WEIGHTS)
+        chunk["Y_Score"] = scoring.weighted(chunk, scoring.POT_WEIGHTS)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        files.append(os.path.join(spool_dir, f"chunk-{i:05d}.parquet"))
+        pq.write_table(table, files[-1])
+        schemas.append(table.schema)
+        keys.append(chunk[[c for c in RANK_INPUTS + list(ranking.SCORE_COLS) if c in chunk.columns]])
+    return files, keys, schemas
+
+
+def rate(keys, mode=ranking.GLOBAL):
+    """Percentiles and 9-box for the ranking columns, as ``scoring.score`` computes them."""
+    part = ranking.partition_keys(mode)
+    keys["X_Pct"] = ranking.rank_pct(keys, "X_Score", part)
+    keys["Y_Pct"] = ranking.rank_pct(keys, "Y_Score", part)
+    scoring.team_ranks(keys, mode)
+    return scoring.assign_ratings(keys)
+
+
+def _unify(fields):
+    """One field for a column across chunks; text when their types cannot be promoted to one."""
+    try:
+        return pa.unify_schemas([pa.schema([f]) for f in fields], promote_options="permissive").field(0)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        return pa.field(fields[0].name, pa.large_string())
+
+
+def _output_schema(schemas, scored):
+    """The output schema: input columns typed by their role (see ``TEXT_COLS``), then the scored columns."""
+    by_name = {}
+    for schema in schemas:
+        for field in schema:
+            if field.name not in SCORED_COLS:
+                by_name.setdefault(field.name, []).append(field)
+    fields = [pa.field(name, pa.large_string()) if name in TEXT_COLS else _unify(fields)
+              for name, fields in by_name.items()]
+    extra = pa.Schema.from_pandas(scored.iloc[:0][SCORED_COLS], preserve_index=False)
+    return pa.schema(fields + list(extra))
+
+
+def _scored_chunks(files, scored, schema=None):
+    start = 0
+    for path in files:
+        table = pq.read_table(path)
+        if schema is not None:
+            table = table.cast(pa.schema([schema.field(name) for name in table.column_names]))
+        chunk = table.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        for col in SCORED_COLS:
+            chunk[col] = scored[col].iloc[start:start + len(chunk)]
+        start += len(chunk)
+        yield chunk
+
+
+def score_file(src, dst, mode=ranking.GLOBAL, chunk_rows=CHUNK_ROWS, sheet=None):
+    """Score ``src`` into ``dst`` (format from its extension); returns the row count."""
+    fmt = export.format_of(dst)
+    with tempfile.TemporaryDirectory(prefix="talent-batch-") as spool_dir:
+        files, keys, schemas = _spool(read_chunks(src, chunk_rows, sheet), spool_dir)
+        if not files:
+            raise ValueError(f"No rows in {src}")
+        scored = rate(pd.concat(keys, ignore_index=True), mode)
+        del keys
+        schema = _output_schema(schemas, scored) if fmt == "parquet" else None
+        write = export.STREAM_WRITERS[fmt]
+        snapshot.atomic_write(os.path.abspath(dst), lambda tmp: write(_scored_chunks(files, scored, schema), tmp, schema))
+    return len(scored)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m talent", description="Score an employee sheet into a 9-box file.")
+    parser.add_argument("input", help="workbook (.xlsx), CSV or Parquet file")
+    parser.add_argument("output", help="scored file: .csv, .csv.gz or .parquet")
+    parser.add_argument("--mode", choices=list(ranking.RANK_MODES), default=ranking.GLOBAL,
+                        help="percentile basis (default: %(default)s)")
+    parser.add_argument("--sheet", help="workbook sheet to read (default: the first)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows per chunk (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        rows = score_file(args.input, args.output, args.mode, args.chunk_rows, args.sheet)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Scored {rows:,} rows into {args.output} in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return 0
@@ -0,0 +1,96 @@
+"""Dictionary-encoded bitmap index over the sidebar filter columns.
+
+Each filter column is factorized once per dataset version. Every distinct
+value gets a container: a packed bitmap when the value is dense, or a
+sorted row-id list when it is sparse (a bitmap costs n bits, a row-id list
+32 bits per row, so the smaller one wins, as in Roaring). A selection is
+an OR over the chosen values' containers and an AND across columns.
+Cascading option lists come from the same codes.
+"""
+import numpy as np
+import pandas as pd
+
+from talent import compact
+
+FILTER_COLS = ["Business Unit", "Department", "Sub Department", "Manager", "Quarter"]
+
+
+class _Column:
+    def __init__(self, series):
+        codes, values = pd.factorize(series, sort=True)
+        self.values = values
+        self.lookup = {v: i for i, v in enumerate(values)}
+        self.codes = codes.astype(np.int32)
+        self.n = len(codes)
+
+        order = np.argsort(self.codes, kind="stable").astype(np.int32)
+        bounds = np.searchsorted(self.codes[order], np.arange(len(values) + 1))
+        self.containers = []
+        for i in range(len(values)):
+            rows = order[bounds[i]:bounds[i + 1]]
+            if len(rows) * 32 > self.n:
+                bits = np.zeros(self.n, dtype=bool)
+                bits[rows] = True
+                self.containers.append(np.packbits(bits))
+            else:
+                self.containers.append(rows)
+
+    def mask(self, selected):
+        """Boolean row mask: OR over the containers of ``selected`` values."""
+        mask = np.zeros(self.n, dtype=bool)
+        for v in selected:
+            i = self.lookup.get(v)
+            if i is None:
+                continue
+            container = self.containers[i]
+            if container.dtype == np.uint8:
+                mask |= np.unpackbits(container, count=self.n).view(bool)
+            else:
+                mask[container] = True
+        return mask
+
+    def present(self, rows=None):
+        """Distinct values (sorted) among ``rows``; all values when ``rows`` is None."""
+        if rows is None:
+            return self.values.tolist()
+        codes = self.codes[rows]
+        seen = np.bincount(codes[codes >= 0], minlength=len(self.values)) > 0
+        return self.values[seen].tolist()
+
+
+class FilterIndex:
+    def __init__(self, columns, n):
+        self.columns = columns
+        self.n = n
+
+    @classmethod
+    def build(cls, df, cols=FILTER_COLS):
+        return cls({c: _Column(df[c]) for c in cols if c in df.columns}, len(df))
+
+    def options(self, col, rows=None):
+        """Sorted options for ``col`` among the rows already selected."""
+        return self.columns[col].present(rows)
+
+    def select(self, filters, within=None):
+        """Row ids (ascending) matching ``{column: [values]}``; None means every row.
+
+        Empty selections are ignored, as in the sidebar. ``within`` narrows an
+        earlier selection.
+        """
+        active = {c: v for c, v in filters.items() if v and c in self.columns}
+        if not active:
+            return within
+        mask = None
+        for col, selected in active.items():
+            m = self.columns[col].mask(selected)
+            mask = m if mask is None else mask & m
+        if within is not None:
+            keep = np.zeros(self.n, dtype=bool)
+            keep[within] = True
+            mask &= keep
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def view(df, rows):
+        """``df`` restricted to ``rows``; the frame itself when nothing is filtered."""
+        return compact.view(df, rows)
@@ -0,0 +1,104 @@
+"""Per-manager calibration table, built once per dataset version.
+
+There is one row per (Business Unit, Department, Sub Department, Manager,
+Quarter). Each row holds the team size and the count of each box under the
+team rating and under the org rating. It also holds how many employees are
+⬆️ Higher or ⬇️ Lower in Org than in their team. Only rated employees are
+counted, as in the Calibration Matrix.
+
+Every column is a count, so the rows of any filter selection sum to that
+selection's totals. The leaderboard sums them per manager and derives the
+scores from the sums:
+
+* Drift: the share of the team that would have to change box for the
+  team distribution to match the org distribution. It is the total
+  variation distance, from 0 (same shape) to 1 (no box in common).
+* Net Shift: (higher - lower) / team size. A positive value means the team
+  ranking undersells these people against the org, and a negative value
+  means it flatters them.
+
+The Calibration tab reads the leaderboard and one manager's box split from
+this table. Employee rows are only fetched for the manager under review.
+"""
+import numpy as np
+import pandas as pd
+
+from talent import classify
+
+DIMENSIONS = ["Business Unit", "Department", "Sub Department", "Manager"]
+RATED_BOXES = [label for label in classify.BOX_LABELS if label != classify.NEW_TO_RATE]
+TEAM_COLS = [f"Team: {label}" for label in RATED_BOXES]
+ORG_COLS = [f"Org: {label}" for label in RATED_BOXES]
+HIGHER = classify.STATUS_LABELS[classify.STATUS_HIGHER]
+LOWER = classify.STATUS_LABELS[classify.STATUS_LOWER]
+COUNT_COLS = ["Team Size", "Higher", "Lower"] + TEAM_COLS + ORG_COLS
+
+
+def _box_counts(df, keys, col, names):
+    counts = (
+        df.groupby(keys + [col], dropna=False, observed=True).size()
+        .unstack(col, fill_value=0)
+        .reindex(columns=RATED_BOXES, fill_value=0)
+    )
+    counts.columns = names
+    return counts
+
+
+def _scores(table):
+    size = table["Team Size"].to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gap = np.abs(table[TEAM_COLS].to_numpy(dtype=float) - table[ORG_COLS].to_numpy(dtype=float)).sum(axis=1)
+        drift = np.where(size > 0, gap / 2 / size, 0.0)
+        net = np.where(size > 0, (table["Higher"].to_numpy() - table["Lower"].to_numpy()) / size, 0.0)
+    return table.assign(Drift=drift, **{"Net Shift": net})
+
+
+class ManagerCalibration:
+    def __init__(self, table, dims):
+        self.table = table
+        self.dims = dims
+
+    @classmethod
+    def build(cls, df):
+        dims = [c for c in DIMENSIONS if c in df.columns]
+        keys = dims + (["Quarter"] if "Quarter" in df.columns else [])
+        if "Manager" not in dims:
+            return cls(pd.DataFrame(columns=keys + COUNT_COLS), dims)
+        rated = df[(df["Comparison"] != classify.STATUS_LABELS[classify.STATUS_NA]).to_numpy()]
+        status = rated.groupby(keys + ["Comparison"], dropna=False, observed=True).size().unstack("Comparison", fill_value=0)
+        table = pd.concat([
+            rated.groupby(keys, dropna=False, observed=True).size().rename("Team Size"),
+            status.reindex(columns=[HIGHER, LOWER], fill_value=0).set_axis(["Higher", "Lower"], axis=1),
+            _box_counts(rated, keys, "Team_Rating", TEAM_COLS),
+            _box_counts(rated, keys, "Final Rating", ORG_COLS),
+        ], axis=1).fillna(0).astype(np.int64)
+        return cls(table.reset_index(), dims)
+
+    def slice(self, filters=None):
+        """Table rows matching ``{column: [selected values]}``; empty selections are ignored."""
+        table = self.table
+        for col, selected in (filters or {}).items():
+            if selected and col in table.columns:
+                table = table[table[col].isin(selected)]
+        return table
+
+    def leaderboard(self, filters=None, min_size=1):
+        """One row per manager over the filtered slice, most drifted first."""
+        table = self.slice(filters)
+        if table.empty:
+            return pd.DataFrame(columns=["Manager"] + COUNT_COLS + ["Drift", "Net Shift"])
+        board = _scores(table.groupby("Manager", observed=True)[COUNT_COLS].sum().reset_index())
+        board = board[board["Team Size"] >= min_size]
+        return board.sort_values(["Drift", "Team Size"], ascending=[False, False], kind="stable").reset_index(drop=True)
+
+    def distribution(self, manager, filters=None):
+        """Team vs org headcount per box for one manager's slice."""
+        totals = self.slice({**(filters or {}), "Manager": [manager]})[TEAM_COLS + ORG_COLS].sum()
+        return pd.DataFrame({
+            "Box": RATED_BOXES,
+            "Team": totals[TEAM_COLS].to_numpy(),
+            "Org": totals[ORG_COLS].to_numpy(),
+        })
+
+    def __len__(self):
+        return len(self.table)
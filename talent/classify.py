@@ -0,0 +1,60 @@
+"""Vectorized 9-box classification.
+
+Percentiles are binned into low / med / high and looked up in a 3x3 table,
+so a whole column is classified with a handful of NumPy ops instead of a
+Python call per row. Labels match the original ``get_box`` / ``get_status``.
+"""
+import numpy as np
+import pandas as pd
+
+LOW_CUT = 0.30
+HIGH_CUT = 0.80
+STATUS_MARGIN = 0.03
+
+# Rows are potential (low -> high), columns are performance (low -> high)
+BOX_GRID = (
+    ("Talent Mismatch", "Practitioner", "Trusted Advisor"),
+    ("Inconsistent Player", "The Keystone", "Impact Driver"),
+    ("Rough Diamond", "Future Leader", "Top Talent"),
+)
+NEW_TO_RATE = "New to Rate"
+BOX_LABELS = tuple(label for row in BOX_GRID for label in row) + (NEW_TO_RATE,)
+NEW_TO_RATE_CODE = len(BOX_LABELS) - 1
+
+STATUS_LABELS = ("-", "🟰", "⬆️ Higher in Org", "⬇️ Lower in Org")
+STATUS_NA, STATUS_SAME, STATUS_HIGHER, STATUS_LOWER = range(len(STATUS_LABELS))
+
+
+def bin_pct(pct, low=LOW_CUT, high=HIGH_CUT):
+    """0 / 1 / 2 for low / med / high. NaN lands in med, as in ``get_box``."""
+    pct = np.asarray(pct, dtype=float)
+    bins = np.ones(pct.shape, dtype=np.int8)
+    bins[pct < low] = 0
+    bins[pct > high] = 2
+    return bins
+
+
+def box_codes(x_pct, y_pct, new_mask=None, low=LOW_CUT, high=HIGH_CUT):
+    """Index into ``BOX_LABELS`` for every row; ``new_mask`` rows become New to Rate."""
+    codes = bin_pct(y_pct, low, high) * 3 + bin_pct(x_pct, low, high)
+    if new_mask is not None:
+        codes[np.asarray(new_mask, dtype=bool)] = NEW_TO_RATE_CODE
+    return codes
+
+
+def status_codes(final_codes, team_codes, x_pct, y_pct, x_pct_team, y_pct_team, margin=STATUS_MARGIN):
+    """Org vs team comparison as an index into ``STATUS_LABELS``."""
+    final_codes = np.asarray(final_codes)
+    avg_global = (np.asarray(x_pct, dtype=float) + np.asarray(y_pct, dtype=float)) / 2
+    avg_local = (np.asarray(x_pct_team, dtype=float) + np.asarray(y_pct_team, dtype=float)) / 2
+
+    codes = np.full(final_codes.shape, STATUS_SAME, dtype=np.int8)
+    differs = final_codes != np.asarray(team_codes)
+    codes[differs & (avg_global > avg_local + margin)] = STATUS_HIGHER
+    codes[differs & (avg_global < avg_local - margin)] = STATUS_LOWER
+    codes[final_codes == NEW_TO_RATE_CODE] = STATUS_NA
+    return codes
+
+
+def as_categorical(codes, labels=BOX_LABELS, index=None):
+    return pd.Series(pd.Categorical.from_codes(codes, categories=list(labels)), index=index)
@@ -0,0 +1,72 @@
+"""Compact in-memory layout of the scored dataset.
+
+The snapshot keeps full precision. The frame the app holds, one per process
+and shared by every session, is narrowed once after loading:
+
+* Repetitive text (org units, managers, quarters, category) is dictionary
+  encoded as a categorical: one small-int code per row and each distinct
+  string stored once. Near-unique columns (names, ids) are left alone,
+  since their dictionary would be as big as the column.
+* Scores and percentiles are stored as float32. Boxes and statuses are
+  already int8 codes over ``classify.BOX_LABELS`` / ``STATUS_LABELS``.
+* Metric inputs are only narrowed when float32 holds them exactly, so
+  what-if re-scoring sees the same numbers as the snapshot.
+* Per-box text (definitions) is not stored per row; ``describe`` looks it
+  up for the rows that are actually shown or exported.
+
+``view`` cuts rows out of the shared frame, as a zero-copy slice when the
+selection is one contiguous run (e.g. a quarter of a quarter-ordered sheet).
+"""
+import numpy as np
+import pandas as pd
+
+from talent import scoring
+
+SCORE_COLS = ["X_Score", "Y_Score", "X_Pct", "Y_Pct", "X_Pct_Team", "Y_Pct_Team"]
+# Text columns with at most this share of distinct values are dictionary encoded
+MAX_DISTINCT_SHARE = 0.5
+
+
+def _is_text(series):
+    return pd.api.types.is_string_dtype(series) or series.dtype == object
+
+
+def compact(df):
+    """Narrowed copy of ``df``: categoricals, float32 scores, lossless metric downcasts."""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if _is_text(s) and not isinstance(s.dtype, pd.CategoricalDtype):
+            if s.nunique(dropna=True) <= MAX_DISTINCT_SHARE * len(s):
+                s = s.astype("category")
+        elif col in SCORE_COLS:
+            s = s.astype(np.float32)
+        elif col in scoring.METRIC_COLS and s.dtype == np.float64:
+            narrow = s.to_numpy().astype(np.float32)
+            if np.array_equal(narrow, s.to_numpy(), equal_nan=True):
+                s = pd.Series(narrow, index=s.index, name=col)
+        out[col] = s
+    compacted = pd.DataFrame(out, index=df.index)
+    compacted.attrs = dict(df.attrs)
+    return compacted
+
+
+def describe(ratings, lookup):
+    """Per-row text for ``ratings`` from a ``{box label: text}`` table, computed per category."""
+    if not isinstance(ratings.dtype, pd.CategoricalDtype):
+        return ratings.map(lookup)
+    texts = np.array([lookup.get(label) for label in ratings.cat.categories] + [None], dtype=object)
+    return pd.Series(texts[ratings.cat.codes.to_numpy()], index=ratings.index, name=ratings.name)
+
+
+def view(df, rows):
+    """``df`` restricted to ascending ``rows``; a slice (no copy) when they are contiguous."""
+    if rows is None:
+        return df
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        return df.iloc[rows[0]:rows[-1] + 1]
+    return df.iloc[rows]
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
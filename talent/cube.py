@@ -0,0 +1,55 @@
+"""Pre-aggregated headcount cube for the sidebar filter combinations.
+
+One row per distinct (Business Unit, Department, Sub Department, Manager,
+Quarter, Final Rating) with its row count. The KPI strip, the Overview pie
+and the Trends category chart roll this up instead of masking raw rows;
+it has as many rows as there are distinct combinations, not employees.
+"""
+import pandas as pd
+
+from talent import classify
+
+DIMENSIONS = ["Business Unit", "Department", "Sub Department", "Manager", "Quarter"]
+MEASURE = "Final Rating"
+
+
+class RatingCube:
+    def __init__(self, counts, dims):
+        self.counts = counts
+        self.dims = dims
+
+    @classmethod
+    def build(cls, df):
+        dims = [c for c in DIMENSIONS if c in df.columns]
+        counts = (
+            df.groupby(dims + [MEASURE], dropna=False, observed=True)
+            .size()
+            .reset_index(name="Count")
+        )
+        return cls(counts, dims)
+
+    def slice(self, filters=None):
+        """Cube rows matching ``{column: [selected values]}``; empty selections are ignored."""
+        counts = self.counts
+        for col, selected in (filters or {}).items():
+            if selected and col in self.dims:
+                counts = counts[counts[col].isin(selected)]
+        return counts
+
+    def rating_counts(self, filters=None):
+        """Headcount per box label (every label present, zero-filled)."""
+        counts = self.slice(filters).groupby(MEASURE, observed=False)["Count"].sum()
+        return counts.reindex(classify.BOX_LABELS, fill_value=0)
+
+    def rollup(self, by, filters=None):
+        """Counts grouped by ``by`` over the filtered slice, as a flat frame."""
+        return self.slice(filters).groupby(by, observed=True)["Count"].sum().reset_index()
+
+    def __len__(self):
+        return len(self.counts)
+
+
+def as_frame(counts):
+    """Rating counts as the (Rating, Count) frame the charts expect, non-zero only."""
+    dist = pd.DataFrame({"Rating": counts.index, "Count": counts.to_numpy()})
+    return dist[dist["Count"] > 0]
@@ -0,0 +1,150 @@
+"""On-demand downloads of the filtered selection.
+
+Nothing is serialized until someone asks for a file. The frame is then
+written in row chunks straight to a file under the cache directory, so
+peak memory is one chunk rather than a full text copy of the selection.
+Files are named by the filter fingerprint and format. A repeated download
+of the same selection is served from disk without serializing again. The
+directory is pruned least-recently-used, bounded by total size.
+"""
+import gzip
+import io
+import itertools
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from talent import snapshot
+
+EXPORT_DIR = os.path.join(snapshot.CACHE_DIR, "exports")
+CHUNK_ROWS = 50_000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# format -> (label, file extension, mime type)
+FORMATS = {
+    "csv": ("CSV", ".csv", "text/csv"),
+    "csv.gz": ("CSV (gzip)", ".csv.gz", "application/gzip"),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(frames, f):
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    for i, frame in enumerate(frames):
+        frame.to_csv(text, index=False, header=i == 0)
+    text.flush()
+    text.detach()
+
+
+def stream_csv(frames, path, schema=None):
+    with open(path, "wb") as f:
+        _write_csv(frames, f)
+
+
+def stream_csv_gz(frames, path, schema=None):
+    with gzip.open(path, "wb", compresslevel=6) as f:
+        _write_csv(frames, f)
+
+
+def stream_parquet(frames, path, schema=None):
+    """One row group per frame; ``schema`` defaults to the first frame's."""
+    writer = None
+    try:
+        for frame in frames:
+            frame = snapshot.arrow_safe(frame)
+            if writer is None:
+                schema = schema or pa.Schema.from_pandas(frame.iloc[:0], preserve_index=False)
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+        if writer is None:
+            pq.write_table(pa.table({}) if schema is None else schema.empty_table(), path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Frames are written in row chunks, so peak memory is one chunk of text.
+# The header (and Parquet schema) comes from the full frame.
+def write_csv(df, path, chunk_rows=CHUNK_ROWS):
+    stream_csv(itertools.chain([df.iloc[:0]], chunks(df, chunk_rows)), path)
+
+
+def write_csv_gz(df, path, chunk_rows=CHUNK_ROWS):
+    stream_csv_gz(itertools.chain([df.iloc[:0]], chunks(df, chunk_rows)), path)
+
+
+def write_parquet(df, path, chunk_rows=CHUNK_ROWS):
+    # Column types are settled on the whole frame, not per chunk
+    df = snapshot.arrow_safe(df)
+    stream_parquet(chunks(df, chunk_rows), path, pa.Schema.from_pandas(df.iloc[:0], preserve_index=False))
+
+
+WRITERS = {"csv": write_csv, "csv.gz": write_csv_gz, "parquet": write_parquet}
+STREAM_WRITERS = {"csv": stream_csv, "csv.gz": stream_csv_gz, "parquet": stream_parquet}
+
+
+def file_name(stem, fmt):
+    return stem + FORMATS[fmt][1]
+
+
+def mime(fmt):
+    return FORMATS[fmt][2]
+
+
+def format_of(path):
+    """Export format for a file name, by extension."""
+    for fmt in sorted(FORMATS, key=lambda f: -len(FORMATS[f][1])):
+        if path.lower().endswith(FORMATS[fmt][1]):
+            return fmt
+    raise ValueError(f"Unsupported output type: {path}")
+
+
+def prune(export_dir=EXPORT_DIR, max_bytes=DEFAULT_MAX_BYTES, keep=None):
+    """Drop the least recently served exports until the directory fits ``max_bytes``.
+
+    ``keep`` (the file about to be served) is never removed.
+    """
+    try:
+        entries = [e for e in os.scandir(export_dir) if e.is_file() and not e.name.startswith(".tmp-")]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime_ns, reverse=True)
+    total = 0
+    for e in entries:
+        total += e.stat().st_size
+        if total > max_bytes and e.path != keep:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+
+def export(df, fmt, key, export_dir=EXPORT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """Path of ``df`` exported as ``fmt``; written only when ``key`` has no file yet.
+
+    ``key`` must identify the selection (dataset version and filters). ``df``
+    may be a callable, so the frame is only built when the file is written.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    path = os.path.join(export_dir, key + FORMATS[fmt][1])
+    if os.path.exists(path):
+        try:
+            os.utime(path)  # mark as recently served for pruning
+            return path
+        except OSError:
+            pass
+    snapshot.atomic_write(path, lambda tmp: WRITERS[fmt](df() if callable(df) else df, tmp))
+    prune(export_dir, max_bytes, keep=path)
+    return path
+
+
+def read_export(df, fmt, key, export_dir=EXPORT_DIR):
+    """Bytes of the export, for a deferred (callable) ``st.download_button``."""
+    with open(export(df, fmt, key, export_dir), "rb") as f:
+        return f.read()
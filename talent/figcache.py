@@ -0,0 +1,86 @@
+"""Process-wide LRU of serialized Plotly figures.
+
+Figures are keyed on a cheap fingerprint of what they depend on (dataset
+version, ranking mode, filter selections, ...) and stored as their JSON
+spec. A rerun caused by an unrelated widget finds the spec and skips the
+pandas prep and figure building entirely. Eviction is least-recently-used,
+bounded by the total size of the stored specs.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def fingerprint(*parts):
+    """Stable short hash of filter selections, row ids, versions, ..."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if part is None:
+            h.update(b"\x00*")
+        elif isinstance(part, np.ndarray):
+            h.update(b"\x00a" + part.tobytes())
+        elif isinstance(part, dict):
+            h.update(b"\x00d" + repr(sorted((k, sorted(map(str, v)) if isinstance(v, (list, tuple)) else v)
+                                          for k, v in part.items())).encode())
+        else:
+            h.update(b"\x00" + repr(part).encode())
+    return h.hexdigest()
+
+
+def to_figure(spec):
+    """Rehydrate a cached spec without re-running Plotly's validators."""
+    return go.Figure(json.loads(spec), _validate=False)
+
+
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._specs.move_to_end(key)
+            self.hits += 1
+            return spec
+
+    def put(self, key, spec):
+        size = len(spec)
+        with self._lock:
+            if key in self._specs:
+                self.bytes -= len(self._specs.pop(key))
+            if size > self.max_bytes:
+                return spec
+            self._specs[key] = spec
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, old = self._specs.popitem(last=False)
+                self.bytes -= len(old)
+        return spec
+
+    def get_or_build(self, key, build):
+        """JSON spec for ``key``; ``build()`` returns a Figure and only runs on a miss."""
+        spec = self.get(key)
+        if spec is None:
+            spec = self.put(key, pio.to_json(build(), validate=False))
+        return spec
+
+    def figure(self, key, build):
+        return to_figure(self.get_or_build(key, build))
+
+    def __len__(self):
+        return len(self._specs)
@@ -0,0 +1,66 @@
+"""Server-side paging for the People and Calibration tables.
+
+The browser only receives the visible window of rows. Sorting reuses one
+stable argsort per (column, direction) over the whole dataset. It is
+computed the first time that column is sorted and kept for the dataset
+version. A filtered selection is then ordered by walking the global order
+and keeping its rows, which costs O(n) with no comparison sort on each
+page turn.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = (50, 100, 250, 500)
+
+
+def rows_where(mask, within=None):
+    """Row ids where ``mask`` holds, restricted to ``within`` (None means every row)."""
+    mask = np.asarray(mask, dtype=bool)
+    return np.flatnonzero(mask) if within is None else within[mask[within]]
+
+
+def page_count(total, page_size):
+    return max(-(-total // page_size), 1)
+
+
+class SortIndex:
+    def __init__(self, df):
+        self.df = df
+        self.n = len(df)
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def _sort_keys(self, col):
+        s = self.df[col]
+        if pd.api.types.is_numeric_dtype(s) and not isinstance(s.dtype, pd.CategoricalDtype):
+            return s.to_numpy(dtype=float, na_value=np.nan)
+        # Categoricals keep their category order (e.g. box order), text sorts A-Z
+        codes, _ = pd.factorize(s, sort=True)
+        keys = codes.astype(float)
+        keys[codes < 0] = np.nan
+        return keys
+
+    def order(self, col, ascending=True):
+        """Row ids of the whole frame sorted by ``col``; missing values last."""
+        key = (col, ascending)
+        order = self._orders.get(key)
+        if order is None:
+            keys = self._sort_keys(col)
+            order = np.argsort(keys if ascending else -keys, kind="stable").astype(np.int64)
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def window(self, rows, sort_col=None, ascending=True, start=0, stop=None):
+        """``(row ids of the window, total rows)`` for ``rows`` sorted by ``sort_col``."""
+        if sort_col is None:
+            ordered = np.arange(self.n) if rows is None else rows
+        else:
+            ordered = self.order(sort_col, ascending)
+            if rows is not None:
+                keep = np.zeros(self.n, dtype=bool)
+                keep[rows] = True
+                ordered = ordered[keep[ordered]]
+        return ordered[start:stop], len(ordered)
@@ -0,0 +1,157 @@
+"""Incremental re-scoring against the previous snapshot.
+
+Rows are matched on (EMP ID, Quarter). Only new or edited rows get their
+weighted scores recomputed, only the manager groups that gained, lost or
+edited a member are re-ranked, and global percentiles of untouched rows are
+shifted by the sorted delta of removed / inserted scores instead of a full
+``rank(pct=True)`` over the whole history. In per-quarter mode only the
+quarters that changed are re-ranked; the rest of the history is copied.
+"""
+import numpy as np
+import pandas as pd
+
+from talent import ranking, scoring
+
+KEY_COLS = ["EMP ID", "Quarter"]
+# Anything that feeds the scores, the team grouping or the New-to-Rate split
+INPUT_COLS = scoring.METRIC_COLS + ["Manager", "Category"]
+SCORED_COLS = ["X_Score", "Y_Score", "X_Pct", "Y_Pct", "X_Pct_Team", "Y_Pct_Team"]
+# Past this share of edited rows a full rebuild is cheaper than patching
+MAX_CHANGED_SHARE = 0.25
+# Inserted rows are ranked by a linear scan each; beyond this many, sort once
+SCAN_LIMIT = 32
+
+
+def _has(df, cols):
+    return df is not None and all(c in df.columns for c in cols)
+
+
+def _align(raw, previous):
+    """Row of ``previous`` for every row of ``raw`` (-1 if new), or None when keys repeat."""
+    both = pd.concat([previous[KEY_COLS], raw[KEY_COLS]], ignore_index=True)
+    key = np.zeros(len(both), dtype=np.int64)
+    for col in KEY_COLS:
+        codes, uniques = pd.factorize(both[col])
+        key = key * (len(uniques) + 1) + codes + 1
+    prev_key = pd.Index(key[:len(previous)])
+    raw_key = pd.Index(key[len(previous):])
+    if prev_key.has_duplicates or raw_key.has_duplicates:
+        return None
+    return prev_key.get_indexer(raw_key)
+
+
+def _changed_rows(raw, previous, pos):
+    changed = pos < 0
+    rows = np.flatnonzero(~changed)
+    prev_rows = pos[rows]
+    for col in INPUT_COLS:
+        old = previous[col].take(prev_rows).reset_index(drop=True)
+        new = raw[col].take(rows).reset_index(drop=True)
+        changed[rows] |= (old.ne(new) & ~(old.isna() & new.isna())).to_numpy()
+    return changed
+
+
+def _shift_pct(prev_pct, n_old, kept_vals, removed, inserted, n_new):
+    """Average-method percentiles after removing / inserting a few values.
+
+    Untouched rows keep their old average rank plus the number of removed /
+    inserted values below them (ties count half). ``inserted`` must be sorted;
+    those rows are ranked against the kept values directly.
+    """
+    removed = np.sort(removed)
+
+    def below(sorted_vals, v):
+        lo = np.searchsorted(sorted_vals, v, side="left")
+        hi = np.searchsorted(sorted_vals, v, side="right")
+        return lo + (hi - lo) / 2
+
+    # Ranks are multiples of 0.5, so they round-trip exactly from pct * n
+    old_rank = np.round(np.asarray(prev_pct) * n_old * 2) / 2
+    kept_rank = old_rank + below(inserted, kept_vals) - below(removed, kept_vals)
+
+    ins_rank = below(inserted, inserted) + 0.5
+    if len(inserted) > SCAN_LIMIT:
+        ins_rank += below(np.sort(kept_vals), inserted)
+    else:
+        for i, v in enumerate(inserted):
+            ins_rank[i] += np.count_nonzero(kept_vals < v) + np.count_nonzero(kept_vals == v) / 2
+    return kept_rank / n_new, ins_rank / n_new
+
+
+def _in_touched(raw, previous, changed, dropped, keys):
+    """Rows of ``raw`` whose ``keys`` group gained, lost or edited a member."""
+    touched = pd.concat([raw.loc[changed, keys], previous.loc[dropped, keys]])
+    if len(keys) == 1:
+        return raw[keys[0]].isin(touched[keys[0]].unique()).to_numpy()
+    return pd.MultiIndex.from_frame(raw[keys]).isin(pd.MultiIndex.from_frame(touched.drop_duplicates()))
+
+
+def _rerank(raw, previous, pos, reuse, redo, score_col, pct_col, keys):
+    values = np.full(len(raw), np.nan)
+    values[reuse] = previous[pct_col].to_numpy()[pos[reuse]]
+    if redo.any():
+        values[redo] = ranking.rank_pct(raw.loc[redo], score_col, keys).to_numpy()
+    raw[pct_col] = values
+
+
+def rescore(raw, previous, mode=ranking.GLOBAL):
+    """Score ``raw``, reusing everything still valid from the ``previous`` scored frame.
+
+    ``previous`` must have been scored with the same ``mode``.
+    """
+    scoring.prepare(raw)
+    if not (_has(raw, KEY_COLS + INPUT_COLS) and _has(previous, KEY_COLS + INPUT_COLS + SCORED_COLS)):
+        return scoring.score(raw, mode)
+
+    pos = _align(raw, previous)
+    if pos is None:
+        return scoring.score(raw, mode)
+
+    changed = _changed_rows(raw, previous, pos)
+    part_keys = ranking.partition_keys(mode)
+    if not part_keys and changed.sum() > MAX_CHANGED_SHARE * len(raw):
+        return scoring.score(raw, mode)
+
+    kept = ~changed
+    kept_pos = pos[kept]
+    dropped = np.ones(len(previous), dtype=bool)
+    dropped[kept_pos] = False
+    previous = previous.reset_index(drop=True)
+
+    # 1. Weighted scores: reuse for untouched rows, recompute the rest
+    for col, weights in (("X_Score", scoring.PERF_WEIGHTS), ("Y_Score", scoring.POT_WEIGHTS)):
+        values = np.empty(len(raw))
+        values[kept] = previous[col].to_numpy()[kept_pos]
+        if changed.any():
+            values[changed] = scoring.weighted(raw.loc[changed], weights).to_numpy()
+        raw[col] = values
+
+    # 2. Org percentiles
+    if part_keys:
+        # Per quarter: closed quarters are frozen, only touched ones re-rank
+        regroup = _in_touched(raw, previous, changed, dropped, part_keys)
+        for score_col, pct_col in (("X_Score", "X_Pct"), ("Y_Score", "Y_Pct")):
+            _rerank(raw, previous, pos, kept & ~regroup, regroup, score_col, pct_col, part_keys)
+    else:
+        # Whole history: shift by the sorted delta
+        for score_col, pct_col in (("X_Score", "X_Pct"), ("Y_Score", "Y_Pct")):
+            scores = raw[score_col].to_numpy()
+            order = np.argsort(scores[changed], kind="stable")
+            kept_pct, ins_pct = _shift_pct(
+                previous[pct_col].to_numpy()[kept_pos], len(previous),
+                scores[kept], previous[score_col].to_numpy()[dropped], scores[changed][order], len(raw),
+            )
+            values = np.empty(len(raw))
+            values[kept] = kept_pct
+            values[np.flatnonzero(changed)[order]] = ins_pct
+            raw[pct_col] = values
+
+    # 3. Team percentiles: re-rank only the teams that moved
+    keys = ranking.team_keys(mode)
+    regroup = _in_touched(raw, previous, changed, dropped, keys)
+    mask = scoring.team_mask(raw).to_numpy()
+    for score_col, pct_col in (("X_Score", "X_Pct_Team"), ("Y_Score", "Y_Pct_Team")):
+        _rerank(raw, previous, pos, kept & ~regroup, regroup & mask, score_col, pct_col, keys)
+
+    # 4. Ratings are a cheap vectorized lookup, redo them everywhere
+    return scoring.assign_ratings(raw)
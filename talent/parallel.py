@@ -0,0 +1,98 @@
+"""Cold ingest of sharded sources in a process pool.
+
+Phase 1 runs in the workers, one task per shard. Each worker parses its
+shard, coerces the metrics, computes X/Y scores and sorts the scores of
+each ranking partition (the whole history, or each quarter). Parsing
+dominates a cold load, so it scales with cores.
+
+Phase 2 runs in the parent. The sorted runs of each partition are merged.
+Every row's percentile is then read off the merged array with two binary
+searches: (rows below + rows at or below + 1) / 2 / n, which is exactly
+``rank(pct=True)`` with average ties over the concatenated data. Team
+ranks and the 9-box follow on the stacked frame, as in ``scoring.score``.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from talent import ranking, scoring, sources
+
+
+def _context():
+    # Never fork the caller. Under Streamlit it runs Tornado, script and
+    # refresher threads, and a forked child can inherit a lock another thread
+    # held. Workers are forked from the fork server instead: a fresh,
+    # single-threaded interpreter with this module preloaded. Where that is
+    # unavailable, spawn is used. Either way workers import only this module
+    # and the process's guarded __main__ (Streamlit's CLI), never the app
+    # script, which Streamlit execs rather than imports.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _score_shard(shard, mode):
+    df = sources.read_shard(shard)
+    scoring.prepare(df)
+    df["X_Score"] = scoring.weighted(df, scoring.PERF_WEIGHTS)
+    df["Y_Score"] = scoring.weighted(df, scoring.POT_WEIGHTS)
+    return df, local_runs(df, mode)
+
+
+def local_runs(df, mode):
+    """``{partition: {score column: sorted scores}}`` for one shard."""
+    keys = ranking.partition_keys(mode)
+    groups = [(None, df)] if not keys else df.groupby(keys[0], sort=False)
+    return {part: {c: np.sort(frame[c].to_numpy()) for c in ranking.SCORE_COLS} for part, frame in groups}
+
+
+def merge_runs(runs):
+    """Merge per-shard sorted runs into one sorted array per partition and column."""
+    parts = {}
+    for shard_runs in runs:
+        for part, cols in shard_runs.items():
+            parts.setdefault(part, []).append(cols)
+    # Stable sort over concatenated sorted runs is a run merge
+    return {part: {c: np.sort(np.concatenate([r[c] for r in pieces]), kind="stable") for c in ranking.SCORE_COLS}
+            for part, pieces in parts.items()}
+
+
+def pct_from_sorted(values, sorted_vals):
+    """``rank(pct=True)`` (average ties) of ``values`` against the sorted population."""
+    below = np.searchsorted(sorted_vals, values, side="left")
+    at_or_below = np.searchsorted(sorted_vals, values, side="right")
+    return (below + at_or_below + 1) / 2 / len(sorted_vals)
+
+
+def score(shards, mode=ranking.GLOBAL, workers=None):
+    """Scored frame for ``shards`` (``(path, sheet)`` pairs), stacked in shard order.
+
+    ``workers=1`` scores in this process; None lets the pool use every core.
+    """
+    if workers == 1 or len(shards) <= 1:
+        results = [_score_shard(s, mode) for s in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_context()) as pool:
+            results = list(pool.map(_score_shard, shards, repeat(mode)))
+    frames = [df for df, _ in results]
+    merged = merge_runs(runs for _, runs in results)
+    df = pd.concat(frames, ignore_index=True)
+
+    keys = ranking.partition_keys(mode)
+    for col, pct_col in (("X_Score", "X_Pct"), ("Y_Score", "Y_Pct")):
+        values = df[col].to_numpy()
+        if not keys:
+            df[pct_col] = pct_from_sorted(values, merged[None][col])
+            continue
+        pct = np.full(len(df), np.nan)
+        for part, rows in df.groupby(keys[0], sort=False).indices.items():
+            pct[rows] = pct_from_sorted(values[rows], merged[part][col])
+        df[pct_col] = pct
+
+    scoring.team_ranks(df, mode)
+    return scoring.assign_ratings(df)
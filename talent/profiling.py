@@ -0,0 +1,157 @@
+"""Timing spans for one rerun, and process-wide stage metrics.
+
+A ``Trace`` is created at the top of every rerun. Stages of the script run
+inside ``trace.span(name)``; spans nest, and each one records its start
+offset, duration and any attributes the caller adds (payload bytes, rows,
+cache hit). A disabled trace hands out no-op spans, so instrumented code
+costs nothing when profiling is off.
+
+``Metrics`` accumulates finished traces for the whole process. Each span
+name gets a call count, total time and a fixed-bucket histogram, and
+payload bytes are summed. It renders as Prometheus text exposition, for a
+node-exporter textfile collector or a scrape proxy. Single traces can be
+appended to a JSON-lines log.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import pyarrow as pa
+
+from talent import snapshot
+
+# Histogram bucket bounds in seconds, Prometheus style (le="...")
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Trace:
+    def __init__(self, enabled=True, **tags):
+        self.enabled = enabled
+        self.tags = tags
+        self.spans = []
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._stack = []
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time the block; yields the span dict (None when disabled) so callers can add attributes."""
+        if not self.enabled:
+            yield None
+            return
+        entry = {"name": name, "parent": self._stack[-1] if self._stack else None,
+                 "depth": len(self._stack), "start": time.perf_counter() - self._t0, **attrs}
+        self._stack.append(name)
+        t0 = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = time.perf_counter() - t0
+            self._stack.pop()
+            self.spans.append(entry)
+
+    def elapsed(self):
+        return time.perf_counter() - self._t0
+
+    def finish(self):
+        """Close the trace with a ``rerun`` span covering the whole script."""
+        if self.enabled:
+            self.spans.append({"name": "rerun", "parent": None, "depth": 0, "start": 0.0, "seconds": self.elapsed()})
+        return self
+
+    def ordered(self):
+        """Spans in start order, parents before their children."""
+        return sorted(self.spans, key=lambda s: (s["start"], s["depth"]))
+
+    def as_record(self):
+        return {"ts": self.started, "total_s": self.elapsed(), **self.tags, "spans": self.ordered()}
+
+
+def frame_bytes(df):
+    """Arrow size of a frame, which is what ``st.dataframe`` sends to the browser."""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False).nbytes
+    except (pa.ArrowException, TypeError, ValueError):
+        return int(df.memory_usage(deep=True).sum())
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.reruns = 0
+        self.stages = {}    # name -> [count, total seconds, per-bucket counts]
+        self.payloads = {}  # name -> [count, total bytes]
+        self._lock = threading.Lock()
+
+    def observe(self, trace):
+        with self._lock:
+            self.reruns += 1
+            for span in trace.spans:
+                stage = self.stages.setdefault(span["name"], [0, 0.0, [0] * len(self.buckets)])
+                stage[0] += 1
+                stage[1] += span["seconds"]
+                for i, bound in enumerate(self.buckets):
+                    if span["seconds"] <= bound:
+                        stage[2][i] += 1
+                if "bytes" in span:
+                    payload = self.payloads.setdefault(span["name"], [0, 0])
+                    payload[0] += 1
+                    payload[1] += span["bytes"]
+
+    def summary(self):
+        """``(stage, calls, mean seconds, total seconds)`` rows, slowest total first."""
+        with self._lock:
+            rows = [(name, n, total / n, total) for name, (n, total, _) in self.stages.items()]
+        return sorted(rows, key=lambda r: -r[3])
+
+    def prometheus(self):
+        """Prometheus text exposition of the counters and histograms."""
+        with self._lock:
+            lines = [
+                "# HELP talent_reruns_total Dashboard reruns profiled.",
+                "# TYPE talent_reruns_total counter",
+                f"talent_reruns_total {self.reruns}",
+                "# HELP talent_stage_seconds Time spent per dashboard stage.",
+                "# TYPE talent_stage_seconds histogram",
+            ]
+            for name, (n, total, counts) in sorted(self.stages.items()):
+                stage = _label(name)
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f'talent_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'talent_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {n}')
+                lines.append(f'talent_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+                lines.append(f'talent_stage_seconds_count{{stage="{stage}"}} {n}')
+            lines += [
+                "# HELP talent_payload_bytes Bytes sent to the browser per element.",
+                "# TYPE talent_payload_bytes summary",
+            ]
+            for name, (n, total) in sorted(self.payloads.items()):
+                element = _label(name)
+                lines.append(f'talent_payload_bytes_sum{{element="{element}"}} {total}')
+                lines.append(f'talent_payload_bytes_count{{element="{element}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+_log_lock = threading.Lock()
+
+
+def append_jsonl(path, trace):
+    """Append one trace as a JSON line."""
+    line = json.dumps(trace.as_record(), default=str) + "\n"
+    with _log_lock, open(path, "a") as f:
+        f.write(line)
+
+
+def write_prometheus(path, metrics):
+    """Replace ``path`` with the current exposition (textfile collectors read whole files)."""
+    text = metrics.prometheus()
+
+    def write(tmp):
+        with open(tmp, "w") as f:
+            f.write(text)
+    snapshot.atomic_write(path, write)
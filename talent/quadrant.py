@@ -0,0 +1,162 @@
+"""Quadrant (9-box scatter) figure with a level-of-detail switch.
+
+Up to ``LOD_THRESHOLD`` employees the chart is today's exact view: one
+marker per distinct (X, Y) point per box with every name in the hover.
+Above it each box becomes a pre-binned 2D histogram: one square per
+non-empty grid cell, sized by headcount. The payload is then bounded by
+the grid, not the org size, and a cell's employees are fetched with
+``bucket_members`` only when someone clicks it.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from talent import classify
+
+MAX_RANGE = 10.5
+LOD_THRESHOLD = 5000
+LOD_BINS = 42  # 0.25-point cells on the 0-10.5 axes
+# Every column the figure and its cell drill-down read
+COLUMNS = ["EMP Name", "Department", "Manager", "X_Score", "Y_Score", "Final Rating"]
+
+
+def _cell(scores, bins, max_score):
+    step = max_score / bins
+    return np.clip((np.asarray(scores, dtype=float) // step).astype(np.int64), 0, bins - 1)
+
+
+def bucketize(data, bins=LOD_BINS, max_score=MAX_RANGE):
+    """Per-box 2D histogram: one row per non-empty (rating, x cell, y cell)."""
+    data = data[data["Final Rating"] != classify.NEW_TO_RATE]
+    box = pd.Categorical(data["Final Rating"], categories=classify.BOX_LABELS).codes.astype(np.int64)
+    bx = _cell(data["X_Score"], bins, max_score)
+    by = _cell(data["Y_Score"], bins, max_score)
+
+    keys, counts = np.unique((box * bins + bx) * bins + by, return_counts=True)
+    step = max_score / bins
+    bx, by = (keys // bins) % bins, keys % bins
+    return pd.DataFrame({
+        "Final Rating": np.asarray(classify.BOX_LABELS, dtype=object)[keys // (bins * bins)],
+        "bx": bx,
+        "by": by,
+        "x": (bx + 0.5) * step,
+        "y": (by + 0.5) * step,
+        "Count": counts,
+    })
+
+
+def bucket_members(data, bucket, bins=LOD_BINS, max_score=MAX_RANGE):
+    """Rows of ``data`` that fall into one ``bucketize`` cell."""
+    mask = (
+        (data["Final Rating"] == bucket["Final Rating"]).to_numpy()
+        & (_cell(data["X_Score"], bins, max_score) == bucket["bx"])
+        & (_cell(data["Y_Score"], bins, max_score) == bucket["by"])
+    )
+    return data[mask]
+
+
+def cell_traces(data, colors, bins=LOD_BINS):
+    """Non-empty cells split per box, in the trace order ``build_figure`` uses."""
+    cells = bucketize(data, bins)
+    traces = []
+    for rate in colors:
+        if rate == classify.NEW_TO_RATE: continue
+        c = cells[cells["Final Rating"] == rate].reset_index(drop=True)
+        if not c.empty:
+            traces.append(c)
+    return traces
+
+
+def _exact_trace(d, rate, color):
+    d_grouped = d.groupby(['X_Score', 'Y_Score']).agg(
+        Emp_List=('EMP Name', lambda x: '• ' + '<br>• '.join(x)),
+        Count=('EMP Name', 'count'),
+        Managers=('Manager', lambda x: ', '.join(x.unique()) if x.nunique() <= 2 else "Multiple"),
+        Depts=('Department', lambda x: ', '.join(x.unique()) if x.nunique() <= 2 else "Multiple")
+    ).reset_index()
+
+    sizes = 14 + (d_grouped['Count'] - 1) * 6
+
+    return go.Scatter(
+        x=d_grouped["X_Score"], y=d_grouped["Y_Score"], mode="markers",
+        marker=dict(size=sizes, color=color, opacity=0.85, line=dict(width=1, color="white")),
+        name=rate,
+        customdata=d_grouped[['Emp_List', 'Managers', 'Depts', 'Count']],
+        hovertemplate=(
+            "<b>%{customdata[3]} Employee(s)</b><br><br>" +
+            "%{customdata[0]}<br><br>" +
+            "<b>Perf:</b> %{x:.1f} | <b>Pot:</b> %{y:.1f}<br>" +
+            "<span style='color:#bbb'>----------------</span><br>" +
+            "<b>Dept:</b> %{customdata[2]}<br><b>Mgr:</b> %{customdata[1]}<extra></extra>"
+        )
+    )
+
+
+def _density_trace(cells, rate, color, peak):
+    sizes = 6 + 22 * np.sqrt(cells["Count"] / peak)
+    return go.Scatter(
+        x=cells["x"], y=cells["y"], mode="markers",
+        marker=dict(size=sizes, symbol="square", color=color, opacity=0.75, line=dict(width=0)),
+        name=rate,
+        customdata=cells[["Count"]],
+        hovertemplate=(
+            "<b>%{customdata[0]} Employee(s)</b><br>" +
+            "<b>Perf:</b> ~%{x:.2f} | <b>Pot:</b> ~%{y:.2f}<br>" +
+            "<span style='color:#bbb'>Click to list employees</span><extra></extra>"
+        )
+    )
+
+
+def build_figure(filtered_data, cuts, colors, theme, max_points=LOD_THRESHOLD, bins=LOD_BINS):
+    """Quadrant figure plus, in density mode, the cell table behind each trace.
+
+    Returns ``(fig, traces)``; ``traces`` is None in exact mode, otherwise
+    ``traces[curve_number].iloc[point_index]`` is the clicked cell.
+    """
+    x_30, x_80, y_30, y_80 = cuts
+    fig = go.Figure()
+    traces = None
+
+    if len(filtered_data) <= max_points:
+        for rate, color in colors.items():
+            if rate == classify.NEW_TO_RATE: continue
+            d = filtered_data[filtered_data["Final Rating"] == rate]
+            if d.empty: continue
+            fig.add_trace(_exact_trace(d, rate, color))
+    else:
+        traces = cell_traces(filtered_data, colors, bins)
+        peak = max(int(c["Count"].max()) for c in traces) if traces else 1
+        for c in traces:
+            rate = c["Final Rating"].iat[0]
+            fig.add_trace(_density_trace(c, rate, colors[rate], peak))
+
+    line_style = dict(color=theme["--fb-axis"], width=1, dash="dot")
+    max_range = MAX_RANGE
+    fig.add_shape(type="line", x0=x_30, y0=0, x1=x_30, y1=max_range, line=line_style)
+    fig.add_shape(type="line", x0=x_80, y0=0, x1=x_80, y1=max_range, line=line_style)
+    fig.add_shape(type="line", x0=0, y0=y_30, x1=max_range, y1=y_30, line=line_style)
+    fig.add_shape(type="line", x0=0, y0=y_80, x1=max_range, y1=y_80, line=line_style)
+
+    x_low_mid, x_med_mid, x_hi_mid = x_30/2, (x_30+x_80)/2, (x_80+max_range)/2
+    y_low_mid, y_med_mid, y_hi_mid = y_30/2, (y_30+y_80)/2, (y_80+max_range)/2
+    label_font = dict(size=11, weight="bold")
+
+    fig.add_annotation(x=x_low_mid, y=y_hi_mid, text="ROUGH DIAMOND", showarrow=False, font=dict(color=colors["Rough Diamond"], **label_font))
+    fig.add_annotation(x=x_med_mid, y=y_hi_mid, text="FUTURE LEADER", showarrow=False, font=dict(color=colors["Future Leader"], **label_font))
+    fig.add_annotation(x=x_hi_mid,  y=y_hi_mid, text="TOP TALENT", showarrow=False, font=dict(color=colors["Top Talent"], **label_font))
+    fig.add_annotation(x=x_low_mid, y=y_med_mid, text="INCONSISTENT", showarrow=False, font=dict(color=colors["Inconsistent Player"], **label_font))
+    fig.add_annotation(x=x_med_mid, y=y_med_mid, text="THE KEYSTONE", showarrow=False, font=dict(color=colors["The Keystone"], **label_font))
+    fig.add_annotation(x=x_hi_mid,  y=y_med_mid, text="IMPACT DRIVER", showarrow=False, font=dict(color=colors["Impact Driver"], **label_font))
+    fig.add_annotation(x=x_low_mid, y=y_low_mid, text="TALENT MISMATCH", showarrow=False, font=dict(color=colors["Talent Mismatch"], **label_font))
+    fig.add_annotation(x=x_med_mid, y=y_low_mid, text="PRACTITIONER", showarrow=False, font=dict(color=colors["Practitioner"], **label_font))
+    fig.add_annotation(x=x_hi_mid,  y=y_low_mid, text="TRUSTED ADVISOR", showarrow=False, font=dict(color=colors["Trusted Advisor"], **label_font))
+
+    fig.update_layout(
+        template=theme["--plotly-temp"], height=650, margin=dict(l=20, r=20, t=10, b=20),
+        plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(title="Performance (Weighted)", range=[0, MAX_RANGE], showgrid=False, zeroline=False),
+        yaxis=dict(title="Potential (Weighted)", range=[0, MAX_RANGE], showgrid=False, zeroline=False),
+        legend=dict(orientation="h", y=1.02, x=1, xanchor="right"),
+        font=dict(family="Inter", color=theme["--fb-text"]),
+    )
+    return fig, traces
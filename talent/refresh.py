@@ -0,0 +1,125 @@
+"""Background refresh of the scored dataset.
+
+A daemon thread probes the source every ``interval`` seconds (file
+mtime/size, sheet revision). When the probe moves it rebuilds each loaded
+variant through ``load`` off the request path, then swaps the new frame in
+with a single reference assignment. Sessions keep the frame they already
+hold until their next rerun picks up the new one. Only the very first load
+of a variant in a process runs on a request.
+
+``status()``, and optionally a JSON file, report when the source was last
+checked, when data last changed, how long the rebuild took and the last
+error, so a stalled refresher can be alerted on.
+"""
+import json
+import threading
+import time
+
+from talent import snapshot
+
+
+class Refresher:
+    def __init__(self, source, load, interval=60, status_path=None):
+        self.source = source
+        self.load = load  # load(source, variant, probe) -> scored frame
+        self.interval = interval
+        self.status_path = status_path
+
+        self._data = {}
+        self._probes = {}
+        self._build_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.last_check = None
+        self.last_refresh = None
+        self.last_duration = None
+        self.last_error = None
+        self.refreshes = 0
+
+    def has(self, variant):
+        return variant in self._data
+
+    def get(self, variant):
+        """Current frame for ``variant``; loads it on the caller's thread only the first time."""
+        df = self._data.get(variant)
+        if df is None:
+            with self._build_lock:
+                df = self._data.get(variant)
+                if df is None:
+                    df = self._rebuild(variant, self.source.probe())
+        self.start()
+        return df
+
+    def _rebuild(self, variant, probe):
+        t0 = time.monotonic()
+        df = self.load(self.source, variant, probe)
+        old = self._data.get(variant)
+        self._data[variant] = df  # atomic swap: readers see the old or the new frame
+        self._probes[variant] = probe
+        if old is None or old.attrs.get("version") != df.attrs.get("version"):
+            self.last_refresh = time.time()
+            self.last_duration = time.monotonic() - t0
+            self.refreshes += 1
+        return df
+
+    def refresh(self):
+        """One probe-and-rebuild pass over the loaded variants."""
+        try:
+            probe = self.source.probe()
+            with self._build_lock:
+                for variant in list(self._data):
+                    if self._probes.get(variant) != probe:
+                        self._rebuild(variant, probe)
+            self.last_error = None
+        except Exception as e:  # keep serving the previous version
+            self.last_error = f"{type(e).__name__}: {e}"
+        self.last_check = time.time()
+        self._write_status()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def start(self):
+        if self._thread is None:
+            with self._build_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="talent-refresh", daemon=True)
+                    self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        return {
+            "source": repr(self.source),
+            "interval_s": self.interval,
+            "last_check": self.last_check,
+            "last_refresh": self.last_refresh,
+            "last_duration_s": self.last_duration,
+            "last_error": self.last_error,
+            "refreshes": self.refreshes,
+            "versions": {v: df.attrs.get("version") for v, df in self._data.items()},
+        }
+
+    def behind(self, now=None):
+        """True when no successful check happened for three intervals."""
+        if self.last_error is not None:
+            return True
+        reference = self.last_check or self.last_refresh
+        return reference is not None and (now or time.time()) - reference > 3 * self.interval
+
+    def _write_status(self):
+        if not self.status_path:
+            return
+        status = self.status()
+        try:
+            snapshot.atomic_write(self.status_path, lambda tmp: _dump(status, tmp))
+        except OSError:
+            pass
+
+
+def _dump(status, path):
+    with open(path, "w") as f:
+        json.dump(status, f)
@@ -0,0 +1,122 @@
+"""Materialized quarter rollup behind the Trends charts.
+
+One row per (Business Unit, Department, Sub Department, Manager, Quarter)
+with its distinct headcount and one count column per box. Both trend
+charts sum the rows of the selected units instead of grouping the full
+history.
+
+Each quarter carries a digest of its rows. When the dataset changes, only
+quarters whose digest moved, or that are new, are aggregated again; the
+rest are carried over from the previous rollup. A new quarter arriving
+therefore costs one quarter of work.
+
+Headcount is the distinct number of employees in the selected units, as
+``nunique`` over their rows gives. Each row stores its unit's distinct
+count. Someone who appears under two units in one quarter (e.g. two
+managers) is counted in both rows. Such people are listed in a small
+``spans`` table, and a selection holding k of their units subtracts k - 1.
+"""
+import numpy as np
+import pandas as pd
+
+from talent import classify
+
+DIMENSIONS = ["Business Unit", "Department", "Sub Department", "Manager"]
+EMPLOYEE_KEY = "EMP ID"
+
+
+def quarter_digests(df, dims):
+    """Order-insensitive hash of the rows of each quarter."""
+    cols = [c for c in dims + ["Quarter", EMPLOYEE_KEY, "Final Rating"] if c in df.columns]
+    row_hash = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    codes, quarters = pd.factorize(df["Quarter"])
+    sums = np.zeros(len(quarters), dtype=np.uint64)
+    np.add.at(sums, codes[codes >= 0], row_hash[codes >= 0])
+    return dict(zip(quarters.tolist(), sums.tolist()))
+
+
+def _aggregate(df, dims):
+    keys = dims + ["Quarter"]
+    boxes = (
+        df.groupby(keys + ["Final Rating"], dropna=False, observed=True).size()
+        .unstack("Final Rating", fill_value=0)
+        .reindex(columns=list(classify.BOX_LABELS), fill_value=0)
+    )
+    members = _members(df, dims)
+    headcount = members.groupby(keys, dropna=False, observed=True).size().rename("Headcount")
+    table = boxes.join(headcount).fillna({"Headcount": 0}).astype(np.int64)
+    table.columns.name = None
+    return table.reset_index(), _spans(members)
+
+
+def _members(df, dims):
+    """One row per (unit, Quarter, employee)."""
+    cols = dims + ["Quarter", EMPLOYEE_KEY]
+    return df.loc[df[EMPLOYEE_KEY].notna().to_numpy(), cols].drop_duplicates()
+
+
+def _spans(members):
+    """Member rows of employees that appear under more than one unit in a quarter."""
+    return members[members.duplicated([EMPLOYEE_KEY, "Quarter"], keep=False)].reset_index(drop=True)
+
+
+class QuarterRollup:
+    def __init__(self, table, digests, dims, spans):
+        self.table = table
+        self.digests = digests
+        self.dims = dims
+        self.spans = spans
+
+    @classmethod
+    def build(cls, df, previous=None):
+        """Rollup of ``df``, reusing the quarters of ``previous`` whose rows did not change."""
+        dims = [c for c in DIMENSIONS if c in df.columns]
+        digests = quarter_digests(df, dims)
+        kept = []
+        if previous is not None and previous.dims == dims:
+            kept = [q for q, d in digests.items() if previous.digests.get(q) == d]
+        stale = [q for q in digests if q not in kept]
+
+        parts = []
+        if kept:
+            parts.append((previous.table[previous.table["Quarter"].isin(kept)],
+                          previous.spans[previous.spans["Quarter"].isin(kept)]))
+        if stale:
+            parts.append(_aggregate(df[df["Quarter"].isin(stale)], dims))
+        if not parts:
+            parts.append(_aggregate(df.iloc[:0], dims))
+        table = pd.concat([t for t, _ in parts], ignore_index=True)
+        spans = pd.concat([s for _, s in parts], ignore_index=True)
+        return cls(table, digests, dims, spans)
+
+    def slice(self, filters=None, table=None):
+        table = self.table if table is None else table
+        for col, selected in (filters or {}).items():
+            if selected and col in self.dims:
+                table = table[table[col].isin(selected)]
+        return table
+
+    def headcount(self, filters=None):
+        """(Quarter, Headcount) over the selected units, in quarter order."""
+        counts = self.slice(filters).groupby("Quarter")["Headcount"].sum()
+        # Employees in k of the selected units were counted k times
+        spans = self.slice(filters, self.spans)
+        if len(spans):
+            repeats = spans.groupby(["Quarter", EMPLOYEE_KEY], observed=True).size() - 1
+            counts = counts.sub(repeats.groupby(level="Quarter").sum(), fill_value=0).astype(counts.dtype).rename("Headcount")
+        return counts.reset_index()
+
+    def box_trend(self, filters=None, boxes=classify.BOX_LABELS):
+        """Long (Quarter, Final Rating, Count) frame over the selected units; zero counts dropped."""
+        wide = self.slice(filters).groupby("Quarter")[list(boxes)].sum()
+        long = wide.melt(ignore_index=False, var_name="Final Rating", value_name="Count").reset_index()
+        return long[long["Count"] > 0].sort_values(["Quarter", "Final Rating"], key=_box_order, ignore_index=True)
+
+    def __len__(self):
+        return len(self.table)
+
+
+def _box_order(col):
+    if col.name == "Final Rating":
+        return col.map({label: i for i, label in enumerate(classify.BOX_LABELS)})
+    return col
@@ -0,0 +1,167 @@
+"""Weighted X/Y scores, global and team percentiles, and 9-box ratings."""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from talent import classify, ranking
+
+PERF_WEIGHTS = {
+    "OKR Last Quarter": 0.30,
+    "Quality of Output": 0.30,
+    "Ownership and Reliability": 0.20,
+    "Delivery": 0.20,
+}
+POT_WEIGHTS = {
+    "Learning Ability": 0.20,
+    "Collaboration": 0.30,
+    "Feedback Reception": 0.30,
+    "Ownership Beyond Scope": 0.20,
+}
+PERF_COLS = list(PERF_WEIGHTS)
+POT_COLS = list(POT_WEIGHTS)
+METRIC_COLS = PERF_COLS + POT_COLS
+
+
+class MissingColumnsError(ValueError):
+    def __init__(self, missing):
+        self.missing = missing
+        super().__init__(f"Missing columns: {', '.join(missing)}")
+
+
+def prepare(df):
+    """Validate the metric columns and coerce them to numbers (in place)."""
+    missing_cols = [c for c in METRIC_COLS if c not in df.columns]
+    if missing_cols:
+        raise MissingColumnsError(missing_cols)
+
+    for col in METRIC_COLS:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    return df
+
+
+def weighted(df, weights):
+    return sum(df[c] * w for c, w in weights.items())
+
+
+def team_mask(df):
+    return df["Category"] != "New to Rate"
+
+
+def assign_ratings(df, low=classify.LOW_CUT, high=classify.HIGH_CUT):
+    """Final Rating, Team_Rating and Comparison from the percentile columns."""
+    new_rate = df.get("Category", pd.Series("", index=df.index)).astype(str).str.strip() == "New to Rate"
+    final_codes = classify.box_codes(df["X_Pct"], df["Y_Pct"], new_rate, low, high)
+    team_codes = classify.box_codes(df["X_Pct_Team"], df["Y_Pct_Team"], ~team_mask(df), low, high)
+
+    df["Final Rating"] = classify.as_categorical(final_codes, index=df.index)
+    df["Team_Rating"] = classify.as_categorical(team_codes, index=df.index)
+    df["Comparison"] = classify.as_categorical(
+        classify.status_codes(final_codes, team_codes, df["X_Pct"], df["Y_Pct"], df["X_Pct_Team"], df["Y_Pct_Team"]),
+        labels=classify.STATUS_LABELS, index=df.index
+    )
+    return df
+
+
+def team_ranks(df, mode=ranking.GLOBAL):
+    """X_Pct_Team / Y_Pct_Team within each team; New to Rate rows are left out."""
+    mask = team_mask(df).to_numpy()
+    keys = ranking.team_keys(mode)
+    # Whole new columns, so a compacted (float32) frame is not written into
+    for score_col, pct_col in (("X_Score", "X_Pct_Team"), ("Y_Score", "Y_Pct_Team")):
+        pct = np.full(len(df), np.nan)
+        pct[mask] = ranking.rank_pct(df[mask], score_col, keys).to_numpy()
+        df[pct_col] = pct
+    return df
+
+
+def score(df, mode=ranking.GLOBAL):
+    """Score a raw sheet in place and return it.
+
+    ``mode`` picks the ranking partition, see ``talent.ranking``.
+    """
+    prepare(df)
+
+    # 1. Calc Weighted Scores
+    df["X_Score"] = weighted(df, PERF_WEIGHTS)
+    df["Y_Score"] = weighted(df, POT_WEIGHTS)
+
+    # 2. Calc ORG Ranks (whole history, or per quarter)
+    keys = ranking.partition_keys(mode)
+    df["X_Pct"] = ranking.rank_pct(df, "X_Score", keys)
+    df["Y_Pct"] = ranking.rank_pct(df, "Y_Score", keys)
+
+    # 3. Calc LOCAL (Team) Ranks
+    team_ranks(df, mode)
+
+    # 4. Org / Team 9-box and the comparison between them
+    return assign_ratings(df)
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """Axis weights and box boundaries; hashable so results can be memoized per config."""
+    perf_weights: tuple = tuple(PERF_WEIGHTS.items())
+    pot_weights: tuple = tuple(POT_WEIGHTS.items())
+    low_cut: float = classify.LOW_CUT
+    high_cut: float = classify.HIGH_CUT
+
+    def key(self):
+        return hashlib.blake2b(repr(self).encode(), digest_size=4).hexdigest()
+
+
+DEFAULT_CONFIG = ScoringConfig()
+
+
+class Rescorer:
+    """What-if re-scoring of an already scored frame under other weights/boundaries.
+
+    The eight metric columns are cached once as float64 arrays, and new X/Y
+    scores use ``weighted``, the expression ``score`` uses. Summing in any
+    other order (a BLAS matrix product, say) moves scores by an ulp and
+    splits tied employees. Ranks and boxes follow as in ``score``. The last ``cache_size`` configurations are memoized.
+    ``finish`` post-processes each result (e.g. display-only columns);
+    ``exact`` skips it.
+    """
+
+    def __init__(self, df, mode=ranking.GLOBAL, finish=None, cache_size=8):
+        self.base = df
+        self.mode = mode
+        self.finish = finish
+        self.metrics = {c: df[c].to_numpy(dtype=float) for c in METRIC_COLS}
+        self.cache_size = cache_size
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def score(self, config):
+        with self._lock:
+            df = self._results.get(config)
+            if df is not None:
+                self._results.move_to_end(config)
+                return df
+
+        df = self.exact(config)
+        if self.finish is not None:
+            df = self.finish(df)
+        df.attrs["version"] = f"{self.base.attrs.get('version')}.{config.key()}"
+
+        with self._lock:
+            self._results[config] = df
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return df
+
+    def exact(self, config):
+        """Unfinished, unmemoized result for ``config``: float64 scores and percentiles, as ``score`` gives."""
+        df = self.base.copy(deep=False)
+        df["X_Score"] = weighted(self.metrics, dict(config.perf_weights))
+        df["Y_Score"] = weighted(self.metrics, dict(config.pot_weights))
+        keys = ranking.partition_keys(self.mode)
+        df["X_Pct"] = ranking.rank_pct(df, "X_Score", keys)
+        df["Y_Pct"] = ranking.rank_pct(df, "Y_Score", keys)
+        team_ranks(df, self.mode)
+        assign_ratings(df, config.low_cut, config.high_cut)
+        return df
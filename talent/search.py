@@ -0,0 +1,110 @@
+"""N-gram inverted index over employee names and IDs.
+
+Built once per dataset version over the distinct lower-cased values of
+``EMP Name`` and ``EMP ID``. Every 1-, 2- and 3-gram of a value points to
+that value, so a query of up to three characters is a single posting
+lookup. A longer query intersects its trigram postings and checks the few
+survivors with a plain substring test. Matches are case-insensitive
+literal substrings, the same rows ``str.contains(case=False)`` finds for
+plain text. When nothing matches, values sharing most of the query's
+trigrams are returned instead, which covers typos.
+"""
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLS = ["EMP Name", "EMP ID"]
+GRAM_SIZES = (1, 2, 3)
+VERIFY_DIRECT = 256  # candidates checked by substring test without further intersecting
+FUZZY_MIN_SHARE = 0.5  # of the query's trigrams a fuzzy match must contain
+
+
+def _grams(text, k):
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+class SearchIndex:
+    def __init__(self, values, postings, value_rows, starts, n):
+        self.values = values
+        self.postings = postings
+        # Rows of value i: value_rows[starts[i]:starts[i + 1]]
+        self.value_rows = value_rows
+        self.starts = starts
+        self.n = n
+
+    @classmethod
+    def build(cls, df, cols=SEARCH_COLS):
+        cols = [c for c in cols if c in df.columns]
+        # One vocabulary across columns; each column maps its rows into it
+        lowered = [df[c].astype("string").str.lower() for c in cols]
+        codes, uniques = pd.factorize(pd.concat(lowered, ignore_index=True))
+        values = np.asarray([str(v) for v in uniques], dtype=np.dtypes.StringDType())
+
+        order = np.argsort(codes, kind="stable")
+        order = order[codes[order] >= 0]
+        value_rows = (order % len(df)).astype(np.int32)
+        starts = np.searchsorted(codes[order], np.arange(len(values) + 1))
+
+        postings = defaultdict(list)
+        for i, v in enumerate(values.tolist()):
+            for k in GRAM_SIZES:
+                for g in _grams(v, k):
+                    postings[g].append(i)
+        postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        return cls(values, postings, value_rows, starts, len(df))
+
+    def _exact(self, q):
+        if len(q) <= GRAM_SIZES[-1]:
+            return self.postings.get(q, np.empty(0, dtype=np.int32))
+        grams = sorted(_grams(q, 3), key=lambda g: len(self.postings.get(g, ())))
+        found = self.postings.get(grams[0])
+        if found is None:
+            return np.empty(0, dtype=np.int32)
+        for g in grams[1:]:
+            if len(found) <= VERIFY_DIRECT:
+                break  # cheaper to check the survivors than to merge big postings
+            found = np.intersect1d(found, self.postings.get(g, ()), assume_unique=True)
+        return found[np.strings.find(self.values[found], q) >= 0]
+
+    def _fuzzy(self, q, min_share=FUZZY_MIN_SHARE):
+        grams = _grams(q, 3)
+        if not grams:
+            return np.empty(0, dtype=np.int32)
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits:
+            return np.empty(0, dtype=np.int32)
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.values))
+        return np.flatnonzero(shared >= max(min_share * len(grams), 1)).astype(np.int32)
+
+    def _rows(self, matched, within):
+        """Ascending row ids holding any of the ``matched`` values."""
+        lo, hi = self.starts[matched], self.starts[matched + 1]
+        lengths = hi - lo
+        # Concatenated [lo, hi) ranges without a Python loop
+        offsets = np.repeat(lo - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        hits = self.value_rows[offsets]
+        if len(hits) * 32 < self.n:
+            # Few hits: sort them rather than touch every row
+            rows = np.unique(hits)
+            if within is None or not len(rows):
+                return rows
+            pos = np.minimum(np.searchsorted(within, rows), max(len(within) - 1, 0))
+            return rows[within[pos] == rows] if len(within) else rows[:0]
+        mask = np.zeros(self.n, dtype=bool)
+        mask[hits] = True
+        return np.flatnonzero(mask) if within is None else within[mask[within]]
+
+    def search(self, query, within=None, fuzzy=True):
+        """``(row ids, fuzzy)`` for ``query``, restricted to ``within`` (None means every row).
+
+        ``fuzzy`` is True when no row matched exactly and the ids are close
+        matches instead.
+        """
+        q = query.strip().lower()
+        if not q:
+            return (np.arange(self.n) if within is None else within), False
+        rows = self._rows(self._exact(q), within)
+        if len(rows) or not fuzzy:
+            return rows, False
+        return self._rows(self._fuzzy(q), within), True
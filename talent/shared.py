@@ -0,0 +1,143 @@
+"""Process-wide read-only dataset, memory-mapped from an Arrow IPC file.
+
+The compacted frame is written once per dataset version to an uncompressed
+Arrow IPC file in the cache directory. Every process then maps that file,
+instead of holding its own heap copy: every server worker, and every
+replica on the same host. The pages live in the OS page cache and are
+shared by all of them.
+
+Columns are laid out so pandas can use the mapped buffers without copying:
+
+* Numbers are stored as raw values (NaN stays NaN rather than
+  becoming an Arrow null), so they come back as read-only NumPy views.
+* Datetimes are stored as their int64 ticks and viewed back.
+* Categoricals are stored as their integer codes; the categories go in the
+  field metadata, since there are few of them.
+* Anything else (free text) is a plain Arrow column, which pandas' Arrow-
+  backed string dtype wraps as is.
+
+Sessions do not copy the frame at all. A ``Selection`` is the row ids a
+session picked, plus the shared frame. Columns are cut out on demand, and
+only for the rows that are shown.
+"""
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from talent import compact, snapshot
+
+SHARED_DIR = os.path.join(snapshot.CACHE_DIR, "shared")
+_META = b"talent"
+
+
+def _encode(series):
+    """``(arrow array, field metadata)`` for one column."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if pd.api.types.is_string_dtype(series.cat.categories):
+            meta = {"categories": [str(c) for c in series.cat.categories], "ordered": bool(series.cat.ordered)}
+            return pa.array(series.cat.codes.to_numpy()), meta
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf":
+        return pa.array(series.to_numpy()), {}
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind == "M":
+        return pa.array(series.to_numpy().view(np.int64)), {"numpy": str(series.dtype)}
+    return pa.array(series, from_pandas=True), {}
+
+
+def _decode(column, meta):
+    chunk = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if "categories" in meta:
+        codes = chunk.to_numpy(zero_copy_only=True)
+        dtype = pd.CategoricalDtype(meta["categories"], ordered=meta["ordered"])
+        return pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+    if "numpy" in meta:
+        return chunk.to_numpy(zero_copy_only=True).view(meta["numpy"])
+    if (pa.types.is_integer(chunk.type) or pa.types.is_floating(chunk.type)) and chunk.null_count == 0:
+        return chunk.to_numpy(zero_copy_only=True)
+    return column.to_pandas().array
+
+
+def write(df, path):
+    """Write ``df`` to ``path`` in the zero-copy layout."""
+    df = snapshot.arrow_safe(df)
+    arrays, fields = [], []
+    for col in df.columns:
+        array, meta = _encode(df[col])
+        arrays.append(array)
+        fields.append(pa.field(str(col), array.type, metadata={_META: json.dumps(meta)} if meta else None))
+    schema = pa.schema(fields, metadata={_META: json.dumps({"attrs": df.attrs}, default=str)})
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    def dump(tmp):
+        with pa.OSFile(tmp, "wb") as sink, ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+    snapshot.atomic_write(path, dump)
+
+
+def open_frame(path):
+    """Frame over the mapped file; columns are read-only views of the mapping."""
+    table = ipc.open_file(pa.memory_map(path)).read_all()
+    columns = {}
+    for field, column in zip(table.schema, table.columns):
+        meta = json.loads(field.metadata[_META]) if field.metadata and _META in field.metadata else {}
+        columns[field.name] = _decode(column, meta)
+    df = pd.DataFrame(columns, copy=False)
+    meta = json.loads(table.schema.metadata[_META]) if table.schema.metadata else {}
+    df.attrs = meta.get("attrs", {})
+    return df
+
+
+def path_for(name, version, directory=SHARED_DIR):
+    return os.path.join(directory, f"{name}-{version}.arrow")
+
+
+def share(df, name, directory=SHARED_DIR):
+    """The shared, mapped copy of ``df`` (keyed by ``name`` and its version); older versions are removed."""
+    os.makedirs(directory, exist_ok=True)
+    path = path_for(name, df.attrs.get("version"), directory)
+    if not os.path.exists(path):
+        write(df, path)
+    for old in glob.glob(os.path.join(directory, glob.escape(name) + "-*.arrow")):
+        if old != path:
+            try:
+                os.remove(old)  # processes still mapping it keep their pages until they let go
+            except OSError:
+                pass
+    return open_frame(path)
+
+
+class Selection:
+    """Row ids a session picked from the shared frame; ``rows=None`` is every row."""
+
+    def __init__(self, df, rows=None):
+        self.df = df
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.df) if self.rows is None else len(self.rows)
+
+    @property
+    def nbytes(self):
+        return 0 if self.rows is None else self.rows.nbytes
+
+    def frame(self, cols=None):
+        """The selected rows, restricted to ``cols``; a zero-copy slice when the rows are contiguous."""
+        view = compact.view(self.df, self.rows)
+        return view if cols is None else view[[c for c in cols if c in view.columns]]
+
+    def column(self, col):
+        return compact.view(self.df[col], self.rows)
+
+    def where(self, col, values):
+        """Narrower selection: rows whose ``col`` is one of ``values``."""
+        mask = self.column(col).isin(values).to_numpy()
+        rows = np.flatnonzero(mask)
+        return Selection(self.df, rows if self.rows is None else self.rows[rows])
+
+    def head(self, n, cols=None):
+        rows = np.arange(min(n, len(self.df))) if self.rows is None else self.rows[:n]
+        return Selection(self.df, rows).frame(cols)
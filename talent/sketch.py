@@ -0,0 +1,99 @@
+"""Mergeable quantile sketch for the X/Y score distributions.
+
+Small populations are kept exactly as a sorted array. Quantiles then match
+``np.percentile`` (linear) to the last bit. Past
+``EXACT_LIMIT`` values the sketch switches to KLL. A stack of levels holds
+items of weight 2**h; when a level overflows its capacity it is sorted and
+every other item (random offset) is promoted one level up. Memory stays
+around 3k items whatever the population size, and the rank error is about
+1.7 / k (under 1% at the default k).
+
+Sketches of different partitions (quarters, shards, org units) merge level
+by level, so a pooled cut line never rescans rows. Only cut lines are read
+from the sketch; each row's percentile is still an exact rank at scoring,
+so the 9-box never depends on sketch error.
+"""
+import numpy as np
+
+EXACT_LIMIT = 100_000
+DEFAULT_K = 256
+_SHRINK = 2 / 3
+
+
+class QuantileSketch:
+    def __init__(self, levels, n, k=DEFAULT_K, exact_limit=EXACT_LIMIT, seed=0):
+        self.levels = levels  # levels[h]: items of weight 2**h; exact: one sorted level
+        self.n = n
+        self.k = k
+        self.exact_limit = exact_limit
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_values(cls, values, k=DEFAULT_K, exact_limit=EXACT_LIMIT, seed=0):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        sketch = cls([np.sort(values)], len(values), k, exact_limit, seed)
+        if sketch.n > exact_limit:
+            sketch._compress()
+        return sketch
+
+    @property
+    def exact(self):
+        return len(self.levels) == 1 and len(self.levels[0]) == self.n
+
+    def _capacity(self, h):
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * _SHRINK ** depth)))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(level)
+                keep = level[len(level) - len(level) % 2:]  # an odd item stays behind
+                promoted = level[self._rng.integers(2):len(level) - len(keep):2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def merge(self, *others):
+        """New sketch over the union of ``self`` and ``others``."""
+        sketches = (self,) + others
+        n = sum(s.n for s in sketches)
+        if all(s.exact for s in sketches) and n <= self.exact_limit:
+            return QuantileSketch([np.sort(np.concatenate([s.levels[0] for s in sketches]))], n,
+                                  self.k, self.exact_limit)
+        depth = max(len(s.levels) for s in sketches)
+        levels = [np.concatenate([s.levels[h] for s in sketches if h < len(s.levels)]) for h in range(depth)]
+        merged = QuantileSketch(levels, n, self.k, self.exact_limit)
+        merged._compress()
+        return merged
+
+    def _weighted(self):
+        """Sorted items and their weights."""
+        if self.exact:
+            return self.levels[0], None
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 2.0 ** h) for h, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """Value at the ``q``-th percentile (0-100), linear as in ``np.percentile``."""
+        if self.n == 0:
+            return np.nan
+        items, weights = self._weighted()
+        target = q / 100 * (self.n - 1)
+        if weights is None:
+            lo = int(np.floor(target))
+            hi = min(lo + 1, self.n - 1)
+            return items[lo] + (items[hi] - items[lo]) * (target - lo)
+        # Each item stands for a run of ``weight`` ranks; interpolate between run midpoints
+        mid = np.cumsum(weights) - (weights + 1) / 2
+        return float(np.interp(target, mid, items))
+
+    def __len__(self):
+        return self.n
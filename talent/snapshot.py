@@ -0,0 +1,173 @@
+"""Persisted, pre-scored Parquet snapshot of the source sheet.
+
+The snapshot is keyed on the source's cheap probe (file mtime/size, sheet
+revision) and, when that moves, on its content digest so a touched-but-
+unchanged file is not re-parsed. Every process (and every replica sharing
+the directory) reads the same snapshot; the source is only read and
+scored when its content actually changed.
+"""
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from talent import sources
+
+CACHE_DIR = ".talent_cache"
+# Bump whenever the scored output changes shape so stale snapshots are rebuilt
+SCHEMA_VERSION = 1
+
+
+def _as_source(source):
+    """Plain paths are file sources."""
+    return sources.FileSource(source) if isinstance(source, str) else source
+
+
+def _name(source, variant):
+    name = source.name
+    return f"{name}.{variant}" if variant else name
+
+
+def _meta_path(source, cache_dir, variant=None):
+    return os.path.join(cache_dir, f"{_name(source, variant)}.json")
+
+
+def atomic_write(path, write):
+    """Write through a temp file in the same directory, then rename over ``path``."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+
+
+# Object columns of these inferred kinds convert to Arrow as they are
+ARROW_KINDS = {
+    "empty", "string", "bytes", "boolean", "integer", "floating", "mixed-integer-float", "decimal",
+    "datetime64", "datetime", "date", "timedelta64", "timedelta", "time",
+}
+
+
+def as_text(values):
+    """``values`` as strings, with missing cells left missing."""
+    return values.astype(str).where(values.notna())
+
+
+def arrow_safe(df):
+    """``df`` with mixed-type object columns as text, so Arrow and Parquet can store them.
+
+    A sheet column with one numeric ``EMP ID`` among string ids is read as
+    an object column Arrow refuses to convert. Such columns (and categoricals
+    with such categories) become strings; everything else is left as is.
+    """
+    fixed = {}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            if values.cat.categories.dtype == object and pd.api.types.infer_dtype(values.cat.categories) not in ARROW_KINDS:
+                fixed[col] = as_text(values.astype(object))
+        elif values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) not in ARROW_KINDS:
+            fixed[col] = as_text(values)
+    return df.assign(**fixed) if fixed else df
+
+
+def _read_meta(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path, meta):
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+    atomic_write(path, write)
+
+
+def read_snapshot(source, cache_dir=CACHE_DIR, variant=None, columns=None):
+    """The current snapshot and its metadata, or ``(None, None)`` if there is none.
+
+    The frame's ``attrs["version"]`` is the workbook's content hash, a cheap
+    dataset version for downstream caches. ``columns`` reads only those.
+    """
+    source = _as_source(source)
+    meta = _read_meta(_meta_path(source, cache_dir, variant))
+    if not meta or meta.get("version") != SCHEMA_VERSION:
+        return None, None
+    try:
+        df = pd.read_parquet(os.path.join(cache_dir, meta["file"]), columns=columns)
+    except (OSError, ValueError, KeyError):
+        return None, None
+    df.attrs["version"] = meta["sha256"][:16]
+    return df, meta
+
+
+def write_snapshot(source, df, probe, digest, cache_dir=CACHE_DIR, variant=None):
+    """Persist ``df`` as the snapshot for ``source`` and return its metadata."""
+    source = _as_source(source)
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = _meta_path(source, cache_dir, variant)
+    old = _read_meta(meta_path)
+
+    # Content-addressed data file: readers holding the old metadata keep a
+    # consistent view until the metadata rename lands.
+    data_file = f"{_name(source, variant)}-{digest[:16]}.parquet"
+    atomic_write(os.path.join(cache_dir, data_file), lambda tmp: arrow_safe(df).to_parquet(tmp, index=False))
+    meta = {
+        "version": SCHEMA_VERSION,
+        "file": data_file,
+        **probe,
+        "sha256": digest,
+    }
+    _write_meta(meta_path, meta)
+
+    if old and old.get("file") not in (None, data_file):
+        try:
+            os.remove(os.path.join(cache_dir, old["file"]))
+        except OSError:
+            pass
+    return meta
+
+
+def load_or_build(source, build, cache_dir=CACHE_DIR, variant=None, probe=None):
+    """Scored frame for ``source``; ``build(source, previous)`` only runs when its content changed.
+
+    ``source`` is a path or a ``talent.sources`` backend. ``previous`` is the
+    last snapshot (or ``None``) so the builder can patch it instead of
+    scoring from scratch. ``variant`` keeps separately scored copies of the
+    same source apart (e.g. one per ranking mode). ``probe`` is a probe the
+    caller just took (e.g. the refresher's), so the source is not asked twice.
+    """
+    source = _as_source(source)
+    probe = source.probe() if probe is None else probe
+    meta_path = _meta_path(source, cache_dir, variant)
+    meta = _read_meta(meta_path)
+
+    digest = None
+    if meta and meta.get("version") == SCHEMA_VERSION:
+        unchanged = all(meta.get(k) == v for k, v in probe.items())
+        if not unchanged:
+            digest = source.digest()
+            unchanged = digest == meta.get("sha256")
+        if unchanged:
+            df, _ = read_snapshot(source, cache_dir, variant)
+            if df is not None:
+                if digest is not None:
+                    # Touched but identical: remember the new probe to skip hashing next time
+                    _write_meta(meta_path, {**meta, **probe})
+                return df
+
+    digest = digest or source.digest()
+    previous, _ = read_snapshot(source, cache_dir, variant)
+    # Normalized up front, so this frame matches what later reads of the snapshot return
+    df = arrow_safe(build(source, previous))
+    write_snapshot(source, df, probe, digest, cache_dir, variant)
+    df.attrs["version"] = digest[:16]
+    return df
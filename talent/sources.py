@@ -0,0 +1,268 @@
+"""Where the raw employee sheet comes from.
+
+Every backend exposes the same three calls, so the snapshot and scoring
+pipeline do not care where rows live:
+
+* ``probe()``: a cheap change token (file mtime/size, sheet revision).
+* ``digest()``: a content version, only asked for when the probe moved.
+* ``read()``: the raw frame, only called when the content really changed.
+
+Google Sheets goes through one authorized client per credential set,
+shared by every session in the process (and its HTTP connection pool).
+Its probe is the Drive revision of the spreadsheet, so an unchanged sheet
+is never downloaded. All ranges are read in a single ``values:batchGet``
+call. ``LocalSheets`` serves workbooks or frames through the same
+interface, for development and tests without Google credentials.
+
+Sharded sources (every sheet of a workbook, or a glob of CSV/Parquet
+files) also list their ``shards()`` so ``talent.parallel`` can parse and
+score them in separate processes.
+"""
+import glob
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+GSHEET_SCHEME = "gsheet://"
+GLOB_CHARS = "*?["
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+SHEETS_SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
+]
+BATCH_PARAMS = {"valueRenderOption": "UNFORMATTED_VALUE", "dateTimeRenderOption": "FORMATTED_STRING"}
+
+READERS = {
+    ".xlsx": pd.read_excel,
+    ".xls": pd.read_excel,
+    ".csv": pd.read_csv,
+    ".parquet": pd.read_parquet,
+}
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileSource:
+    """Excel, CSV or Parquet file on disk."""
+
+    def __init__(self, path):
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in READERS:
+            raise ValueError(f"Unsupported file type: {path}")
+        self.path = path
+        self.name = os.path.basename(path)
+        self._reader = READERS[ext]
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def probe(self):
+        stat = os.stat(self.path)
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def digest(self):
+        return file_hash(self.path)
+
+    def read(self):
+        return self._reader(self.path)
+
+    def __repr__(self):
+        return f"FileSource({self.path!r})"
+
+
+def read_shard(shard):
+    """Frame for one ``(path, sheet)`` shard; ``sheet`` is None for CSV/Parquet files."""
+    path, sheet = shard
+    if sheet is not None:
+        return pd.read_excel(path, sheet_name=sheet)
+    return READERS[os.path.splitext(path)[1].lower()](path)
+
+
+class WorkbookSheets(FileSource):
+    """Every sheet of one workbook (e.g. one per business unit or quarter), stacked."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.name = f"{self.name}.sheets"
+
+    def shards(self):
+        with pd.ExcelFile(self.path) as book:
+            return [(self.path, sheet) for sheet in book.sheet_names]
+
+    def read(self):
+        return pd.concat([read_shard(s) for s in self.shards()], ignore_index=True)
+
+
+class FileShards:
+    """CSV/Parquet shards matching a glob, stacked in path order."""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.name = "shards-" + hashlib.sha256(pattern.encode()).hexdigest()[:12]
+
+    def paths(self):
+        return sorted(glob.glob(self.pattern))
+
+    def exists(self):
+        return bool(self.paths())
+
+    def probe(self):
+        stats = [(p, os.stat(p)) for p in self.paths()]
+        return {"files": [[p, st.st_mtime_ns, st.st_size] for p, st in stats]}
+
+    def digest(self):
+        h = hashlib.sha256()
+        for p in self.paths():
+            h.update(f"{p}:{file_hash(p)}".encode())
+        return h.hexdigest()
+
+    def shards(self):
+        return [(p, None) for p in self.paths()]
+
+    def read(self):
+        return pd.concat([read_shard(s) for s in self.shards()], ignore_index=True)
+
+    def __repr__(self):
+        return f"FileShards({self.pattern!r})"
+
+
+# --- Google Sheets -----------------------------------------------------------
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def authorized_client(credentials_info):
+    """Process-wide gspread client for a service-account credential set."""
+    key = hashlib.sha256(repr(sorted(credentials_info.items())).encode()).hexdigest()
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            import gspread
+            from google.oauth2.service_account import Credentials
+
+            creds = Credentials.from_service_account_info(credentials_info, scopes=SHEETS_SCOPES)
+            client = _clients[key] = gspread.authorize(creds)
+        return client
+
+
+class GspreadTransport:
+    """The two Sheets/Drive calls ``GoogleSheetSource`` needs, over a gspread client."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def revision(self, key):
+        r = self.client.http_client.request(
+            "get", f"{DRIVE_FILES_URL}/{key}", params={"fields": "version", "supportsAllDrives": True}
+        )
+        return r.json()["version"]
+
+    def batch_get(self, key, ranges):
+        body = self.client.http_client.values_batch_get(key, ranges, params=dict(BATCH_PARAMS))
+        return [vr.get("values", []) for vr in body.get("valueRanges", [])]
+
+
+def _frame(values):
+    """Header row plus data rows (Sheets drops trailing empty cells) as a frame."""
+    if not values:
+        return pd.DataFrame()
+    header, rows = values[0], values[1:]
+    width = len(header)
+    rows = [r[:width] + [None] * (width - len(r)) for r in rows]
+    return pd.DataFrame(rows, columns=header).replace("", None)
+
+
+class GoogleSheetSource:
+    """One or more ranges (e.g. one tab per quarter) of a spreadsheet, stacked."""
+
+    def __init__(self, key, ranges=None, transport=None, credentials=None):
+        if transport is None:
+            transport = GspreadTransport(authorized_client(credentials))
+        self.key = key
+        self.ranges = list(ranges) if ranges else ["A:ZZ"]
+        self.transport = transport
+        self.name = f"gsheet-{key}"
+        self._revision = None
+
+    def exists(self):
+        return True
+
+    def probe(self):
+        self._revision = str(self.transport.revision(self.key))
+        return {"revision": self._revision, "ranges": self.ranges}
+
+    def digest(self):
+        # The Drive revision already versions the content; nothing to download
+        revision = self._revision if self._revision is not None else self.transport.revision(self.key)
+        return hashlib.sha256(f"{self.key}:{self.ranges}:{revision}".encode()).hexdigest()
+
+    def read(self):
+        frames = [_frame(values) for values in self.transport.batch_get(self.key, self.ranges)]
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def __repr__(self):
+        return f"GoogleSheetSource({self.key!r}, {self.ranges!r})"
+
+
+class LocalSheets:
+    """Sheets stand-in: spreadsheets are workbooks on disk or dicts of frames.
+
+    A workbook's revision is its mtime; an in-memory spreadsheet's revision
+    goes up on every ``update``. ``fetches`` counts batch reads.
+    """
+
+    def __init__(self, spreadsheets=None):
+        self.spreadsheets = dict(spreadsheets or {})
+        self.revisions = {}
+        self.fetches = 0
+
+    def update(self, key, tabs):
+        self.spreadsheets[key] = dict(tabs)
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+
+    def _tabs(self, key):
+        book = self.spreadsheets[key]
+        return pd.read_excel(book, sheet_name=None) if isinstance(book, str) else book
+
+    def revision(self, key):
+        book = self.spreadsheets[key]
+        return os.stat(book).st_mtime_ns if isinstance(book, str) else self.revisions.get(key, 0)
+
+    def batch_get(self, key, ranges):
+        self.fetches += 1
+        tabs = self._tabs(key)
+        out = []
+        for rng in ranges:
+            tab = rng.split("!")[0] if "!" in rng else rng
+            df = tabs.get(tab, next(iter(tabs.values())))
+            df = df.astype(object).where(df.notna(), None)
+            out.append([list(df.columns)] + df.values.tolist())
+        return out
+
+
+def from_uri(uri, credentials=None, transport=None):
+    """Source for ``uri``.
+
+    ``gsheet://<key>/<tab>,<tab>`` is Google Sheets, ``book.xlsx#*`` every
+    sheet of a workbook, a glob (``shards/*.parquet``) a set of file shards,
+    anything else a single file.
+    """
+    if uri.startswith(GSHEET_SCHEME):
+        key, _, tabs = uri[len(GSHEET_SCHEME):].partition("/")
+        ranges = [t for t in tabs.split(",") if t] or None
+        return GoogleSheetSource(key, ranges, transport=transport, credentials=credentials)
+    if uri.endswith("#*"):
+        return WorkbookSheets(uri[:-2])
+    if any(c in uri for c in GLOB_CHARS):
+        return FileShards(uri)
+    return FileSource(uri)
@@ -0,0 +1,100 @@
+"""Quarter-to-quarter box movements, pre-aggregated per dataset version.
+
+Each employee's rows are paired with their row in the next quarter. The
+pairs are counted per (Business Unit, Department, Sub Department, Manager,
+From Quarter, From box, To box) in one vectorized pass. The Trends tab
+rolls this up into a Sankey, so its size follows the number of boxes and
+quarters, not the headcount. The org columns are taken from the later
+quarter, so a filter selects people by where they sit now.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from talent import classify
+
+DIMENSIONS = ["Business Unit", "Department", "Sub Department", "Manager"]
+EMPLOYEE_KEY = "EMP ID"
+
+
+class TransitionCube:
+    def __init__(self, flows, quarters, dims):
+        self.flows = flows
+        self.quarters = quarters
+        self.dims = dims
+
+    @classmethod
+    def build(cls, df, key=EMPLOYEE_KEY):
+        dims = [c for c in DIMENSIONS if c in df.columns]
+        columns = dims + ["From Quarter", "From", "To", "Count"]
+        if "Quarter" not in df.columns or key not in df.columns:
+            return cls(pd.DataFrame(columns=columns), [], dims)
+
+        q_codes, quarters = pd.factorize(df["Quarter"], sort=True)
+        emp, _ = pd.factorize(df[key])
+        box = pd.Categorical(df["Final Rating"], categories=classify.BOX_LABELS).codes
+
+        order = np.lexsort((q_codes, emp))
+        e, q = emp[order], q_codes[order]
+        # Same employee, next quarter in the dataset's quarter order
+        step = (e[1:] == e[:-1]) & (e[1:] >= 0) & (q[:-1] >= 0) & (q[1:] == q[:-1] + 1)
+        src, dst = order[:-1][step], order[1:][step]
+
+        pairs = df.iloc[dst][dims].reset_index(drop=True)
+        pairs["From Quarter"] = q_codes[src]
+        pairs["From"] = box[src]
+        pairs["To"] = box[dst]
+        flows = pairs.groupby(dims + ["From Quarter", "From", "To"], dropna=False, observed=True).size()
+        return cls(flows.reset_index(name="Count"), list(quarters), dims)
+
+    def links(self, filters=None):
+        """Movement counts per (From Quarter, From, To) over the filtered slice."""
+        flows = self.flows
+        for col, selected in (filters or {}).items():
+            if selected and col in self.dims:
+                flows = flows[flows[col].isin(selected)]
+        return flows.groupby(["From Quarter", "From", "To"])["Count"].sum().reset_index()
+
+    def __len__(self):
+        return len(self.flows)
+
+
+def _rgba(color, alpha):
+    color = color.lstrip("#")
+    r, g, b = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+    return f"rgba({r},{g},{b},{alpha})"
+
+
+def build_figure(links, quarters, colors, theme):
+    """Sankey with one column of box nodes per quarter."""
+    labels = classify.BOX_LABELS
+    n_box = len(labels)
+    src = links["From Quarter"].to_numpy() * n_box + links["From"].to_numpy()
+    dst = (links["From Quarter"].to_numpy() + 1) * n_box + links["To"].to_numpy()
+
+    # Only nodes that carry a flow, renumbered densely
+    used, inverse = np.unique(np.concatenate([src, dst]), return_inverse=True)
+    node_q, node_box = used // n_box, used % n_box
+    node_colors = [colors.get(labels[b], "#94A3B8") for b in node_box]
+
+    fig = go.Figure(go.Sankey(
+        arrangement="snap",
+        node=dict(
+            label=[labels[b] for b in node_box],
+            customdata=[quarters[q] for q in node_q],
+            color=node_colors,
+            pad=8, thickness=12, line=dict(width=0),
+            hovertemplate="<b>%{label}</b> · %{customdata}<br>%{value} employee(s)<extra></extra>",
+        ),
+        link=dict(
+            source=inverse[:len(src)], target=inverse[len(src):], value=links["Count"].to_numpy(),
+            color=[_rgba(node_colors[i], 0.35) for i in inverse[:len(src)]],
+            hovertemplate="%{source.label} → %{target.label}<br>%{value} employee(s)<extra></extra>",
+        ),
+    ))
+    fig.update_layout(
+        template=theme["--plotly-temp"], height=520, margin=dict(l=10, r=10, t=10, b=10),
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter", color=theme["--fb-text"], size=11),
+    )
+    return fig
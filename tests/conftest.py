@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# Tests reuse the benchmarks' synthetic sheets (Data.xlsx schema, several quarters)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synthetic import make_workbook  # noqa: E402
+
+
+@pytest.fixture
+def sheet():
+    """Factory for raw sheets: ``sheet(rows, quarters=4, seed=0)``."""
+    return make_workbook
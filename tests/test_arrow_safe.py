@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from talent import batch, compact, export, scoring, shared, snapshot
+
+
+def mixed_ids(raw):
+    """One numeric EMP ID (and one blank) among the FINBP... strings, as Excel hands them over."""
+    raw["EMP ID"] = raw["EMP ID"].astype(object)
+    raw.loc[3, "EMP ID"] = 12345
+    raw.loc[5, "EMP ID"] = np.nan
+    return raw
+
+
+def test_arrow_safe_stringifies_mixed_columns_only():
+    df = pd.DataFrame({
+        "mixed": pd.Series(["FINBP1", 12345, np.nan], dtype=object),
+        "numbers": pd.Series([1, 2.5, np.nan], dtype=object),
+        "text": ["a", "b", "c"],
+    })
+    df.attrs["version"] = "v1"
+    safe = snapshot.arrow_safe(df)
+    assert safe["mixed"].tolist()[:2] == ["FINBP1", "12345"]
+    assert pd.isna(safe["mixed"].iloc[2])
+    assert safe["numbers"].dtype == object
+    assert safe.attrs == {"version": "v1"}
+    pa.Table.from_pandas(safe)
+
+
+def test_snapshot_loads_mixed_type_workbook(sheet, tmp_path):
+    path = str(tmp_path / "Data.xlsx")
+    mixed_ids(sheet(40, quarters=2)).to_excel(path, index=False)
+    build = lambda src, previous: scoring.score(src.read())  # noqa: E731
+    first = snapshot.load_or_build(path, build, cache_dir=str(tmp_path / "cache"))
+    again = snapshot.load_or_build(path, build, cache_dir=str(tmp_path / "cache"))
+    assert first["EMP ID"].iloc[3] == again["EMP ID"].iloc[3] == "12345"
+    assert pd.isna(again["EMP ID"].iloc[5])
+
+
+def test_shared_frame_and_exports_accept_mixed_types(sheet, tmp_path):
+    df = compact.compact(scoring.score(mixed_ids(sheet(40, quarters=2))))
+    df.attrs["version"] = "v1"
+    mapped = shared.share(df, "mixed", str(tmp_path))
+    assert mapped["EMP ID"].iloc[3] == "12345"
+    export.write_parquet(df, str(tmp_path / "out.parquet"))
+    assert pd.read_parquet(tmp_path / "out.parquet")["EMP ID"].iloc[3] == "12345"
+
+
+def test_batch_scores_mixed_type_csv(sheet, tmp_path):
+    src, dst = str(tmp_path / "in.csv"), str(tmp_path / "out.parquet")
+    raw = mixed_ids(sheet(40, quarters=2))
+    raw.to_csv(src, index=False)
+    # Small chunks: the numeric id lands in a chunk of its own type mix
+    assert batch.score_file(src, dst, chunk_rows=4) == len(raw)
+    assert len(pd.read_parquet(dst)) == len(raw)
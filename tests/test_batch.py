@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from talent import batch, ranking, scoring
+
+SCORED = ["X_Score", "Y_Score", "X_Pct", "Y_Pct", "X_Pct_Team", "Y_Pct_Team"]
+RATINGS = ["Final Rating", "Team_Rating", "Comparison"]
+
+
+def blank_first_block(raw, rows):
+    # The first chunk's Sub Department is empty: pandas reads that block as float NaN
+    raw = raw.copy()
+    raw.loc[:rows - 1, "Sub Department"] = np.nan
+    return raw
+
+
+@pytest.mark.parametrize("mode", list(ranking.RANK_MODES))
+@pytest.mark.parametrize("ext", [".parquet", ".csv"])
+def test_blank_text_column_in_first_chunk(sheet, tmp_path, mode, ext):
+    src, dst = str(tmp_path / "in.csv"), str(tmp_path / f"out{ext}")
+    raw = blank_first_block(sheet(200, quarters=2), 20)
+    raw.to_csv(src, index=False)
+    assert batch.score_file(src, dst, mode, chunk_rows=20) == len(raw)
+
+    expected = scoring.score(pd.read_csv(src), mode)
+    if ext == ".parquet":
+        out = pd.read_parquet(dst)
+        np.testing.assert_array_equal(out[SCORED].to_numpy(), expected[SCORED].to_numpy())
+    else:  # CSV text round-trips floats to the last ulp at best
+        out = pd.read_csv(dst)
+        np.testing.assert_allclose(out[SCORED].to_numpy(), expected[SCORED].to_numpy(), rtol=1e-12)
+    for col in RATINGS:
+        assert (out[col].astype(str) == expected[col].astype(str)).all(), col
+    sub = out["Sub Department"]
+    assert sub.isna().sum() == 20 and (sub.dropna() == expected["Sub Department"].dropna()).all()
+
+
+def test_parquet_text_columns_are_strings(sheet, tmp_path):
+    src, dst = str(tmp_path / "in.csv"), str(tmp_path / "out.parquet")
+    blank_first_block(sheet(100, quarters=2), 20).to_csv(src, index=False)
+    batch.score_file(src, dst, chunk_rows=20)
+    schema = pq.read_schema(dst)
+    for col in ("EMP ID", "Sub Department", "Manager", "Quarter"):
+        assert schema.field(col).type == "large_string", col
+    assert schema.field("X_Score").type == "double"
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from talent import bitmap, compact, scoring
+
+SELECTIONS = [
+    {},
+    {"Quarter": ["Q1"]},  # dense: packed bitmap
+    {"Manager": ["Manager 3", "Manager 40"]},  # sparse: row-id lists
+    {"Business Unit": ["BU 0", "BU 1"], "Quarter": ["Q0", "Q3"]},
+    {"Department": ["Dept 2"], "Manager": [], "Quarter": ["Q2"]},  # empty selections are ignored
+    {"Manager": ["No such manager"]},
+]
+
+
+@pytest.fixture(params=[False, True], ids=["raw", "compact"])
+def scored(sheet, request):
+    df = scoring.score(sheet(4000, quarters=4))
+    return compact.compact(df) if request.param else df
+
+
+def isin_rows(df, filters, within=None):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        if values:
+            mask &= df[col].isin(values).to_numpy()
+    rows = np.flatnonzero(mask)
+    return rows if within is None else np.intersect1d(rows, within)
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_select_matches_isin(scored, filters):
+    index = bitmap.FilterIndex.build(scored)
+    rows = index.select(filters)
+    if not any(filters.values()):
+        assert rows is None
+    else:
+        np.testing.assert_array_equal(rows, isin_rows(scored, filters))
+    within = np.flatnonzero((scored["Category"] == "Evaluated").to_numpy())
+    got = index.select(filters, within=within)
+    np.testing.assert_array_equal(got, isin_rows(scored, filters, within))
+
+
+def test_options_cascade_from_the_selection(scored):
+    index = bitmap.FilterIndex.build(scored)
+    assert index.options("Quarter") == sorted(scored["Quarter"].astype(str).unique())
+    rows = index.select({"Business Unit": ["BU 1"]})
+    expected = sorted(scored["Manager"].iloc[rows].astype(str).unique())
+    assert index.options("Manager", rows) == expected
+    assert index.options("Manager", rows[:0]) == []
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import calibration, classify, compact, scoring
+
+SELECTIONS = [
+    {},
+    {"Quarter": ["Q1"]},
+    {"Business Unit": ["BU 0"], "Quarter": ["Q0", "Q2"]},
+    {"Department": ["Dept 1", "Dept 3"]},
+]
+
+
+@pytest.fixture
+def scored(sheet):
+    return compact.compact(scoring.score(sheet(1500, quarters=3)))
+
+
+def selected(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        mask &= df[col].isin(values).to_numpy()
+    return df[mask]
+
+
+def grouped_board(df):
+    # The Calibration Matrix's own numbers, one groupby per manager
+    rated = df[df["Final Rating"] != classify.NEW_TO_RATE]
+    rows = []
+    for manager, team in rated.groupby("Manager", observed=True):
+        boxes = calibration.RATED_BOXES
+        ours = team["Team_Rating"].value_counts().reindex(boxes, fill_value=0)
+        org = team["Final Rating"].value_counts().reindex(boxes, fill_value=0)
+        status = team["Comparison"].value_counts()
+        rows.append({
+            "Manager": str(manager),
+            "Team Size": len(team),
+            "Higher": status.get(calibration.HIGHER, 0),
+            "Lower": status.get(calibration.LOWER, 0),
+            "Drift": (ours - org).abs().sum() / 2 / len(team),
+        })
+    return pd.DataFrame(rows).set_index("Manager").sort_index()
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_leaderboard_matches_a_groupby_over_rated_rows(scored, filters):
+    board = calibration.ManagerCalibration.build(scored).leaderboard(filters)
+    expected = grouped_board(selected(scored, filters))
+    got = board.assign(Manager=board["Manager"].astype(str)).set_index("Manager")[expected.columns].sort_index()
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False, check_index_type=False)
+    np.testing.assert_allclose(board["Net Shift"], (board["Higher"] - board["Lower"]) / board["Team Size"])
+    assert board["Drift"].is_monotonic_decreasing
+
+
+def test_min_size_hides_small_teams(scored):
+    calib = calibration.ManagerCalibration.build(scored)
+    full = calib.leaderboard({"Quarter": ["Q0"]})
+    cut = int(full["Team Size"].median())
+    assert set(calib.leaderboard({"Quarter": ["Q0"]}, min_size=cut)["Manager"]) == set(
+        full.loc[full["Team Size"] >= cut, "Manager"])
+
+
+@pytest.mark.parametrize("filters", SELECTIONS[:2])
+def test_distribution_matches_value_counts(scored, filters):
+    calib = calibration.ManagerCalibration.build(scored)
+    team = selected(scored, {**filters, "Manager": ["Manager 2"]})
+    team = team[team["Final Rating"] != classify.NEW_TO_RATE]
+    dist = calib.distribution("Manager 2", filters).set_index("Box")
+    boxes = calibration.RATED_BOXES
+    np.testing.assert_array_equal(dist["Team"], team["Team_Rating"].value_counts().reindex(boxes, fill_value=0))
+    np.testing.assert_array_equal(dist["Org"], team["Final Rating"].value_counts().reindex(boxes, fill_value=0))
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import classify, compact, scoring
+
+
+@pytest.fixture
+def scored(sheet):
+    return scoring.score(sheet(1200, quarters=3))
+
+
+def test_compact_keeps_the_values(scored):
+    small = compact.compact(scored)
+    assert compact.memory_bytes(small) < compact.memory_bytes(scored)
+    for col in scored.columns:
+        if col in compact.SCORE_COLS:
+            assert small[col].dtype == np.float32
+            np.testing.assert_allclose(small[col], scored[col], rtol=1e-6)
+        else:
+            pd.testing.assert_series_equal(small[col].astype(object), scored[col].astype(object), check_dtype=False)
+    assert isinstance(small["Manager"].dtype, pd.CategoricalDtype)
+    # Ids repeat once per quarter; within one quarter they are unique and stay text
+    one = compact.compact(scored[scored["Quarter"] == "Q0"])
+    assert not isinstance(one["EMP ID"].dtype, pd.CategoricalDtype)
+
+
+def test_metrics_are_only_narrowed_when_exact(scored):
+    odd = scored.assign(Delivery=scored["Delivery"] + 0.1)
+    small = compact.compact(odd)
+    assert small["Delivery"].dtype == np.float64
+    assert small["Collaboration"].dtype == np.float32  # half-point steps fit
+    np.testing.assert_array_equal(small["Collaboration"], scored["Collaboration"])
+
+
+@pytest.mark.parametrize("categorical", [True, False])
+def test_describe_matches_map(scored, categorical):
+    lookup = {label: f"about {label}" for label in classify.BOX_LABELS if label != "Top Talent"}
+    ratings = scored["Final Rating"].astype(str)
+    ratings = ratings.astype("category") if categorical else ratings
+    got = compact.describe(ratings, lookup)
+    expected = ratings.astype(object).map(lookup)
+    pd.testing.assert_series_equal(got.astype(object), expected.astype(object))
+
+
+def test_view_matches_iloc(scored):
+    small = compact.compact(scored)
+    contiguous = np.arange(100, 400)
+    scattered = np.flatnonzero((small["Quarter"] == "Q1").to_numpy() & (small["X_Score"] > 7).to_numpy())
+    for rows in (contiguous, scattered):
+        pd.testing.assert_frame_equal(compact.view(small, rows), small.iloc[rows])
+    assert compact.view(small, None) is small
+    assert np.shares_memory(compact.view(small, contiguous)["X_Score"].to_numpy(), small["X_Score"].to_numpy())
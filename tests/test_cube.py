@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import classify, compact, cube, scoring
+
+SELECTIONS = [
+    {},
+    {"Quarter": ["Q1"]},
+    {"Business Unit": ["BU 0"], "Quarter": ["Q2", "Q3"]},
+    {"Manager": ["Manager 7", "Manager 8"], "Department": []},
+]
+
+
+@pytest.fixture
+def scored(sheet):
+    return compact.compact(scoring.score(sheet(3000, quarters=4)))
+
+
+def selected(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        if values:
+            mask &= df[col].isin(values).to_numpy()
+    return df[mask]
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_rating_counts_match_value_counts(scored, filters):
+    counts = cube.RatingCube.build(scored).rating_counts(filters)
+    expected = selected(scored, filters)["Final Rating"].astype(str).value_counts()
+    expected = expected.reindex(classify.BOX_LABELS, fill_value=0)
+    assert counts.index.tolist() == list(classify.BOX_LABELS)
+    np.testing.assert_array_equal(counts.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_rollup_matches_groupby_size(scored, filters):
+    got = cube.RatingCube.build(scored).rollup(["Quarter", "Final Rating"], filters)
+    expected = selected(scored, filters).groupby(["Quarter", "Final Rating"], observed=True).size()
+    pd.testing.assert_series_equal(got.set_index(["Quarter", "Final Rating"])["Count"], expected,
+                                   check_names=False, check_dtype=False)
+
+
+def test_as_frame_drops_empty_boxes():
+    counts = pd.Series([3, 0, 2], index=["Top Talent", "Practitioner", "New to Rate"])
+    frame = cube.as_frame(counts)
+    assert frame["Rating"].tolist() == ["Top Talent", "New to Rate"]
+    assert frame["Count"].tolist() == [3, 2]
@@ -0,0 +1,51 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from talent import figcache
+
+
+def bar(values):
+    return go.Figure(go.Bar(x=[f"Q{i}" for i in range(len(values))], y=values))
+
+
+def test_cached_figure_matches_the_built_one():
+    cache = figcache.FigureCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return bar([3, 1, 2])
+
+    first = cache.figure("trend", build)
+    second = cache.figure("trend", build)
+    assert len(builds) == 1 and (cache.hits, cache.misses) == (1, 1)
+    assert pio.to_json(second) == pio.to_json(first) == pio.to_json(bar([3, 1, 2]))
+    assert list(second.data[0].y) == [3, 1, 2]
+
+
+def test_least_recently_used_spec_is_evicted_first():
+    size = len(pio.to_json(bar([1, 2, 3]), validate=False))
+    cache = figcache.FigureCache(max_bytes=2 * size)
+    cache.get_or_build("a", lambda: bar([1, 2, 3]))
+    cache.get_or_build("b", lambda: bar([4, 5, 6]))
+    cache.get("a")
+    cache.get_or_build("c", lambda: bar([7, 8, 9]))
+    assert len(cache) == 2 and cache.bytes <= cache.max_bytes
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_oversized_spec_is_returned_but_not_kept():
+    cache = figcache.FigureCache(max_bytes=10)
+    spec = cache.get_or_build("big", lambda: bar([1]))
+    assert figcache.to_figure(spec).data[0].y == (1,)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_fingerprint_tracks_what_the_figure_depends_on():
+    rows = np.array([1, 5, 9])
+    key = figcache.fingerprint("v1", {"Manager": ["M2", "M1"]}, rows, None)
+    assert key == figcache.fingerprint("v1", {"Manager": ["M1", "M2"]}, rows.copy(), None)
+    assert key != figcache.fingerprint("v2", {"Manager": ["M1", "M2"]}, rows, None)
+    assert key != figcache.fingerprint("v1", {"Manager": ["M1"]}, rows, None)
+    assert key != figcache.fingerprint("v1", {"Manager": ["M1", "M2"]}, rows[:2], None)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import compact, grid, scoring
+
+
+@pytest.fixture
+def scored(sheet):
+    df = compact.compact(scoring.score(sheet(600, quarters=3)))
+    df.loc[df.index[::17], "X_Score"] = np.nan  # missing values sort last either way
+    return df
+
+
+def expected_order(df, rows, col, ascending):
+    frame = df.iloc[rows] if rows is not None else df
+    return frame.sort_values(col, ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+@pytest.mark.parametrize("col", ["X_Score", "EMP Name", "Final Rating", "Quarter"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_window_sorts_like_sort_values(scored, col, ascending):
+    index = grid.SortIndex(scored)
+    rows = grid.rows_where((scored["Quarter"] != "Q1").to_numpy())
+    for within in (None, rows):
+        window, total = index.window(within, col, ascending)
+        np.testing.assert_array_equal(window, expected_order(scored, within, col, ascending))
+        assert total == (len(scored) if within is None else len(rows))
+
+
+def test_pages_cover_the_selection_in_order(scored):
+    index = grid.SortIndex(scored)
+    rows = grid.rows_where((scored["Final Rating"] != "New to Rate").to_numpy())
+    full, total = index.window(rows, "Y_Score", False)
+    pages = [index.window(rows, "Y_Score", False, start, start + 50)[0] for start in range(0, total, 50)]
+    assert len(pages) == grid.page_count(total, 50)
+    np.testing.assert_array_equal(np.concatenate(pages), full)
+    assert index.window(rows, "Y_Score", False, total, total + 50)[0].size == 0
+
+
+def test_unsorted_window_keeps_sheet_order(scored):
+    index = grid.SortIndex(scored)
+    rows = np.array([5, 9, 40, 41])
+    np.testing.assert_array_equal(index.window(rows, None, start=1, stop=3)[0], [9, 40])
+    np.testing.assert_array_equal(index.window(None, None, stop=3)[0], [0, 1, 2])
+
+
+def test_rows_where_matches_mask():
+    mask = pd.Series([True, False, True, True, False]).to_numpy()
+    np.testing.assert_array_equal(grid.rows_where(mask), [0, 2, 3])
+    np.testing.assert_array_equal(grid.rows_where(mask, within=np.array([1, 2, 4])), [2])
+    assert grid.page_count(0, 50) == 1 and grid.page_count(101, 50) == 3
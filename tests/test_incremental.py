@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import incremental, ranking, scoring
+
+RESULT_COLS = ["X_Score", "Y_Score", "X_Pct", "Y_Pct", "X_Pct_Team", "Y_Pct_Team",
+               "Final Rating", "Team_Rating", "Comparison"]
+
+
+def edit_metrics(raw, rng):
+    rows = rng.choice(len(raw), 25, replace=False)
+    raw.loc[rows, "Delivery"] = (raw.loc[rows, "Delivery"] + 1.5).clip(upper=10)
+    raw.loc[rows[:10], "Collaboration"] = 2.0
+    return raw
+
+
+def remove_rows(raw, rng):
+    return raw.drop(index=rng.choice(len(raw), 20, replace=False)).reset_index(drop=True)
+
+
+def move_managers(raw, rng):
+    rows = rng.choice(len(raw), 12, replace=False)
+    raw.loc[rows, "Manager"] = raw["Manager"].iloc[rng.choice(len(raw), 12)].to_numpy()
+    return raw
+
+
+def flip_categories(raw, rng):
+    rows = rng.choice(len(raw), 15, replace=False)
+    raw.loc[rows, "Category"] = np.where(raw.loc[rows, "Category"] == "New to Rate", "Evaluated", "New to Rate")
+    return raw
+
+
+def add_quarter(raw, rng):
+    latest = raw[raw["Quarter"] == raw["Quarter"].max()].copy()
+    latest["Quarter"] = "Q9"
+    latest["Quality of Output"] = rng.choice([4.0, 6.5, 9.0], len(latest))
+    return pd.concat([raw, latest], ignore_index=True)
+
+
+def everything(raw, rng):
+    for edit in (edit_metrics, remove_rows, move_managers, flip_categories):
+        raw = edit(raw, rng)
+    return raw
+
+
+EDITS = [edit_metrics, remove_rows, move_managers, flip_categories, add_quarter, everything]
+
+
+@pytest.mark.parametrize("mode", list(ranking.RANK_MODES))
+@pytest.mark.parametrize("edit", EDITS, ids=lambda f: f.__name__)
+def test_rescore_matches_full_score(sheet, monkeypatch, mode, edit):
+    old = sheet(4000, quarters=4, seed=1)
+    previous = scoring.score(old.copy(), mode)
+    new = edit(old.copy(), np.random.default_rng(2))
+    expected = scoring.score(new.copy(), mode)
+
+    # These edits stay under MAX_CHANGED_SHARE: the patch path must handle them itself
+    def no_full_score(*args, **kwargs):
+        raise AssertionError("rescore fell back to a full score")
+    monkeypatch.setattr(scoring, "score", no_full_score)
+    got = incremental.rescore(new.copy(), previous, mode)
+
+    pd.testing.assert_frame_equal(got[RESULT_COLS], expected[RESULT_COLS])
+
+
+@pytest.mark.parametrize("mode", list(ranking.RANK_MODES))
+def test_rescore_large_edit_still_matches(sheet, mode):
+    old = sheet(2000, quarters=2, seed=3)
+    previous = scoring.score(old.copy(), mode)
+    new = old.copy()
+    new["Delivery"] = 10 - new["Delivery"]
+    got = incremental.rescore(new.copy(), previous, mode)
+    pd.testing.assert_frame_equal(got[RESULT_COLS], scoring.score(new.copy(), mode)[RESULT_COLS])
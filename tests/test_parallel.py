@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from talent import parallel, ranking, scoring, sources
+
+RESULT_COLS = ["X_Score", "Y_Score", "X_Pct", "Y_Pct", "X_Pct_Team", "Y_Pct_Team",
+               "Final Rating", "Team_Rating", "Comparison"]
+
+
+@pytest.fixture
+def shard_files(sheet, tmp_path):
+    raw = sheet(4000, quarters=4)
+    for i, start in enumerate(range(0, len(raw), 1000)):
+        raw.iloc[start:start + 1000].to_csv(tmp_path / f"part-{i}.csv", index=False)
+    return sources.FileShards(str(tmp_path / "part-*.csv"))
+
+
+@pytest.mark.parametrize("mode", list(ranking.RANK_MODES))
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_score_matches_score(shard_files, mode, workers):
+    got = parallel.score(shard_files.shards(), mode, workers=workers)
+    expected = scoring.score(shard_files.read(), mode)
+    pd.testing.assert_frame_equal(got[RESULT_COLS], expected[RESULT_COLS])
+
+
+def test_workers_are_not_forked_from_the_caller():
+    assert parallel._context().get_start_method() in ("forkserver", "spawn")
@@ -0,0 +1,69 @@
+import json
+
+import pandas as pd
+import pyarrow as pa
+
+from talent import profiling
+
+
+def trace_of(**seconds):
+    trace = profiling.Trace(page="Overview")
+    for name, s in seconds.items():
+        trace.spans.append({"name": name, "parent": None, "depth": 0, "start": 0.0, "seconds": s})
+    return trace
+
+
+def test_spans_nest_and_finish_covers_the_rerun():
+    trace = profiling.Trace(page="Overview")
+    with trace.span("load") as load:
+        with trace.span("score", rows=10):
+            pass
+        load["bytes"] = 123
+    trace.finish()
+    names = [(s["name"], s["parent"], s["depth"]) for s in trace.ordered()]
+    assert names == [("rerun", None, 0), ("load", None, 0), ("score", "load", 1)]
+    spans = {s["name"]: s for s in trace.spans}
+    assert spans["score"]["rows"] == 10 and spans["load"]["bytes"] == 123
+    assert spans["rerun"]["seconds"] >= spans["load"]["seconds"] >= spans["score"]["seconds"]
+
+
+def test_disabled_trace_records_nothing():
+    trace = profiling.Trace(enabled=False)
+    with trace.span("load") as span:
+        assert span is None
+    assert trace.finish().spans == []
+
+
+def test_metrics_histogram_is_cumulative():
+    metrics = profiling.Metrics(buckets=(0.1, 1.0))
+    for s in (0.05, 0.5, 2.0):
+        metrics.observe(trace_of(load=s, render=0.01))
+    assert metrics.reruns == 3
+    assert metrics.stages["load"][0] == 3 and metrics.stages["load"][2] == [1, 2]
+    assert [row[0] for row in metrics.summary()] == ["load", "render"]
+    text = metrics.prometheus()
+    assert 'talent_stage_seconds_bucket{stage="load",le="1.0"} 2' in text
+    assert 'talent_stage_seconds_bucket{stage="load",le="+Inf"} 3' in text
+    assert 'talent_stage_seconds_sum{stage="load"} 2.550000' in text
+    assert "talent_reruns_total 3" in text
+
+
+def test_traces_and_exposition_are_written(tmp_path):
+    log = tmp_path / "traces.jsonl"
+    metrics = profiling.Metrics()
+    for _ in range(2):
+        trace = trace_of(load=0.2)
+        metrics.observe(trace)
+        profiling.append_jsonl(str(log), trace)
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert len(records) == 2 and records[0]["page"] == "Overview"
+    assert records[0]["spans"][0]["name"] == "load"
+
+    prom = tmp_path / "talent.prom"
+    profiling.write_prometheus(str(prom), metrics)
+    assert prom.read_text() == metrics.prometheus()
+
+
+def test_frame_bytes_is_the_arrow_size():
+    df = pd.DataFrame({"Manager": ["Manager 1", "Manager 2"] * 50, "X_Score": range(100)})
+    assert profiling.frame_bytes(df) == pa.Table.from_pandas(df, preserve_index=False).nbytes
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import classify, quadrant, scoring
+
+COLORS = {label: "#94A3B8" for label in classify.BOX_LABELS}
+THEME = {"--plotly-temp": "plotly_dark", "--fb-axis": "#475569", "--fb-text": "#F8FAFC"}
+CUTS = (6.5, 7.5, 6.5, 7.5)
+
+
+@pytest.fixture
+def scored(sheet):
+    return scoring.score(sheet(2000, quarters=1))[quadrant.COLUMNS]
+
+
+def grouped_cells(df, bins):
+    # The same histogram as a plain groupby on floored scores
+    step = quadrant.MAX_RANGE / bins
+    rated = df[df["Final Rating"] != classify.NEW_TO_RATE]
+    return (rated.assign(**{"Final Rating": rated["Final Rating"].astype(str)},
+                         bx=(rated["X_Score"] // step).clip(0, bins - 1).astype("int64"),
+                         by=(rated["Y_Score"] // step).clip(0, bins - 1).astype("int64"))
+            .groupby(["Final Rating", "bx", "by"]).size().rename("Count").sort_index())
+
+
+@pytest.mark.parametrize("bins", [quadrant.LOD_BINS, 7])
+def test_bucketize_matches_groupby(scored, bins):
+    cells = quadrant.bucketize(scored, bins).set_index(["Final Rating", "bx", "by"])["Count"]
+    pd.testing.assert_series_equal(cells.sort_index(), grouped_cells(scored, bins),
+                                   check_dtype=False, check_index_type=False)
+    step = quadrant.MAX_RANGE / bins
+    np.testing.assert_allclose(quadrant.bucketize(scored, bins)["x"] % step, step / 2)
+
+
+def test_bucket_members_partition_the_rated_rows(scored):
+    cells = quadrant.bucketize(scored)
+    members = [quadrant.bucket_members(scored, cell) for _, cell in cells.iterrows()]
+    assert [len(m) for m in members] == cells["Count"].tolist()
+    together = pd.concat(members).sort_index()
+    pd.testing.assert_frame_equal(together, scored[scored["Final Rating"] != classify.NEW_TO_RATE])
+
+
+def test_cell_traces_follow_the_color_order(scored):
+    traces = quadrant.cell_traces(scored, COLORS)
+    order = [label for label in COLORS if label != classify.NEW_TO_RATE]
+    assert [t["Final Rating"].iat[0] for t in traces] == [r for r in order if (scored["Final Rating"] == r).any()]
+    assert all((t["Final Rating"] == t["Final Rating"].iat[0]).all() for t in traces)
+
+
+def test_exact_and_density_figures_show_the_same_people(scored):
+    rated = (scored["Final Rating"] != classify.NEW_TO_RATE).sum()
+    fig, traces = quadrant.build_figure(scored, CUTS, COLORS, THEME)
+    assert traces is None
+    assert sum(int(np.asarray(t.customdata)[:, 3].astype(int).sum()) for t in fig.data) == rated
+
+    fig, traces = quadrant.build_figure(scored, CUTS, COLORS, THEME, max_points=100)
+    assert len(fig.data) == len(traces)
+    assert sum(int(np.asarray(t.customdata)[:, 0].sum()) for t in fig.data) == rated
+    # A click on (curve, point) resolves to that cell's employees
+    cell = traces[0].iloc[0]
+    assert len(quadrant.bucket_members(scored, cell)) == cell["Count"]
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import ranking, scoring
+
+
+def cuts(index, partitions=None):
+    return [index.cut(col, q, partitions) for col in ranking.SCORE_COLS for q in (10, 50, 90)]
+
+
+@pytest.fixture
+def scored(sheet):
+    return scoring.score(sheet(4000, quarters=4), ranking.QUARTER)
+
+
+def test_refresh_resketches_only_changed_quarters(scored):
+    previous = ranking.PercentileIndex.build(scored, ranking.QUARTER)
+    edited = scored.copy()
+    q3 = (edited["Quarter"] == "Q3").to_numpy()
+    edited.loc[q3, "X_Score"] = edited.loc[q3, "X_Score"] + 0.5
+    extra = scored[scored["Quarter"] == "Q0"].assign(Quarter="Q4")
+    edited = pd.concat([edited[edited["Quarter"] != "Q1"], extra], ignore_index=True)
+
+    index = ranking.PercentileIndex.build(edited, ranking.QUARTER, previous=previous)
+    fresh = ranking.PercentileIndex.build(edited, ranking.QUARTER)
+    assert set(index.parts) == {"Q0", "Q2", "Q3", "Q4"}
+    assert index.parts["Q0"] is previous.parts["Q0"]
+    assert index.parts["Q2"] is previous.parts["Q2"]
+    assert index.parts["Q3"] is not previous.parts["Q3"]
+    assert cuts(index) == cuts(fresh)
+    for quarter in index.parts:
+        assert cuts(index, [quarter]) == cuts(fresh, [quarter])
+    # The previous index is shared through the cache and must not change
+    assert set(previous.parts) == {"Q0", "Q1", "Q2", "Q3"}
+
+
+def test_refresh_ignores_row_order(scored):
+    previous = ranking.PercentileIndex.build(scored, ranking.QUARTER)
+    shuffled = scored.iloc[np.random.default_rng(1).permutation(len(scored))]
+    index = ranking.PercentileIndex.build(shuffled, ranking.QUARTER, previous=previous)
+    assert all(index.parts[q] is previous.parts[q] for q in previous.parts)
+
+
+def test_previous_from_another_mode_is_not_reused(scored):
+    previous = ranking.PercentileIndex.build(scored, ranking.GLOBAL)
+    index = ranking.PercentileIndex.build(scored, ranking.QUARTER, previous=previous)
+    assert cuts(index) == cuts(ranking.PercentileIndex.build(scored, ranking.QUARTER))
+    assert None not in index.parts
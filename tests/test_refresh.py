@@ -0,0 +1,79 @@
+import json
+
+import pandas as pd
+import pytest
+
+from talent import refresh
+
+
+class FakeSource:
+    def __init__(self):
+        self.revision = 1
+        self.broken = False
+
+    def probe(self):
+        if self.broken:
+            raise OSError("sheet unavailable")
+        return self.revision
+
+
+@pytest.fixture
+def setup(tmp_path):
+    source = FakeSource()
+    loads = []
+
+    def load(src, variant, probe):
+        loads.append((variant, probe))
+        df = pd.DataFrame({"X_Score": [float(probe)] * 3})
+        df.attrs["version"] = f"{variant}-{probe}"
+        return df
+
+    refresher = refresh.Refresher(source, load, interval=10, status_path=str(tmp_path / "status.json"))
+    refresher.start = lambda: None  # drive the ticks by hand
+    return refresher, source, loads
+
+
+def test_first_get_loads_and_later_gets_reuse(setup):
+    refresher, _, loads = setup
+    first = refresher.get("a")
+    assert refresher.get("a") is first and refresher.has("a") and not refresher.has("b")
+    assert loads == [("a", 1)]
+
+
+def test_tick_rebuilds_only_when_the_probe_moves(setup):
+    refresher, source, loads = setup
+    old = refresher.get("a")
+    refresher.get("b")
+    refresher.refresh()
+    assert len(loads) == 2 and refresher.refreshes == 2
+
+    source.revision = 2
+    refresher.refresh()
+    assert sorted(loads[2:]) == [("a", 2), ("b", 2)]
+    assert refresher.get("a") is not old and refresher.get("a")["X_Score"].iat[0] == 2.0
+    assert old["X_Score"].iat[0] == 1.0  # a session holding the old frame still reads it
+    assert refresher.status()["versions"] == {"a": "a-2", "b": "b-2"}
+
+
+def test_failed_tick_keeps_serving_and_reports(setup, tmp_path):
+    refresher, source, _ = setup
+    frame = refresher.get("a")
+    source.broken = True
+    refresher.refresh()
+    assert refresher.get("a") is frame
+    assert refresher.last_error == "OSError: sheet unavailable" and refresher.behind()
+    status = json.loads((tmp_path / "status.json").read_text())
+    assert status["last_error"] == refresher.last_error and status["versions"] == {"a": "a-1"}
+
+    source.broken = False
+    refresher.refresh()
+    assert refresher.last_error is None and not refresher.behind()
+
+
+def test_behind_after_three_missed_intervals(setup):
+    refresher, _, _ = setup
+    assert not refresher.behind()
+    refresher.get("a")
+    refresher.refresh()
+    assert not refresher.behind(now=refresher.last_check + 29)
+    assert refresher.behind(now=refresher.last_check + 31)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import classify, compact, rollup, scoring
+
+SELECTIONS = [
+    {},
+    {"Business Unit": ["BU 0"]},
+    {"Manager": ["Manager 0", "Manager 1", "Manager 5"]},
+    {"Department": ["Dept 0", "Dept 1"], "Manager": ["Manager 1"]},
+]
+
+
+@pytest.fixture
+def scored(sheet):
+    df = scoring.score(sheet(800, quarters=4))
+    # Some people move team mid-quarter: a second row under another manager
+    movers = df[df["Quarter"].isin(["Q1", "Q3"])].iloc[::25].copy()
+    movers["Manager"], movers["Department"] = "Manager 5", "Dept 9"
+    return compact.compact(pd.concat([df, movers], ignore_index=True))
+
+
+def selected(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        mask &= df[col].isin(values).to_numpy()
+    return df[mask]
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_headcount_is_nunique_over_the_selection(scored, filters):
+    # The pre-rollup chart: trend_df.groupby("Quarter")["EMP ID"].nunique()
+    expected = selected(scored, filters).groupby("Quarter", observed=True)["EMP ID"].nunique()
+    got = rollup.QuarterRollup.build(scored).headcount(filters).set_index("Quarter")["Headcount"]
+    pd.testing.assert_series_equal(got, expected, check_names=False, check_index_type=False, check_dtype=False)
+
+
+def test_someone_under_two_managers_counts_once_per_selection():
+    # E1 moved from M1 to M2 during Q1, so has a row under each
+    df = pd.DataFrame({
+        "Manager": ["M1", "M2", "M1", "M2", "M1"],
+        "Quarter": ["Q1", "Q1", "Q1", "Q1", "Q2"],
+        "EMP ID": ["E1", "E1", "E2", "E3", "E1"],
+        "Final Rating": ["The Keystone"] * 5,
+    })
+    table = rollup.QuarterRollup.build(df)
+    assert sorted(table.spans["Manager"]) == ["M1", "M2"]
+
+    def q1(filters):
+        return table.headcount(filters).set_index("Quarter")["Headcount"]["Q1"]
+
+    assert q1({"Manager": ["M1"]}) == 2  # E1 counts in both units on their own...
+    assert q1({"Manager": ["M2"]}) == 2
+    assert q1({"Manager": ["M1", "M2"]}) == 3  # ...and once when both are selected
+    assert q1({}) == 3
+    assert table.headcount({}).set_index("Quarter")["Headcount"]["Q2"] == 1
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_box_trend_matches_value_counts(scored, filters):
+    rated = [b for b in classify.BOX_LABELS if b != classify.NEW_TO_RATE]
+    trend = rollup.QuarterRollup.build(scored).box_trend(filters, rated)
+    expected = (selected(scored, filters).groupby(["Quarter", "Final Rating"], observed=True).size()
+                .rename("Count").reset_index())
+    expected = expected[expected["Final Rating"].isin(rated)]
+    got = trend.set_index(["Quarter", "Final Rating"])["Count"].sort_index()
+    want = expected.astype({"Quarter": str, "Final Rating": str}).set_index(["Quarter", "Final Rating"])["Count"].sort_index()
+    got.index = got.index.set_levels([lv.astype(str) for lv in got.index.levels])
+    pd.testing.assert_series_equal(got, want, check_dtype=False, check_index_type=False)
+
+
+def test_rebuild_reuses_unchanged_quarters(scored):
+    previous = rollup.QuarterRollup.build(scored)
+    edited = scored.copy()
+    q2 = (edited["Quarter"] == "Q2").to_numpy()
+    edited.loc[q2, "Final Rating"] = "Top Talent"
+    again = rollup.QuarterRollup.build(edited, previous)
+    fresh = rollup.QuarterRollup.build(edited)
+    for filters in SELECTIONS:
+        pd.testing.assert_frame_equal(again.headcount(filters), fresh.headcount(filters))
+        pd.testing.assert_frame_equal(again.box_trend(filters), fresh.box_trend(filters))
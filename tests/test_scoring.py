@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from talent import compact, ranking, scoring
+
+RESULT_COLS = ["X_Score", "Y_Score", "X_Pct", "Y_Pct", "X_Pct_Team", "Y_Pct_Team",
+               "Final Rating", "Team_Rating", "Comparison"]
+
+
+@pytest.mark.parametrize("mode", list(ranking.RANK_MODES))
+def test_rescorer_default_config_matches_score(sheet, mode):
+    scored = scoring.score(sheet(3000), mode)
+    again = scoring.Rescorer(scored, mode).score(scoring.DEFAULT_CONFIG)
+    pd.testing.assert_frame_equal(again[RESULT_COLS], scored[RESULT_COLS])
+
+
+@pytest.mark.parametrize("mode", list(ranking.RANK_MODES))
+def test_rescorer_on_compacted_frame_keeps_ratings(sheet, mode):
+    # The app re-scores the compacted (narrowed) shared frame
+    scored = scoring.score(sheet(3000), mode)
+    again = scoring.Rescorer(compact.compact(scored), mode).score(scoring.DEFAULT_CONFIG)
+    for col in ("Final Rating", "Team_Rating", "Comparison"):
+        assert (again[col].astype(str) == scored[col].astype(str)).all(), col
+
+
+def test_rescorer_only_moving_boundaries_keeps_scores(sheet):
+    scored = scoring.score(sheet(3000))
+    config = scoring.ScoringConfig(low_cut=0.25, high_cut=0.85)
+    again = scoring.Rescorer(scored).score(config)
+    pd.testing.assert_series_equal(again["X_Pct"], scored["X_Pct"])
+    pd.testing.assert_series_equal(again["Y_Pct_Team"], scored["Y_Pct_Team"])
+    expected = scoring.assign_ratings(scored.copy(), config.low_cut, config.high_cut)
+    assert (again["Final Rating"] == expected["Final Rating"]).all()
+
+
+@pytest.mark.parametrize("mode", list(ranking.RANK_MODES))
+def test_exact_from_compacted_frame_restores_full_precision(sheet, mode):
+    # Exports re-derive float64 scores from the float32 frame the app holds
+    scored = scoring.score(sheet(3000), mode)
+    exact = scoring.Rescorer(compact.compact(scored), mode).exact(scoring.DEFAULT_CONFIG)
+    pd.testing.assert_frame_equal(exact[compact.SCORE_COLS], scored[compact.SCORE_COLS])
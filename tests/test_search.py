@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from talent import search
+
+QUERIES = ["e", "em", "Yee", "employee 1", "ployee 10", "FINBP", "finbp00000", "12", "7 ", "zzz", "employee 99999"]
+
+
+@pytest.fixture
+def people(sheet):
+    return sheet(2000, quarters=4)
+
+
+def expected(df, query, within=None):
+    q = query.strip()
+    mask = np.zeros(len(df), dtype=bool)
+    for col in search.SEARCH_COLS:
+        mask |= df[col].str.contains(q, case=False, regex=False).to_numpy()
+    rows = np.flatnonzero(mask)
+    return rows if within is None else np.intersect1d(rows, within)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_matches_str_contains(people, query):
+    index = search.SearchIndex.build(people)
+    within = np.flatnonzero((people["Quarter"] == "Q2").to_numpy())
+    for rows in (None, within):
+        found, fuzzy = index.search(query, within=rows, fuzzy=False)
+        np.testing.assert_array_equal(found, expected(people, query, rows))
+        assert not fuzzy
+
+
+def test_fuzzy_only_when_nothing_matches(people):
+    index = search.SearchIndex.build(people)
+    rows, fuzzy = index.search("Emplyee 12")
+    assert fuzzy and len(rows)
+    assert index.search("   ")[0].size == len(people)
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import compact, scoring, shared
+
+
+@pytest.fixture
+def frame(sheet):
+    df = compact.compact(scoring.score(sheet(400, quarters=2)))
+    df.attrs["version"] = "v1"
+    return df
+
+
+def test_mapped_frame_round_trips(frame, tmp_path):
+    mapped = shared.share(frame, "data", str(tmp_path))
+    assert mapped.attrs["version"] == "v1"
+    pd.testing.assert_frame_equal(mapped, frame, check_dtype=False)
+    for col in frame.columns:
+        assert mapped[col].dtype == frame[col].dtype or pd.api.types.is_string_dtype(mapped[col]), col
+    # Numbers are read-only views of the mapping, not private copies
+    assert not mapped["X_Score"].to_numpy().flags.writeable
+    assert mapped["Final Rating"].cat.categories.tolist() == frame["Final Rating"].cat.categories.tolist()
+
+
+def test_selection_matches_iloc(frame, tmp_path):
+    mapped = shared.share(frame, "data", str(tmp_path))
+    rows = np.flatnonzero((frame["Quarter"] == "Q1").to_numpy())
+    sel = shared.Selection(mapped, rows)
+    cols = ["EMP Name", "X_Score", "Final Rating"]
+    assert len(sel) == len(rows) and sel.nbytes == rows.nbytes
+    pd.testing.assert_frame_equal(sel.frame(cols), frame.iloc[rows][cols], check_dtype=False)
+    pd.testing.assert_series_equal(sel.column("Y_Score"), frame["Y_Score"].iloc[rows])
+
+    top = sel.where("Final Rating", ["Top Talent", "Future Leader"])
+    expected = rows[frame["Final Rating"].iloc[rows].isin(["Top Talent", "Future Leader"]).to_numpy()]
+    np.testing.assert_array_equal(top.rows, expected)
+    pd.testing.assert_frame_equal(top.head(5, cols), frame.iloc[expected[:5]][cols], check_dtype=False)
+
+    everything = shared.Selection(mapped)
+    assert len(everything) == len(frame) and everything.nbytes == 0
+    assert len(everything.head(3)) == 3
+
+
+def test_new_version_replaces_the_stale_file(frame, tmp_path):
+    directory = str(tmp_path)
+    old = shared.share(frame, "data", directory)
+    old_path = shared.path_for("data", "v1", directory)
+
+    frame.attrs["version"] = "v2"
+    new = shared.share(frame.assign(X_Score=frame["X_Score"] + 1), "data", directory)
+    assert not os.path.exists(old_path)
+    assert os.listdir(directory) == [os.path.basename(shared.path_for("data", "v2", directory))]
+    assert new.attrs["version"] == "v2"
+    # A process still holding the old mapping keeps reading it
+    np.testing.assert_array_equal(old["X_Score"].to_numpy() + 1, new["X_Score"].to_numpy())
+
+
+def test_existing_file_of_the_same_version_is_reused(frame, tmp_path):
+    directory = str(tmp_path)
+    shared.share(frame, "data", directory)
+    path = shared.path_for("data", "v1", directory)
+    mtime = os.stat(path).st_mtime_ns
+    again = shared.share(frame, "data", directory)
+    assert os.stat(path).st_mtime_ns == mtime
+    assert len(again) == len(frame)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from talent import sketch
+
+QUANTILES = [0, 1, 10, 25, 50, 75, 90, 99, 100]
+
+
+@pytest.fixture
+def scores():
+    # Half-point steps, as in the sheet, so there are many ties
+    return np.round(np.random.default_rng(0).normal(7, 1.5, 20_000) * 2) / 2
+
+
+def test_exact_sketch_matches_numpy(scores):
+    s = sketch.QuantileSketch.from_values(scores)
+    assert s.exact
+    assert [s.quantile(q) for q in QUANTILES] == list(np.percentile(scores, QUANTILES))
+
+
+def test_exact_merge_equals_sketch_of_union(scores):
+    parts = [sketch.QuantileSketch.from_values(part) for part in np.array_split(scores, 4)]
+    merged = parts[0].merge(*parts[1:])
+    whole = sketch.QuantileSketch.from_values(scores)
+    assert merged.exact and merged.n == whole.n
+    np.testing.assert_array_equal(merged.levels[0], whole.levels[0])
+
+
+def test_nan_is_not_counted():
+    s = sketch.QuantileSketch.from_values([1.0, np.nan, 3.0])
+    assert len(s) == 2 and s.quantile(50) == 2.0
+
+
+@pytest.mark.parametrize("split", [1, 8])
+def test_kll_rank_error_stays_under_one_percent(split):
+    values = np.random.default_rng(1).normal(7, 1.5, 200_000)
+    parts = [sketch.QuantileSketch.from_values(part, exact_limit=1000) for part in np.array_split(values, split)]
+    s = parts[0].merge(*parts[1:]) if split > 1 else parts[0]
+    assert not s.exact and s.n == len(values)
+    assert sum(len(level) for level in s.levels) < 5000
+    ranks = np.searchsorted(np.sort(values), [s.quantile(q) for q in QUANTILES[1:-1]]) / len(values)
+    assert np.abs(ranks - np.array(QUANTILES[1:-1]) / 100).max() < 0.01
@@ -0,0 +1,18 @@
+import pandas as pd
+
+from talent import compact, scoring, shared, snapshot
+
+
+def test_snapshot_keeps_full_precision_scores_of_the_shared_version(sheet, tmp_path):
+    # Default-config exports read the float64 scores back from the snapshot
+    path = str(tmp_path / "data.csv")
+    sheet(200, quarters=2).to_csv(path, index=False)
+    cache = str(tmp_path / "cache")
+    scored = snapshot.load_or_build(path, lambda src, previous: scoring.score(src.read()), cache_dir=cache)
+    mapped = shared.share(compact.compact(scored), "data", str(tmp_path / "shared"))
+
+    exact, _ = snapshot.read_snapshot(path, cache_dir=cache, columns=compact.SCORE_COLS)
+    assert list(exact.columns) == compact.SCORE_COLS
+    assert exact.attrs["version"] == mapped.attrs["version"]
+    pd.testing.assert_frame_equal(exact, scored[compact.SCORE_COLS].reset_index(drop=True))
+    assert (mapped["X_Score"].to_numpy() == exact["X_Score"].to_numpy(dtype="float32")).all()
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from talent import refresh, scoring, snapshot, sources
+
+
+class CountingSheets(sources.LocalSheets):
+    """``LocalSheets`` that also counts Drive revision lookups."""
+
+    def __init__(self, spreadsheets=None):
+        super().__init__(spreadsheets)
+        self.revision_calls = 0
+
+    def revision(self, key):
+        self.revision_calls += 1
+        return super().revision(key)
+
+
+@pytest.fixture
+def sheets(sheet):
+    raw = sheet(80, quarters=2)
+    fake = CountingSheets()
+    fake.update("book", {q: frame for q, frame in raw.groupby("Quarter")})
+    return fake, raw
+
+
+def build(src, previous):
+    return scoring.score(src.read())
+
+
+def test_sheet_is_fetched_only_when_the_revision_changes(sheets, tmp_path):
+    fake, raw = sheets
+    source = sources.GoogleSheetSource("book", ["Q0", "Q1"], transport=fake)
+    cache = str(tmp_path)
+
+    first = snapshot.load_or_build(source, build, cache_dir=cache)
+    assert fake.fetches == 1
+    for _ in range(3):
+        again = snapshot.load_or_build(source, build, cache_dir=cache)
+    assert fake.fetches == 1
+    assert again.attrs["version"] == first.attrs["version"]
+
+    edited = raw.assign(**{"Delivery": 10.0})
+    fake.update("book", {q: frame for q, frame in edited.groupby("Quarter")})
+    updated = snapshot.load_or_build(source, build, cache_dir=cache)
+    assert fake.fetches == 2
+    assert updated.attrs["version"] != first.attrs["version"]
+    assert (updated["Delivery"] == 10).all()
+
+
+def test_ranges_are_read_in_one_batch(sheets):
+    fake, raw = sheets
+    df = sources.GoogleSheetSource("book", ["Q0", "Q1"], transport=fake).read()
+    assert fake.fetches == 1
+    assert len(df) == len(raw)
+    assert sorted(df["Quarter"].unique()) == ["Q0", "Q1"]
+
+
+def test_refresh_tick_asks_for_the_revision_once(sheets, tmp_path):
+    fake, _ = sheets
+    source = sources.GoogleSheetSource("book", ["Q0", "Q1"], transport=fake)
+
+    def load(src, variant, probe):
+        return snapshot.load_or_build(src, build, cache_dir=str(tmp_path), variant=variant, probe=probe)
+
+    refresher = refresh.Refresher(source, load)
+    refresher.start = lambda: None  # drive the ticks by hand
+    refresher.get("a")
+    refresher.get("b")
+    fake.update("book", fake.spreadsheets["book"])
+    calls = fake.revision_calls
+    refresher.refresh()
+    assert refresher.last_error is None and refresher.refreshes == 4
+    assert fake.revision_calls == calls + 1  # the tick's probe is reused by every rebuild
+
+
+@pytest.mark.parametrize("uri, kind", [
+    ("Data.xlsx", sources.FileSource),
+    ("Data.xlsx#*", sources.WorkbookSheets),
+    ("shards/*.parquet", sources.FileShards),
+    ("shards/part-?.csv", sources.FileShards),
+    ("shards/part-[0-9].csv", sources.FileShards),
+])
+def test_from_uri(uri, kind):
+    assert type(sources.from_uri(uri)) is kind
+
+
+def test_from_uri_gsheet():
+    source = sources.from_uri("gsheet://book/Q0,Q1", transport=sources.LocalSheets({"book": {"Q0": pd.DataFrame()}}))
+    assert isinstance(source, sources.GoogleSheetSource)
+    assert source.ranges == ["Q0", "Q1"]
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from talent import classify, compact, scoring, transitions
+
+SELECTIONS = [
+    {},
+    {"Business Unit": ["BU 0"]},
+    {"Manager": ["Manager 0", "Manager 3"]},
+    {"Department": ["Dept 1"], "Sub Department": ["Sub 0", "Sub 2"]},
+]
+
+
+@pytest.fixture
+def scored(sheet):
+    df = scoring.score(sheet(800, quarters=4))
+    # Some people skip Q1: their Q0 and Q2 rows are not consecutive quarters
+    gone = df["EMP ID"].drop_duplicates().iloc[::7]
+    return compact.compact(df[~((df["Quarter"] == "Q1") & df["EMP ID"].isin(gone))].reset_index(drop=True))
+
+
+def merged_links(df, filters):
+    # Each quarter joined to the next on EMP ID, filtered on the later quarter's org
+    quarters = sorted(df["Quarter"].unique())
+    box = {label: code for code, label in enumerate(classify.BOX_LABELS)}
+    parts = []
+    for i, (before, after) in enumerate(zip(quarters, quarters[1:])):
+        pairs = df[df["Quarter"] == before][["EMP ID", "Final Rating"]].merge(
+            df[df["Quarter"] == after], on="EMP ID", suffixes=("_from", ""))
+        for col, values in filters.items():
+            pairs = pairs[pairs[col].isin(values)]
+        parts.append(pd.DataFrame({
+            "From Quarter": i,
+            "From": pairs["Final Rating_from"].astype(str).map(box),
+            "To": pairs["Final Rating"].astype(str).map(box),
+        }))
+    return (pd.concat(parts).groupby(["From Quarter", "From", "To"]).size()
+            .reset_index(name="Count"))
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_links_match_a_merge_of_consecutive_quarters(scored, filters):
+    cube = transitions.TransitionCube.build(scored)
+    assert cube.quarters == ["Q0", "Q1", "Q2", "Q3"]
+    got = cube.links(filters)
+    expected = merged_links(scored, filters)
+    pd.testing.assert_frame_equal(got.astype("int64"), expected.astype("int64"))
+
+
+def test_total_flow_is_the_number_of_returning_employees(scored):
+    cube = transitions.TransitionCube.build(scored)
+    ids = [set(scored.loc[scored["Quarter"] == q, "EMP ID"]) for q in cube.quarters]
+    assert cube.links()["Count"].sum() == sum(len(a & b) for a, b in zip(ids, ids[1:]))
+
+
+def test_single_quarter_or_missing_key_has_no_flows(scored):
+    assert transitions.TransitionCube.build(scored[scored["Quarter"] == "Q0"]).links().empty
+    cube = transitions.TransitionCube.build(scored.drop(columns="EMP ID"))
+    assert len(cube) == 0 and cube.quarters == []
+    np.testing.assert_array_equal(cube.links().columns, ["From Quarter", "From", "To", "Count"])